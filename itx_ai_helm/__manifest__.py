@@ -50,6 +50,7 @@ ITX AI Helm - Core AI Conversation Framework
     'depends': [
         'base',
         'mail',
+        'bus',
     ],
     'data': [
         # Security
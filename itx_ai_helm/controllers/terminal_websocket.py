@@ -5,7 +5,6 @@ from odoo import http
 from odoo.http import request
 import json
 import logging
-import time
 import queue
 
 _logger = logging.getLogger(__name__)
@@ -31,45 +30,62 @@ class TerminalController(http.Controller):
 
     ข้อดี: ใช้ HTTP ธรรมดา ไม่ต้องติดตั้งอะไรเพิ่ม
     ข้อเสีย: มี latency มากกว่า WebSocket เล็กน้อย แต่ยอมรับได้
+
+    Streaming (connect ด้วย stream=True): output ถูก push ผ่าน Odoo bus
+    (websocket) ไปยังทุก client ที่ subscribe channel ของ session
+    แทนการ poll - ดู services/terminal_bus.py
     """
 
     @http.route('/terminal/connect', type='json', auth='user')
-    def connect_terminal(self, session_id=None, command='bash'):
+    def connect_terminal(self, session_id=None, command='bash', stream=False):
         """
         สร้างหรือ Resume terminal session
 
         Args:
             session_id: ID ของ session เดิม (ถ้ามี) หรือ None เพื่อสร้างใหม่
             command: คำสั่งที่จะรัน (default: 'bash')
+            stream: True = stream output ผ่าน bus (websocket) แทน polling
 
         Returns:
             dict: {
                 'success': True,
                 'session_id': '...',
                 'is_resumed': True/False,
-                'history': '...'  # ถ้า resume
+                'history': '...',  # ถ้า resume
+                'offset': 123,  # sequence offset ถัดจาก history (ส่งใน /terminal/poll)
+                'channel': '...',  # ถ้า stream: bus channel ที่ต้อง subscribe
+                'stream_input': True/False,  # ถ้า stream: ส่ง input ผ่าน websocket ได้
             }
         """
         try:
-            from ..services.terminal_manager import TerminalManager
+            from ..services.terminal_broker import get_terminal_manager
+            TerminalManager = get_terminal_manager()
 
             is_resumed = False
             history = ''
 
-            # ถ้ามี session_id → ลอง resume
+            # ถ้ามี session_id → ลอง resume (เฉพาะ session ของ user เอง)
             if session_id:
+                if not self._get_own_session(session_id):
+                    return {
+                        'success': False,
+                        'error': 'Session not found'
+                    }
+
                 existing_session = TerminalManager.get_session(session_id)
                 if existing_session and existing_session.running and existing_session.is_alive():
                     # Resume session เดิม
                     is_resumed = True
-                    history = existing_session.get_history(lines=500)  # ส่ง history 500 บรรทัดล่าสุด
+                    history, offset = existing_session.get_history(lines=500)  # ส่ง history 500 บรรทัดล่าสุด
                     _logger.info(f"Resumed terminal session: {session_id}")
 
                     return {
                         'success': True,
                         'session_id': session_id,
                         'is_resumed': True,
-                        'history': history
+                        'history': history,
+                        'offset': offset,
+                        **self._attach_stream(existing_session, stream),
                     }
                 else:
                     # Session เก่าตายแล้ว → สร้างใหม่ด้วย session_id เดิม
@@ -91,7 +107,9 @@ class TerminalController(http.Controller):
                 'success': True,
                 'session_id': session_id,
                 'is_resumed': False,
-                'message': f'Terminal session started: {session_id[:8]}'
+                'message': f'Terminal session started: {session_id[:8]}',
+                'offset': 0,
+                **self._attach_stream(session, stream),
             }
 
         except Exception as e:
@@ -101,8 +119,40 @@ class TerminalController(http.Controller):
                 'error': str(e)
             }
 
+    def _get_own_session(self, session_id):
+        """terminal.session ของ user ปัจจุบัน (ว่างถ้า session_id เป็นของ user อื่น)"""
+        return request.env['terminal.session'].search([
+            ('session_id', '=', session_id),
+            ('user_id', '=', request.env.uid),
+        ], limit=1)
+
+    def _attach_stream(self, session, stream):
+        """
+        เริ่ม stream output ของ session ผ่าน bus (ถ้า client ขอ)
+
+        Returns:
+            dict: {'channel', 'stream_input'} หรือ {} ถ้าไม่ stream
+        """
+        if not stream:
+            return {}
+
+        from ..services.terminal_bus import TerminalBusPublisher, terminal_channel
+
+        # Stream ได้เฉพาะ sessions ของ user เอง
+        db_session = self._get_own_session(session.session_id)
+        if not db_session:
+            return {}
+
+        TerminalBusPublisher.attach(session, request.env.cr.dbname, db_session.id)
+
+        return {
+            'channel': terminal_channel(session.session_id),
+            # websocket worker ส่ง input ถึง PTY ได้เสมอ (ใน process หรือผ่าน broker)
+            'stream_input': True,
+        }
+
     @http.route('/terminal/poll', type='json', auth='user')
-    def poll_output(self, session_id, timeout=30):
+    def poll_output(self, session_id, timeout=30, offset=None):
         """
         รับ output จาก terminal (Long Polling)
 
@@ -113,14 +163,19 @@ class TerminalController(http.Controller):
         Args:
             session_id: ID ของ session
             timeout: เวลารอสูงสุด (วินาที)
+            offset: sequence offset ที่ได้จาก response ก่อนหน้า (resume ต่อจาก
+                byte สุดท้ายที่เห็น) - None = ใช้ shared cursor ของ session
 
         Returns:
-            dict: {'output': '...', 'success': True} หรือ {'success': False}
+            dict: {'output': '...', 'offset': 123, 'dropped': 0, 'success': True}
+                หรือ {'success': False}
+                dropped = bytes ที่หลุดจาก scrollback ไปก่อน client อ่านทัน
         """
         try:
-            from ..services.terminal_manager import TerminalManager
+            from ..services.terminal_broker import get_terminal_manager
+            TerminalManager = get_terminal_manager()
 
-            session = TerminalManager.get_session(session_id)
+            session = self._get_own_session(session_id) and TerminalManager.get_session(session_id)
             if not session:
                 return {
                     'success': False,
@@ -128,26 +183,16 @@ class TerminalController(http.Controller):
                 }
 
             # รอ output ใหม่ (หรือ timeout)
-            # ใช้ non-blocking queue เพื่อไม่ให้ block Odoo worker
-            start_time = time.time()
-            output_parts = []
-
-            while time.time() - start_time < timeout:
-                # ดึง output จาก buffer
-                new_output = session.get_pending_output()
-
-                if new_output:
-                    output_parts.append(new_output)
-                    # ได้ output แล้ว ส่งกลับทันที
-                    break
-
-                # ยังไม่มี output รอ 0.1 วินาทีแล้วลองใหม่
-                time.sleep(0.1)
+            # I/O loop ของ TerminalManager notify ทันทีเมื่อมี output → ส่งกลับทันที
+            # ระหว่างรอ thread หลับบน condition variable (ไม่กิน CPU)
+            result = session.wait_for_output(timeout=timeout, offset=offset)
 
             return {
                 'success': True,
-                'output': ''.join(output_parts),
-                'has_more': len(session.output_buffer) > 0
+                'output': result['output'],
+                'offset': result['offset'],
+                'dropped': result['dropped'],
+                'has_more': result['has_more']
             }
 
         except Exception as e:
@@ -170,9 +215,10 @@ class TerminalController(http.Controller):
             dict: {'success': True} หรือ {'success': False}
         """
         try:
-            from ..services.terminal_manager import TerminalManager
+            from ..services.terminal_broker import get_terminal_manager
+            TerminalManager = get_terminal_manager()
 
-            session = TerminalManager.get_session(session_id)
+            session = self._get_own_session(session_id) and TerminalManager.get_session(session_id)
             if not session:
                 return {
                     'success': False,
@@ -207,9 +253,10 @@ class TerminalController(http.Controller):
             dict: {'success': True}
         """
         try:
-            from ..services.terminal_manager import TerminalManager
+            from ..services.terminal_broker import get_terminal_manager
+            TerminalManager = get_terminal_manager()
 
-            session = TerminalManager.get_session(session_id)
+            session = self._get_own_session(session_id) and TerminalManager.get_session(session_id)
             if session:
                 session.resize(rows, cols)
 
@@ -231,7 +278,11 @@ class TerminalController(http.Controller):
             dict: {'success': True}
         """
         try:
-            from ..services.terminal_manager import TerminalManager
+            from ..services.terminal_broker import get_terminal_manager
+            TerminalManager = get_terminal_manager()
+
+            if not self._get_own_session(session_id):
+                return {'success': False}
 
             TerminalManager.remove_session(session_id)
 
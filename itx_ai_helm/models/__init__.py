@@ -7,6 +7,7 @@ from . import ai_message
 
 from . import ai_conversation
 from . import terminal_session
+from . import ir_websocket
 
 # Spoke 1: Context Memory (Log Book)
 from . import ai_context
@@ -0,0 +1,73 @@
+# itx_ai_helm/models/ir_websocket.py
+
+import logging
+
+from odoo import models
+
+from ..services.terminal_bus import CHANNEL_PREFIX, INPUT_EVENT, RESIZE_EVENT
+
+_logger = logging.getLogger(__name__)
+
+
+class IrWebsocket(models.AbstractModel):
+    """Terminal streaming: subscribe terminal channels และรับ input ผ่าน websocket"""
+
+    _inherit = 'ir.websocket'
+
+    def _build_bus_channel_list(self, channels):
+        """
+        แปลง channel 'itx_ai_helm.terminal_<session_id>' เป็น terminal.session record
+
+        Subscribe ได้เฉพาะ sessions ของ user เอง
+        """
+        channels = list(channels)  # do not alter original list
+        terminal_ids = []
+        for channel in list(channels):
+            if isinstance(channel, str) and channel.startswith(CHANNEL_PREFIX):
+                terminal_ids.append(channel[len(CHANNEL_PREFIX):])
+                channels.remove(channel)
+
+        if terminal_ids and self.env.uid:
+            channels.extend(self.env['terminal.session'].search([
+                ('session_id', 'in', terminal_ids),
+                ('user_id', '=', self.env.uid),
+            ]))
+
+        return super()._build_bus_channel_list(channels)
+
+    def _serve_ir_websocket(self, event_name, data):
+        if event_name in (INPUT_EVENT, RESIZE_EVENT):
+            self._serve_terminal_event(event_name, data)
+        return super()._serve_ir_websocket(event_name, data)
+
+    def _serve_terminal_event(self, event_name, data):
+        """
+        ส่ง input / resize ไปยัง terminal (websocket → PTY)
+
+        Multi-worker: websocket worker ส่งต่อผ่าน terminal broker
+        รับ event เฉพาะ sessions ของ user เอง
+        """
+        from ..services.terminal_broker import get_terminal_manager
+        from ..services.terminal_bus import TerminalBusPublisher
+
+        session_id = data.get('session_id')
+        db_session = session_id and self.env['terminal.session'].search([
+            ('session_id', '=', session_id),
+            ('user_id', '=', self.env.uid),
+        ], limit=1)
+        if not db_session:
+            return
+
+        session = get_terminal_manager().get_session(session_id)
+        if not session:
+            _logger.warning(f"Terminal event for unknown session {session_id}")
+            return
+
+        # Client ที่ส่ง event ทาง websocket = stream อยู่: ให้แน่ใจว่ายังมี output
+        # stream (เช่น worker ที่ stream อยู่ถูก recycle ไป)
+        TerminalBusPublisher.attach(session, self.env.cr.dbname, db_session.id)
+
+        if event_name == INPUT_EVENT:
+            session.write(data.get('data', ''))
+        else:
+            session.resize(int(data['rows']), int(data['cols']))
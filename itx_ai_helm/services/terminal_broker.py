@@ -0,0 +1,664 @@
+# itx_ai_helm/services/terminal_broker.py
+"""
+Terminal broker - process เดียวที่เป็นเจ้าของ PTY ของทุก terminal session
+
+Odoo แบบหลาย workers (--workers > 1): TerminalManager._sessions อยู่ใน
+process ที่สร้าง session เท่านั้น → request ที่ไปตก worker อื่นหา session
+ไม่เจอ. Broker แก้ปัญหานี้: ทุก worker คุยกับ broker ผ่าน Unix socket
+
+- Worker แรกที่ต่อ broker ไม่ได้จะ spawn broker (python -m services.terminal_broker)
+  broker ถือ flock ไว้ตลอด → มี broker ได้ตัวเดียวต่อ socket
+- 1 broker ต่อ Odoo server (master process): socket อยู่ใน <data_dir>/itx_ai_helm
+  (mode 0700) และรับเฉพาะ connections จาก OS user เดียวกัน (SO_PEERCRED)
+- Broker จบพร้อม Odoo server (restart / upgrade ได้ broker ใหม่ที่รัน code ใหม่)
+- Threaded mode (workers = 0) ไม่ใช้ broker: ใช้ TerminalManager ใน process ตรงๆ
+
+Protocol (framed, ทั้งสองทิศทาง):
+    header: op (1 byte), json length (4 bytes), data length (4 bytes) - big endian
+    body:   json (utf-8) แล้วตามด้วย data (raw bytes: input / output / history)
+
+    1 connection = requests ต่อเนื่อง (ตอบตามลำดับ) หรือ 1 output stream (OP_STREAM)
+"""
+
+import os
+import sys
+import json
+import fcntl
+import select
+import socket
+import socketserver
+import stat
+import struct
+import subprocess
+import threading
+import time
+import logging
+import resource
+
+from .terminal_manager import TerminalManager
+
+_logger = logging.getLogger(__name__)
+
+FRAME_HEADER = struct.Struct('!BII')
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+# Requests (worker → broker)
+OP_CREATE = 1
+OP_START = 2
+OP_STATUS = 3
+OP_WRITE = 4
+OP_RESIZE = 5
+OP_READ = 6
+OP_HISTORY = 7
+OP_REMOVE = 8
+OP_STREAM = 9
+
+# Responses (broker → worker)
+OP_OK = 100
+OP_ERROR = 101
+OP_OUTPUT = 102  # output stream frame
+OP_EOF = 103  # output stream จบ (terminal process จบ)
+
+# เวลารอ broker ที่เพิ่ง spawn (วินาที)
+CONNECT_TIMEOUT = 5
+
+# Timeout ของ request (นอกเหนือจากเวลารอ output ของ OP_READ)
+REQUEST_TIMEOUT = 10
+
+# Output stream ว่าง: เช็คทุกกี่วินาทีว่า worker ยังต่ออยู่
+STREAM_IDLE_CHECK = 5
+
+# Worker ที่ขอ stream ไม่สำเร็จ (worker อื่น stream อยู่) รอก่อนขอใหม่ (วินาที)
+STREAM_RETRY_DELAY = 5
+
+# Directory ของ broker sockets ใต้ Odoo data_dir
+SOCKET_DIR_NAME = 'itx_ai_helm'
+
+# ไม่มี pidfd: เช็คทุกกี่วินาทีว่า Odoo server ยังทำงานอยู่
+SERVER_CHECK_INTERVAL = 5
+
+PEER_CREDENTIALS = struct.Struct('3i')  # struct ucred: pid, uid, gid
+
+
+class TerminalBrokerError(Exception):
+    """Error จาก broker (หรือต่อ broker ไม่ได้)"""
+
+
+def check_private_dir(path):
+    """
+    สร้าง / ตรวจ directory ของ socket: ต้องเป็นของ OS user นี้และเข้าได้คนเดียว (0700)
+
+    Raises:
+        TerminalBrokerError: ถ้า directory เป็นของ user อื่น (หรือไม่ใช่ directory)
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise TerminalBrokerError(f'Terminal broker directory {path} is not a directory of the Odoo user')
+    if info.st_mode & 0o077:
+        os.chmod(path, 0o700)
+
+
+def server_pid():
+    """PID ของ Odoo server (master process) ของ worker นี้"""
+    return os.getppid()
+
+
+def default_socket_path():
+    """Unix socket ของ broker: <data_dir>/itx_ai_helm/terminal-<server pid>.sock"""
+    from odoo.tools import config
+
+    directory = os.path.join(config['data_dir'], SOCKET_DIR_NAME)
+    check_private_dir(directory)
+    return os.path.join(directory, f'terminal-{server_pid()}.sock')
+
+
+def peer_uid(sock):
+    """OS user ของอีกฝั่งของ Unix socket (SO_PEERCRED)"""
+    _, uid, _ = PEER_CREDENTIALS.unpack(
+        sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, PEER_CREDENTIALS.size)
+    )
+    return uid
+
+
+# ============================================================================
+# Protocol
+# ============================================================================
+
+def send_frame(sock, op, header=None, data=b''):
+    """ส่ง 1 frame: op + json header + raw data"""
+    payload = json.dumps(header or {}).encode('utf-8')
+    sock.sendall(FRAME_HEADER.pack(op, len(payload), len(data)) + payload + data)
+
+
+def _recv_exactly(sock, size):
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise ConnectionError('Terminal broker connection closed')
+        buffer += chunk
+    return bytes(buffer)
+
+
+def recv_frame(sock):
+    """
+    รับ 1 frame
+
+    Returns:
+        tuple: (op, header dict, data bytes)
+    """
+    op, json_length, data_length = FRAME_HEADER.unpack(_recv_exactly(sock, FRAME_HEADER.size))
+    if json_length + data_length > MAX_FRAME_SIZE:
+        raise ConnectionError(f'Terminal broker frame too large: {json_length + data_length} bytes')
+    header = json.loads(_recv_exactly(sock, json_length)) if json_length else {}
+    data = _recv_exactly(sock, data_length) if data_length else b''
+    return op, header, data
+
+
+def _peer_closed(sock):
+    """True ถ้าอีกฝั่งปิด connection แล้ว (ไม่ block)"""
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+        return bool(readable) and not sock.recv(1, socket.MSG_PEEK)
+    except (OSError, ValueError):
+        return True
+
+
+# ============================================================================
+# Broker (server process)
+# ============================================================================
+
+class BrokerRequestHandler(socketserver.BaseRequestHandler):
+    """จัดการ 1 connection จาก worker"""
+
+    def handle(self):
+        while True:
+            try:
+                op, header, data = recv_frame(self.request)
+            except OSError:
+                return
+
+            if op == OP_STREAM:
+                self._stream(header)
+                return
+
+            try:
+                response, output = self.server.dispatch(op, header, data)
+                reply = OP_OK
+            except Exception as e:
+                _logger.error(f"Terminal broker request {op} failed: {e}")
+                response, output, reply = {'error': str(e)}, b'', OP_ERROR
+
+            try:
+                send_frame(self.request, reply, response, output)
+            except OSError:
+                return
+
+    def _stream(self, header):
+        """
+        Push output ของ session ไปยัง worker จนกว่า session จบ / worker ตัดการเชื่อมต่อ
+
+        1 stream ต่อ (session, key) - worker อื่นที่ขอซ้ำจะได้ OP_ERROR
+        """
+        session_id = header.get('session_id')
+        key = (session_id, header.get('key'))
+        session = TerminalManager.get_session(session_id)
+
+        if session is None or not self.server.claim_stream(key, self.request):
+            try:
+                send_frame(self.request, OP_ERROR, {'error': 'Stream not available'})
+            except OSError:
+                pass
+            return
+
+        try:
+            send_frame(self.request, OP_OK)
+
+            offset = header.get('offset')
+            if offset is None:
+                offset = session.output_buffer.end
+
+            while True:
+                result = session.wait_for_output(timeout=STREAM_IDLE_CHECK, offset=offset)
+                if result['output'] or result['dropped']:
+                    offset = result['offset']
+                    send_frame(self.request, OP_OUTPUT, {
+                        'offset': offset,
+                        'dropped': result['dropped'],
+                    }, result['output'].encode('utf-8'))
+                elif not session.running:
+                    send_frame(self.request, OP_EOF)
+                    return
+                elif _peer_closed(self.request):
+                    return
+        except OSError:
+            return
+        finally:
+            self.server.release_stream(key, self.request)
+
+
+class TerminalBroker(socketserver.ThreadingUnixStreamServer):
+    """Broker server: เจ้าของ TerminalManager sessions ทั้งหมด"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        self._streams = {}  # (session_id, key) → socket ของ worker ที่ stream อยู่
+        self._streams_lock = threading.Lock()
+        super().__init__(socket_path, BrokerRequestHandler)
+
+    def verify_request(self, request, client_address):
+        """รับเฉพาะ connections จาก OS user เดียวกับ broker (Odoo)"""
+        try:
+            uid = peer_uid(request)
+        except OSError:
+            return False
+        if uid != os.getuid():
+            _logger.warning(f"Terminal broker rejected a connection from uid {uid}")
+            return False
+        return True
+
+    def dispatch(self, op, header, data):
+        """
+        ทำ request 1 ครั้ง
+
+        Returns:
+            tuple: (response dict, response data bytes)
+        """
+        session_id = header.get('session_id')
+
+        if op == OP_CREATE:
+            session = TerminalManager.create_session(session_id, header.get('command', 'bash'), header.get('cwd'))
+            return self._status(session), b''
+
+        session = TerminalManager.get_session(session_id)
+
+        if op == OP_STATUS:
+            return self._status(session), b''
+
+        if op == OP_REMOVE:
+            TerminalManager.remove_session(session_id)
+            return {}, b''
+
+        if session is None:
+            raise TerminalBrokerError(f'Session not found: {session_id}')
+
+        if op == OP_START:
+            session.start()
+            return self._status(session), b''
+
+        if op == OP_WRITE:
+            return {'success': session.write(data.decode('utf-8', errors='replace'))}, b''
+
+        if op == OP_RESIZE:
+            session.resize(int(header['rows']), int(header['cols']))
+            return {}, b''
+
+        if op == OP_READ:
+            result = session.wait_for_output(timeout=header.get('timeout', 30), offset=header.get('offset'))
+            return result, result.pop('output').encode('utf-8')
+
+        if op == OP_HISTORY:
+            history, offset = session.get_history(lines=header.get('lines', 100))
+            return {'offset': offset}, history.encode('utf-8')
+
+        raise TerminalBrokerError(f'Unknown operation: {op}')
+
+    @staticmethod
+    def _status(session):
+        if session is None:
+            return {'exists': False, 'running': False, 'alive': False}
+        return {'exists': True, 'running': session.running, 'alive': session.is_alive()}
+
+    def claim_stream(self, key, sock):
+        """จอง output stream (แทนที่ stream เดิมถ้า worker นั้นตัดการเชื่อมต่อไปแล้ว)"""
+        with self._streams_lock:
+            current = self._streams.get(key)
+            if current is not None and current is not sock and not _peer_closed(current):
+                return False
+            self._streams[key] = sock
+            return True
+
+    def release_stream(self, key, sock):
+        with self._streams_lock:
+            if self._streams.get(key) is sock:
+                del self._streams[key]
+
+
+def _watch_server(server, pid):
+    """Shutdown broker เมื่อ Odoo server (pid) จบ"""
+    try:
+        pidfd = os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        pidfd = None
+
+    if pidfd is not None:
+        # pidfd อ่านได้เมื่อ process จบ (ไม่โดน PID reuse)
+        select.select([pidfd], [], [])
+    else:
+        while True:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                break
+            except PermissionError:
+                pass
+            time.sleep(SERVER_CHECK_INTERVAL)
+
+    _logger.info(f"Odoo server {pid} stopped, shutting down terminal broker")
+    server.shutdown()
+
+
+def serve(socket_path, odoo_pid=None):
+    """
+    รัน broker (block จนกว่า Odoo server odoo_pid จบ)
+
+    ออกทันทีถ้ามี broker อื่นถือ lock ของ socket นี้อยู่แล้ว
+    """
+    # Socket ใช้ได้เฉพาะ OS user เดียวกับ Odoo
+    os.umask(0o077)
+    check_private_dir(os.path.dirname(socket_path))
+
+    lock_path = f'{socket_path}.lock'
+    lock_file = open(lock_path, 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        _logger.info(f"Terminal broker already running on {socket_path}")
+        return
+
+    # Odoo worker ที่ spawn broker ตั้ง memory/CPU limits ของตัวเองไว้ → ยกเลิก
+    for limit in (resource.RLIMIT_AS, resource.RLIMIT_CPU):
+        try:
+            resource.setrlimit(limit, (resource.getrlimit(limit)[1],) * 2)
+        except (ValueError, OSError) as e:
+            _logger.warning(f"Could not reset resource limit {limit}: {e}")
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = TerminalBroker(socket_path)
+    if odoo_pid:
+        threading.Thread(target=_watch_server, args=(server, odoo_pid), name='terminal-broker-watch', daemon=True).start()
+
+    _logger.info(f"Terminal broker listening on {socket_path} (PID {os.getpid()}, Odoo server {odoo_pid})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        for session_id in list(TerminalManager._sessions):
+            TerminalManager.remove_session(session_id)
+        for path in (socket_path, lock_path):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def spawn_broker(socket_path):
+    """Start broker เป็น process แยก (detached จาก Odoo worker, จบพร้อม Odoo server)"""
+    addon_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [addon_path, os.environ.get('PYTHONPATH')])))
+
+    subprocess.Popen(
+        [sys.executable, '-m', 'services.terminal_broker', socket_path, str(server_pid())],
+        cwd=addon_path,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        close_fds=True,
+        start_new_session=True,
+    )
+    _logger.info(f"Spawned terminal broker on {socket_path}")
+
+
+# ============================================================================
+# Client (Odoo workers)
+# ============================================================================
+
+class TerminalBrokerClient:
+    """Connection จาก Odoo worker ไปยัง broker (1 connection ต่อ thread)"""
+
+    def __init__(self, socket_path=None):
+        self._socket_path = socket_path
+        self._local = threading.local()
+
+    @property
+    def socket_path(self):
+        # คำนวณตอนใช้งาน (ใน worker) - ไม่ใช่ตอน import
+        if self._socket_path is None:
+            self._socket_path = default_socket_path()
+        return self._socket_path
+
+    def connect(self):
+        """เปิด connection ใหม่ (spawn broker ถ้ายังไม่มี)"""
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        spawned = False
+
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.socket_path)
+                if peer_uid(sock) != os.getuid():
+                    sock.close()
+                    raise TerminalBrokerError(f'Terminal broker on {self.socket_path} runs as another user')
+                return sock
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                if not spawned:
+                    spawn_broker(self.socket_path)
+                    spawned = True
+                elif time.monotonic() > deadline:
+                    raise TerminalBrokerError(f'Terminal broker not available on {self.socket_path}')
+                # รอ broker ที่เพิ่ง spawn เริ่ม listen
+                time.sleep(0.05)
+
+    def _connection(self):
+        """Connection ของ thread นี้ (ต่อใหม่หลัง fork)"""
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None and self._local.pid == os.getpid():
+            return sock, True
+
+        self._local.sock = self.connect()
+        self._local.pid = os.getpid()
+        return self._local.sock, False
+
+    def _close(self):
+        sock = getattr(self._local, 'sock', None)
+        self._local.sock = None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def call(self, op, header=None, data=b'', timeout=REQUEST_TIMEOUT):
+        """
+        ส่ง request แล้วรอ response
+
+        Returns:
+            tuple: (response dict, response data bytes)
+
+        Raises:
+            TerminalBrokerError: ถ้า broker ตอบ error
+        """
+        while True:
+            sock, reused = self._connection()
+            try:
+                sock.settimeout(timeout)
+                send_frame(sock, op, header, data)
+                reply, response, output = recv_frame(sock)
+                break
+            except OSError:
+                self._close()
+                # Connection เก่าอาจตายไปแล้ว (broker restart) → ลองใหม่ครั้งเดียว
+                if not reused:
+                    raise
+
+        if reply == OP_ERROR:
+            raise TerminalBrokerError(response.get('error', 'Terminal broker error'))
+        return response, output
+
+
+class OutputPump(threading.Thread):
+    """รับ output stream จาก broker แล้วส่งให้ listener (ใน worker ที่ขอ stream)"""
+
+    def __init__(self, client, session_id, key, callback):
+        super().__init__(name=f'terminal-pump-{session_id[:8]}', daemon=True)
+        self.client = client
+        self.session_id = session_id
+        self.key = key
+        self.callback = callback
+        self.retry_at = 0
+        self._sock = None
+
+    def run(self):
+        try:
+            self._sock = self.client.connect()
+            send_frame(self._sock, OP_STREAM, {'session_id': self.session_id, 'key': self.key})
+            reply, _, _ = recv_frame(self._sock)
+            if reply != OP_OK:
+                # Worker อื่น stream session นี้อยู่แล้ว
+                self.retry_at = time.monotonic() + STREAM_RETRY_DELAY
+                return
+
+            while True:
+                op, header, data = recv_frame(self._sock)
+                if op != OP_OUTPUT:
+                    return
+                # Broker ส่ง output เป็น UTF-8 characters ครบตัว: start = end - จำนวน bytes
+                self.callback(data.decode('utf-8', errors='replace'), header['offset'] - len(data), header['offset'])
+        except (OSError, TerminalBrokerError) as e:
+            _logger.debug(f"Terminal output pump {self.session_id} stopped: {e}")
+        finally:
+            self.stop()
+
+    def stop(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+
+
+class RemoteTerminalSession:
+    """TerminalSession ที่อยู่ใน broker (interface เดียวกับ TerminalSession)"""
+
+    _pumps = {}  # (session_id, key) → OutputPump ของ process นี้
+    _pumps_lock = threading.Lock()
+
+    def __init__(self, client, session_id, status):
+        self.client = client
+        self.session_id = session_id
+        self._update(status)
+
+    def _update(self, status):
+        self.running = status['running']
+        self._alive = status['alive']
+
+    def _call(self, op, header=None, data=b'', **kwargs):
+        return self.client.call(op, dict(header or {}, session_id=self.session_id), data, **kwargs)
+
+    def start(self):
+        self._update(self._call(OP_START)[0])
+
+    def is_alive(self):
+        return self._alive
+
+    def write(self, data):
+        return self._call(OP_WRITE, data=data.encode('utf-8'))[0]['success']
+
+    def resize(self, rows, cols):
+        self._call(OP_RESIZE, {'rows': rows, 'cols': cols})
+
+    def wait_for_output(self, timeout=30, offset=None):
+        result, output = self._call(
+            OP_READ, {'timeout': timeout, 'offset': offset},
+            timeout=timeout + REQUEST_TIMEOUT,
+        )
+        result['output'] = output.decode('utf-8', errors='replace')
+        return result
+
+    def read_output(self, offset=None):
+        return self.wait_for_output(timeout=0, offset=offset)
+
+    def get_pending_output(self):
+        return self.read_output()['output']
+
+    def get_history(self, lines=100):
+        result, output = self._call(OP_HISTORY, {'lines': lines})
+        return output.decode('utf-8', errors='replace'), result['offset']
+
+    def add_output_listener(self, key, callback):
+        """
+        รับ output stream จาก broker ใน process นี้
+
+        Broker ให้ stream ได้ worker เดียวต่อ key - ถ้า worker อื่น stream อยู่
+        แล้ว listener นี้ไม่ได้รับ output (ไม่มี output ซ้ำ)
+        """
+        key = key if isinstance(key, str) else ':'.join(map(str, key))
+        pump_key = (self.session_id, key)
+
+        with self._pumps_lock:
+            pump = self._pumps.get(pump_key)
+            if pump is not None:
+                if pump.is_alive():
+                    pump.callback = callback
+                    return
+                if time.monotonic() < pump.retry_at:
+                    return
+            pump = OutputPump(self.client, self.session_id, key, callback)
+            self._pumps[pump_key] = pump
+        pump.start()
+
+    def remove_output_listener(self, key):
+        key = key if isinstance(key, str) else ':'.join(map(str, key))
+        with self._pumps_lock:
+            pump = self._pumps.pop((self.session_id, key), None)
+        if pump is not None:
+            pump.stop()
+
+
+class BrokerTerminalManager:
+    """TerminalManager API ที่ส่งทุก operation ต่อไปยัง broker"""
+
+    client = TerminalBrokerClient()
+
+    @classmethod
+    def create_session(cls, session_id, command='bash', cwd=None):
+        status, _ = cls.client.call(OP_CREATE, {'session_id': session_id, 'command': command, 'cwd': cwd})
+        return RemoteTerminalSession(cls.client, session_id, status)
+
+    @classmethod
+    def get_session(cls, session_id):
+        status, _ = cls.client.call(OP_STATUS, {'session_id': session_id})
+        if not status['exists']:
+            return None
+        return RemoteTerminalSession(cls.client, session_id, status)
+
+    @classmethod
+    def remove_session(cls, session_id):
+        cls.client.call(OP_REMOVE, {'session_id': session_id})
+
+
+def get_terminal_manager():
+    """
+    TerminalManager ที่ controller ควรใช้
+
+    Returns:
+        BrokerTerminalManager เมื่อ Odoo รันหลาย workers, ไม่เช่นนั้น TerminalManager
+    """
+    from odoo.tools import config
+
+    if config['workers']:
+        return BrokerTerminalManager
+    return TerminalManager
+
+
+if __name__ == '__main__':
+    # python -m services.terminal_broker <socket_path> <odoo server pid> (spawn โดย spawn_broker)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(process)d %(levelname)s terminal_broker: %(message)s',
+    )
+    serve(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else None)
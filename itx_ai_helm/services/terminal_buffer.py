@@ -0,0 +1,119 @@
+# itx_ai_helm/services/terminal_buffer.py
+"""
+Scrollback ของ terminal session แบบ ring buffer (bytes)
+
+- หน่วยความจำคงที่ต่อ session (capacity bytes) ไม่ว่า output จะมากแค่ไหน
+- ทุก byte มี sequence offset (นับจาก 0 ตั้งแต่เริ่ม session)
+  → client ขอ output ต่อจาก "byte สุดท้ายที่เห็น" ได้
+- Consumer ที่อ่านช้าจนข้อมูลถูกเขียนทับ จะได้จำนวน bytes ที่หายไป (dropped)
+"""
+
+# Scrollback ต่อ session (bytes)
+DEFAULT_SCROLLBACK_BYTES = 1024 * 1024
+
+
+def utf8_complete_length(data):
+    """
+    ความยาวของ data ที่ไม่รวม UTF-8 character ที่ยังมาไม่ครบตอนท้าย
+
+    PTY read อาจตัดกลาง character - ส่วนที่เหลือค่อยส่งในรอบถัดไป
+    """
+    # ย้อนดูไม่เกิน 3 bytes หา lead byte ของ character สุดท้าย
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte < 0x80:
+            return len(data)
+        if byte >= 0xC0:
+            # Lead byte: จำนวน bytes ที่ character ต้องการ
+            needed = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+            return len(data) if back >= needed else len(data) - back
+    return len(data)
+
+
+class OutputRingBuffer:
+    """
+    Ring buffer ของ output bytes พร้อม sequence offsets
+
+    ไม่ thread-safe: ผู้ใช้ต้องถือ lock เอง (TerminalSession.output_condition)
+
+    Attributes:
+        capacity: ขนาดสูงสุด (bytes)
+        end: offset ของ byte ถัดไปที่จะถูกเขียน (= bytes ทั้งหมดที่เคยเขียน)
+    """
+
+    def __init__(self, capacity=DEFAULT_SCROLLBACK_BYTES):
+        self.capacity = capacity
+        self._data = bytearray(capacity)
+        self.end = 0
+
+    @property
+    def start(self):
+        """Offset ของ byte เก่าที่สุดที่ยังอยู่ใน buffer"""
+        return max(0, self.end - self.capacity)
+
+    def __len__(self):
+        return self.end - self.start
+
+    def write(self, data):
+        """
+        เขียน bytes ต่อท้าย (เขียนทับข้อมูลเก่าที่สุดเมื่อเต็ม)
+
+        Returns:
+            int: offset หลังเขียน (end)
+        """
+        if len(data) > self.capacity:
+            # เก็บเฉพาะส่วนท้ายที่จุได้
+            self.end += len(data) - self.capacity
+            data = data[-self.capacity:]
+
+        position = self.end % self.capacity
+        first = min(len(data), self.capacity - position)
+        self._data[position:position + first] = data[:first]
+        self._data[:len(data) - first] = data[first:]
+        self.end += len(data)
+        return self.end
+
+    def read(self, offset, limit=None):
+        """
+        อ่าน bytes ตั้งแต่ offset
+
+        Args:
+            offset: sequence offset ที่ต้องการอ่านต่อ
+            limit: จำนวน bytes สูงสุด (None = ทั้งหมด)
+
+        Returns:
+            tuple: (data, next_offset, dropped)
+                dropped = จำนวน bytes ที่ถูกเขียนทับไปก่อนอ่าน (consumer ช้าเกิน)
+        """
+        offset = min(max(offset, 0), self.end)
+        dropped = max(0, self.start - offset)
+        offset += dropped
+
+        length = self.end - offset
+        if limit is not None:
+            length = min(length, limit)
+        if not length:
+            return b'', offset, dropped
+
+        position = offset % self.capacity
+        first = min(length, self.capacity - position)
+        data = bytes(self._data[position:position + first]) + bytes(self._data[:length - first])
+        return data, offset + length, dropped
+
+    def tail_lines(self, lines):
+        """
+        Offset ของจุดเริ่ม N บรรทัดสุดท้ายใน buffer
+
+        Args:
+            lines: จำนวนบรรทัด
+
+        Returns:
+            int: sequence offset (ใช้กับ read())
+        """
+        data, _, _ = self.read(self.start)
+        position = len(data)
+        for _ in range(lines):
+            position = data.rfind(b'\n', 0, position)
+            if position < 0:
+                return self.start
+        return self.start + position + 1
@@ -0,0 +1,142 @@
+# itx_ai_helm/services/terminal_bus.py
+"""
+Terminal streaming ผ่าน Odoo bus (websocket)
+
+- Output: I/O loop ของ TerminalManager → queue → publisher thread เดียว
+  (สำหรับทุก session) → bus channel ของ terminal.session record
+  → ทุก client ที่ subscribe channel นั้น (fan-out หลาย viewers)
+- Input / resize: client ส่ง event ผ่าน websocket เดียวกัน
+  (ดู models/ir_websocket.py)
+"""
+
+import logging
+import queue
+import threading
+
+from odoo import api, SUPERUSER_ID
+from odoo.modules.registry import Registry
+
+_logger = logging.getLogger(__name__)
+
+# Channel ที่ client subscribe: itx_ai_helm.terminal_<session_id>
+CHANNEL_PREFIX = 'itx_ai_helm.terminal_'
+
+# Notification (server → client) และ websocket events (client → server)
+OUTPUT_NOTIFICATION = 'itx_ai_helm.terminal/output'
+INPUT_EVENT = 'itx_ai_helm.terminal/input'
+RESIZE_EVENT = 'itx_ai_helm.terminal/resize'
+
+# จำนวน chunks สูงสุดที่รวมส่งใน transaction เดียว
+MAX_BATCH_CHUNKS = 256
+
+# Chunks ที่รอส่งได้สูงสุด (ถ้า bus/database ช้า: chunks ใหม่ถูกทิ้ง
+# client ดึงส่วนที่หายจาก scrollback ด้วย offset ได้)
+MAX_QUEUED_CHUNKS = 4096
+
+
+def terminal_channel(session_id):
+    """ชื่อ bus channel ของ terminal session"""
+    return f'{CHANNEL_PREFIX}{session_id}'
+
+
+class TerminalBusPublisher:
+    """
+    ส่ง output ของ terminal sessions ไปยัง Odoo bus
+
+    ใช้ thread เดียวสำหรับทุก session: chunks ที่ค้างใน queue ถูกรวมเป็น
+    frame เดียวต่อ session และส่งใน transaction เดียวต่อ database
+    """
+
+    _queue = queue.Queue(maxsize=MAX_QUEUED_CHUNKS)
+    _thread = None
+    _lock = threading.Lock()
+    dropped_chunks = 0
+
+    @classmethod
+    def attach(cls, session, dbname, record_id):
+        """
+        เริ่ม stream output ของ session ไปยัง bus channel ของ record
+
+        เรียกซ้ำได้ (listener เดิมถูกแทนที่) - viewers ทั้งหมดใช้ channel เดียวกัน
+
+        Args:
+            session: TerminalSession
+            dbname: ชื่อ database
+            record_id: ID ของ terminal.session record (bus channel)
+        """
+        cls._ensure_thread()
+
+        session_id = session.session_id
+        session.add_output_listener(
+            ('bus', dbname),
+            lambda text, start, end: cls._enqueue((dbname, record_id, session_id, text, start, end)),
+        )
+
+    @classmethod
+    def _enqueue(cls, chunk):
+        """ใส่ chunk ลง queue โดยไม่ block I/O loop (เต็ม = ทิ้ง)"""
+        try:
+            cls._queue.put_nowait(chunk)
+        except queue.Full:
+            cls.dropped_chunks += 1
+            if cls.dropped_chunks % 100 == 1:
+                _logger.warning(f"Terminal bus queue full: {cls.dropped_chunks} chunks dropped")
+
+    @classmethod
+    def _ensure_thread(cls):
+        """Start publisher thread (ครั้งแรกที่มีการ attach)"""
+        with cls._lock:
+            if cls._thread is None or not cls._thread.is_alive():
+                cls._thread = threading.Thread(target=cls._run, name='terminal-bus-publisher')
+                cls._thread.daemon = True
+                cls._thread.start()
+
+    @classmethod
+    def _run(cls):
+        """Publisher loop: รอ output → รวม chunks ที่ค้าง → ส่งเข้า bus"""
+        while True:
+            chunks = [cls._queue.get()]
+
+            # รวม chunks ที่ค้างอยู่ (ระหว่างที่ส่ง batch ก่อนหน้า)
+            while len(chunks) < MAX_BATCH_CHUNKS:
+                try:
+                    chunks.append(cls._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # dbname → {(record_id, session_id): [[start, end, [text, ...]], ...]} (รักษาลำดับ output)
+            # รวมเฉพาะ chunks ที่ต่อเนื่องกัน - chunks ที่หายไป (queue เต็ม) = frame ใหม่
+            outputs = {}
+            for dbname, record_id, session_id, text, start, end in chunks:
+                frames = outputs.setdefault(dbname, {}).setdefault((record_id, session_id), [])
+                if frames and frames[-1][1] == start:
+                    frames[-1][1] = end
+                    frames[-1][2].append(text)
+                else:
+                    frames.append([start, end, [text]])
+
+            for dbname, frames in outputs.items():
+                try:
+                    cls._send(dbname, frames)
+                except Exception as e:
+                    _logger.error(f"Terminal bus publish error ({dbname}): {e}")
+
+    @classmethod
+    def _send(cls, dbname, frames):
+        """
+        ส่ง frames ของแต่ละ session (NOTIFY ตอน commit)
+
+        Frame = output bytes [start, offset) - client ตัดส่วนที่ซ้ำกับที่เห็นแล้ว
+        และ poll ส่วนที่ขาด (start > offset ที่เห็น) จาก scrollback
+        """
+        with Registry(dbname).cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            Terminal = env['terminal.session']
+            for (record_id, session_id), session_frames in frames.items():
+                for start, end, texts in session_frames:
+                    env['bus.bus']._sendone(Terminal.browse(record_id), OUTPUT_NOTIFICATION, {
+                        'session_id': session_id,
+                        'output': ''.join(texts),
+                        'start': start,
+                        'offset': end,
+                    })
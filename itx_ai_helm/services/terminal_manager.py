@@ -1,9 +1,11 @@
 # itx_ai_helm/services/terminal_manager.py
 
 import os
+import codecs
+import time
 import pty
 import subprocess
-import select
+import selectors
 import termios
 import struct
 import fcntl
@@ -14,14 +16,38 @@ import signal
 import resource
 from pathlib import Path
 
+from .terminal_buffer import OutputRingBuffer, DEFAULT_SCROLLBACK_BYTES, utf8_complete_length
+
 _logger = logging.getLogger(__name__)
 
+# Output สูงสุดต่อ 1 poll response (bytes)
+POLL_READ_LIMIT = 64 * 1024
+
+# อ่าน PTY ครั้งละสูงสุด (bytes)
+READ_CHUNK_SIZE = 64 * 1024
+
 
 class TerminalManager:
-    """Manage terminal sessions"""
+    """
+    Manage terminal sessions
+
+    I/O loop: thread เดียว (selectors/epoll) อ่าน PTY ของทุก session
+    - ไม่มี reader thread ต่อ session, idle = ไม่ตื่นเลย (ไม่มี timeout)
+    - EOF / child reaping จัดการที่ loop
+    - Dispatch กับการปิด PTY fd ทำภายใต้ _watch_lock: fd number ที่ปิดแล้ว
+      อาจถูก forkpty ใหม่ใช้ซ้ำ → event ค้างของ session เก่าต้องไม่อ่าน PTY ใหม่
+    """
 
     _sessions = {}
 
+    # I/O loop (สร้างตอนมี session แรกใน process นี้ - ไม่ share epoll ข้าม fork)
+    _selector = None
+    _io_thread = None
+    _io_pid = None
+    _io_lock = threading.Lock()
+    _watch_lock = threading.Lock()
+    _wakeup_fds = None
+
     @classmethod
     def create_session(cls, session_id, command='bash', cwd=None):
         """
@@ -83,28 +109,132 @@ class TerminalManager:
             _logger.info(f"Cleaning up dead session: {session_id}")
             cls.remove_session(session_id)
 
+    # ========================================================================
+    # I/O loop
+    # ========================================================================
+
+    @classmethod
+    def watch(cls, session):
+        """เริ่มอ่าน output ของ session ใน I/O loop"""
+        cls._ensure_io_loop()
+        cls._selector.register(session.fd, selectors.EVENT_READ, session)
+        cls._wakeup()
+
+    @classmethod
+    def unwatch(cls, session):
+        """หยุดอ่าน output ของ session (ต้องเรียกก่อนปิด fd)"""
+        if cls._selector is None or cls._io_pid != os.getpid():
+            return
+        try:
+            cls._selector.unregister(session.fd)
+        except (KeyError, ValueError):
+            pass
+
+    @classmethod
+    def close_pty(cls, session):
+        """Unwatch แล้วปิด PTY fd ของ session (ไม่ชนกับ dispatch ของ I/O loop)"""
+        with cls._watch_lock:
+            if session.fd is None:
+                return
+            cls.unwatch(session)
+            fd, session.fd = session.fd, None
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    @classmethod
+    def _ensure_io_loop(cls):
+        """Start I/O loop thread (ครั้งแรก หรือหลัง fork)"""
+        with cls._io_lock:
+            if cls._io_thread is not None and cls._io_thread.is_alive() and cls._io_pid == os.getpid():
+                return
+
+            cls._selector = selectors.DefaultSelector()
+
+            # Pipe สำหรับปลุก loop เมื่อมีการ register (selector ที่ไม่ใช่ epoll)
+            cls._wakeup_fds = os.pipe()
+            for fd in cls._wakeup_fds:
+                os.set_blocking(fd, False)
+            cls._selector.register(cls._wakeup_fds[0], selectors.EVENT_READ, None)
+
+            cls._io_pid = os.getpid()
+            cls._io_thread = threading.Thread(
+                target=cls._io_loop, args=(cls._selector, cls._wakeup_fds[0]), name='terminal-io',
+            )
+            cls._io_thread.daemon = True
+            cls._io_thread.start()
+
+    @classmethod
+    def _wakeup(cls):
+        try:
+            os.write(cls._wakeup_fds[1], b'\0')
+        except BlockingIOError:
+            pass  # pipe เต็ม = loop จะตื่นอยู่แล้ว
+
+    @classmethod
+    def _io_loop(cls, selector, wakeup_fd):
+        """รอ PTY ที่มี output (block จนกว่าจะมี) แล้ว dispatch ให้ session"""
+        while True:
+            for key, _ in selector.select():
+                session = key.data
+                if session is None:
+                    try:
+                        while os.read(wakeup_fd, 4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    continue
+
+                with cls._watch_lock:
+                    # Event ค้างของ session ที่ปิด fd ไปแล้ว (fd อาจเป็นของ PTY ใหม่)
+                    if session.fd != key.fd or not session.running:
+                        continue
+
+                    try:
+                        if session._read_output():
+                            continue
+                    except Exception as e:
+                        _logger.error(f"Read error ({session.session_id}): {e}")
+
+                    # EOF / error - terminal process ended
+                    cls.unwatch(session)
+                session._on_eof()
+
 
 class TerminalSession:
     """
     Single terminal session
 
     แก้ไขเพื่อรองรับ Long Polling:
-    - เพิ่ม pending_output_queue เพื่อเก็บ output ใหม่ที่ยังไม่ได้ส่ง
-    - เพิ่ม get_pending_output() method สำหรับ polling
-    - เก็บ websockets ไว้เผื่ออนาคตจะใช้ (ตอนนี้ไม่ใช้)
+    - output_buffer: ring buffer (bytes) ขนาดคงที่ - ทุก byte มี sequence offset
+      → client อ่านต่อจาก offset ที่เห็นล่าสุดได้ (หลาย viewers อ่านอิสระ)
+    - get_pending_output() / read_output() method สำหรับ polling
+    - output_condition: I/O loop แจ้ง (notify) ทันทีเมื่อมี output ใหม่
+      → long-poll request ตื่นทันที ไม่ต้อง sleep-poll
+    - output_listeners: callbacks ที่ได้รับ output ทุก chunk (เช่น bus streaming)
     """
 
-    def __init__(self, session_id, command='claude', cwd=None):
+    def __init__(self, session_id, command='claude', cwd=None, scrollback_bytes=DEFAULT_SCROLLBACK_BYTES):
         self.session_id = session_id
         self.command = command
         self.cwd = cwd or '/tmp'
         self.child_pid = None
         self.fd = None
-        self.websockets = set()  # เก็บไว้เผื่ออนาคต (ไม่ใช้แล้ว)
-        self.output_buffer = []  # เก็บ history ทั้งหมด
-        self.pending_output = []  # เก็บ output ใหม่ที่ยังไม่ได้ส่ง (สำหรับ polling)
-        self.max_buffer_size = 1000
+        self.output_listeners = {}  # key → callback(text, start, end) ที่รับ output ทุก chunk (streaming)
+        self.output_buffer = OutputRingBuffer(scrollback_bytes)  # history (bytes, หน่วยความจำคงที่)
+        self.poll_offset = 0  # offset ของ pollers ที่ไม่ส่ง offset มาเอง (shared cursor)
+        self.dropped_bytes = 0  # bytes ที่ถูกเขียนทับก่อน shared cursor จะอ่านทัน
         self.running = False
+        self.exit_status = None  # waitpid status เมื่อ child จบแล้ว
+
+        # Decode output สำหรับ listeners (รองรับ UTF-8 character ที่ถูกตัดกลาง read)
+        self._listener_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._listener_offset = 0  # offset ของ byte แรกที่ decoder ยังไม่ส่งให้ listeners
+
+        # Condition ที่คุม output_buffer: I/O loop notify เมื่อมี output ใหม่
+        # หรือเมื่อ session จบ (wait_for_output จะได้ตื่นทันที)
+        self.output_condition = threading.Condition()
 
         # Claude specific path
         self.claude_path = self._find_claude_cli()
@@ -189,13 +319,14 @@ class TerminalSession:
                     os.execvpe(self.command, [self.command], env)
             else:
                 # Parent process
+                # forkpty ไม่ตั้ง close-on-exec ให้ master fd → child ของ sessions ถัดไป
+                # จะถือ PTY นี้ค้างไว้ (ปิดแล้ว child ไม่ได้ SIGHUP)
+                os.set_inheritable(self.fd, False)
                 self.running = True
                 self._set_winsize(24, 80)
 
-                # Start reader thread
-                self.reader_thread = threading.Thread(target=self._read_output)
-                self.reader_thread.daemon = True
-                self.reader_thread.start()
+                # อ่าน output ผ่าน I/O loop ของ TerminalManager
+                TerminalManager.watch(self)
 
                 _logger.info(f"Started terminal session {self.session_id} with PID {self.child_pid}")
 
@@ -205,37 +336,95 @@ class TerminalSession:
 
     def _read_output(self):
         """
-        อ่าน output จาก terminal
+        อ่าน output จาก terminal (เรียกจาก I/O loop เมื่อ PTY มี output)
 
         แก้ไขสำหรับ Long Polling:
-        - เก็บ output ใน pending_output list (สำหรับ client ดึงไปแสดง)
-        - เก็บ output ใน output_buffer (เป็น history)
-        - ไม่ broadcast ผ่าน websocket แล้ว (ใช้ polling แทน)
+        - เก็บ output (bytes) ใน output_buffer ring buffer (history + polling)
+        - ส่งต่อให้ output_listeners (streaming)
+
+        Returns:
+            bool: False เมื่อ EOF (terminal process จบ)
+        """
+        try:
+            output = os.read(self.fd, READ_CHUNK_SIZE)
+        except OSError:
+            # EIO = child ปิด PTY แล้ว
+            return False
+
+        if not output:
+            return False
+
+        with self.output_condition:
+            # เก็บใน ring buffer (เขียนทับ output เก่าสุดเมื่อเต็ม)
+            offset = self.output_buffer.write(output)
+
+            # ปลุก long-poll requests ที่รออยู่
+            self.output_condition.notify_all()
+
+        # ส่งต่อให้ streaming listeners (นอก lock)
+        if self.output_listeners:
+            text = self._listener_decoder.decode(output)
+            # bytes ของ character ที่ยังมาไม่ครบรออยู่ใน decoder (ส่งใน chunk ถัดไป)
+            end = offset - len(self._listener_decoder.getstate()[0])
+            self._notify_listeners(text, self._listener_offset, end)
+            self._listener_offset = end
+        else:
+            self._listener_decoder.reset()
+            self._listener_offset = offset
+        return True
+
+    def _on_eof(self):
+        """Terminal process จบ: หยุด session แล้วเก็บ exit status (ถ้า child จบแล้ว)"""
+        self._stop_reading()
+        self._reap()
+
+    def _reap(self):
+        """เก็บ exit status ของ child แบบ non-blocking (กัน zombie process)"""
+        if not self.child_pid or self.exit_status is not None:
+            return
+
+        try:
+            pid, status = os.waitpid(self.child_pid, os.WNOHANG)
+        except ChildProcessError:
+            # Process ไม่มีอยู่แล้ว
+            self.exit_status = -1
+            return
+
+        if pid:
+            self.exit_status = status
+            _logger.info(f"Process {self.child_pid} exited with status {status}")
+
+    def add_output_listener(self, key, callback):
+        """
+        ลงทะเบียน callback ที่รับ output ทุก chunk (เรียกจาก I/O loop thread)
+
+        Args:
+            key: ชื่อ listener (ลงทะเบียนซ้ำด้วย key เดิม = แทนที่อันเดิม)
+            callback: function(text, start, end) - sequence offsets ของ bytes
+                [start, end) ที่ text แทน (chunk ถัดไปเริ่มที่ end)
+                ต้องทำงานเร็ว ห้าม block I/O loop
         """
-        while self.running:
+        self.output_listeners[key] = callback
+
+    def remove_output_listener(self, key):
+        """ยกเลิก output listener"""
+        self.output_listeners.pop(key, None)
+
+    def _notify_listeners(self, text, start, end):
+        """ส่ง output ให้ทุก listener"""
+        if not text:
+            return
+        for key, callback in list(self.output_listeners.items()):
             try:
-                r, _, _ = select.select([self.fd], [], [], 0.1)
-                if r:
-                    output = os.read(self.fd, 4096)
-                    if output:
-                        # Decode output
-                        text = output.decode('utf-8', errors='replace')
-
-                        # เก็บใน pending_output สำหรับ polling
-                        self.pending_output.append(text)
-
-                        # เก็บใน history buffer
-                        self.output_buffer.append(text)
-                        if len(self.output_buffer) > self.max_buffer_size:
-                            self.output_buffer = self.output_buffer[-self.max_buffer_size:]
-                    else:
-                        # EOF - terminal process ended
-                        self.running = False
-                        break
+                callback(text, start, end)
             except Exception as e:
-                _logger.error(f"Read error: {e}")
-                self.running = False
-                break
+                _logger.error(f"Output listener {key} error: {e}")
+
+    def _stop_reading(self):
+        """Mark the session stopped and wake up the waiting pollers"""
+        with self.output_condition:
+            self.running = False
+            self.output_condition.notify_all()
 
     def write(self, data):
         """Write to terminal"""
@@ -261,25 +450,79 @@ class TerminalSession:
             except:
                 pass
 
-    def get_pending_output(self):
+    def read_output(self, offset=None, limit=POLL_READ_LIMIT):
         """
-        ดึง output ที่ยังไม่ได้ส่ง (สำหรับ Long Polling)
+        อ่าน output ตั้งแต่ offset (สำหรับ Long Polling)
 
-        Method นี้จะ:
-        1. ดึง output ทั้งหมดที่มีใน pending_output
-        2. ล้าง pending_output (เพราะส่งไปแล้ว)
-        3. return เป็น string
+        Args:
+            offset: sequence offset ที่ client เห็นล่าสุด
+                (None = ใช้ shared cursor ของ session แล้วเลื่อนต่อ)
+            limit: จำนวน bytes สูงสุด
+
+        Returns:
+            dict: {
+                'output': '...',
+                'offset': offset ถัดไป (ส่งกลับมาใน poll ครั้งหน้า),
+                'dropped': จำนวน bytes ที่ถูกเขียนทับก่อนอ่านทัน (consumer ช้าเกิน),
+                'has_more': True ถ้ายังมี output หลัง offset (เกิน limit),
+            }
+        """
+        with self.output_condition:
+            shared = offset is None
+            data, next_offset, dropped = self.output_buffer.read(
+                self.poll_offset if shared else offset, limit,
+            )
+
+            # ไม่ตัด UTF-8 character กลางตัว - ส่วนที่เหลือส่งใน poll ครั้งหน้า
+            complete = utf8_complete_length(data)
+            next_offset -= len(data) - complete
+
+            if shared:
+                self.poll_offset = next_offset
+                self.dropped_bytes += dropped
+
+            return {
+                'output': data[:complete].decode('utf-8', errors='replace'),
+                'offset': next_offset,
+                'dropped': dropped,
+                'has_more': self.output_buffer.end > next_offset,
+            }
+
+    def get_pending_output(self):
+        """
+        ดึง output ที่ยังไม่ได้ส่ง (shared cursor ของ session)
 
         Returns:
             str: output ที่ยังไม่ได้ส่ง หรือ empty string ถ้าไม่มี
         """
-        if self.pending_output:
-            # รวม output ทั้งหมด
-            result = ''.join(self.pending_output)
-            # ล้าง pending (เพราะส่งไปแล้ว)
-            self.pending_output = []
-            return result
-        return ''
+        return self.read_output()['output']
+
+    def wait_for_output(self, timeout=30, offset=None):
+        """
+        รอ output ใหม่ (สำหรับ Long Polling)
+
+        Block บน output_condition จนกว่า I/O loop จะ notify ว่ามี output
+        ใหม่, session จบ, หรือครบ timeout - ไม่มีการ sleep-poll ระหว่างรอ
+
+        Args:
+            timeout: เวลารอสูงสุด (วินาที)
+            offset: sequence offset ที่ client เห็นล่าสุด (None = shared cursor)
+
+        Returns:
+            dict: ผลของ read_output() (output ว่างถ้า timeout / session จบ)
+        """
+        deadline = time.monotonic() + timeout
+
+        with self.output_condition:
+            while True:
+                result = self.read_output(offset)
+                if result['output'] or result['dropped'] or not self.running:
+                    return result
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return result
+                self.output_condition.wait(remaining)
 
     def get_history(self, lines=100):
         """
@@ -289,11 +532,11 @@ class TerminalSession:
             lines: จำนวนบรรทัดที่ต้องการ (default: 100)
 
         Returns:
-            str: output history
+            tuple: (output history, offset ถัดไปสำหรับ poll/stream ต่อ)
         """
-        if self.output_buffer:
-            return ''.join(self.output_buffer[-lines:])
-        return ''
+        with self.output_condition:
+            result = self.read_output(self.output_buffer.tail_lines(lines), limit=None)
+            return result['output'], result['offset']
 
     def is_alive(self):
         """
@@ -307,35 +550,25 @@ class TerminalSession:
 
         try:
             # ใช้ os.waitpid แบบ non-blocking (WNOHANG) เพื่อเช็คสถานะ
-            pid, status = os.waitpid(self.child_pid, os.WNOHANG)
-            if pid == 0:
-                # Process ยังทำงานอยู่
-                return True
-            else:
-                # Process ตายแล้ว
-                _logger.info(f"Process {self.child_pid} exited with status {status}")
-                return False
-        except ChildProcessError:
-            # Process ไม่มีอยู่แล้ว
-            return False
+            self._reap()
         except Exception as e:
             _logger.error(f"Error checking process: {e}")
             return False
 
+        return self.exit_status is None
+
     def cleanup(self):
         """Cleanup session"""
-        self.running = False
+        self._stop_reading()
 
-        if self.child_pid:
-            try:
-                os.kill(self.child_pid, signal.SIGTERM)
-                os.waitpid(self.child_pid, 0)
-            except:
-                pass
+        # ปิด PTY ก่อน → child ได้ SIGHUP (interactive shell ไม่สนใจ SIGTERM
+        # ถ้าไม่ปิดก่อน waitpid จะค้าง)
+        TerminalManager.close_pty(self)
 
-        if self.fd:
+        if self.child_pid and self.exit_status is None:
             try:
-                os.close(self.fd)
+                os.kill(self.child_pid, signal.SIGTERM)
+                _, self.exit_status = os.waitpid(self.child_pid, 0)
             except:
                 pass
 
@@ -1,5 +1,5 @@
 // itx_ai_helm/static/src/components/terminal/terminal.js
-// Long Polling Implementation (แทน WebSocket)
+// Streaming ผ่าน Odoo bus (websocket) - Long Polling เป็น fallback
 
 /** @odoo-module **/
 
@@ -23,6 +23,7 @@ export class ClaudeTerminal extends Component {
     setup() {
         // ไม่ต้องใช้ useService("rpc") แล้ว - ใช้ import rpc แทน
         this.notification = useService("notification");
+        this.busService = useService("bus_service");
         this.terminalRef = useRef("terminal");
 
         // ✅ Resume Session: เช็ค localStorage ว่ามี session เก่าหรือไม่
@@ -40,6 +41,16 @@ export class ClaudeTerminal extends Component {
         this.pollInterval = null;
         this.isPolling = false;
 
+        // Sequence offset ของ output byte ถัดไปที่ยังไม่เห็น (resume ต่อได้ตรงจุด)
+        this.outputOffset = 0;
+
+        // Bus streaming (ถ้า server เปิดให้)
+        this.channel = null;
+        this.streamInput = false;
+        this.streamOffset = 0;  // offset ท้ายสุดที่เห็นใน bus frames
+        this.catchingUp = false;  // กำลัง poll ส่วนที่ขาดจาก stream
+        this.onBusOutput = this.onBusOutput.bind(this);
+
         onMounted(() => {
             this.initTerminal();
         });
@@ -47,6 +58,7 @@ export class ClaudeTerminal extends Component {
         onWillUnmount(() => {
             // ไม่ cleanup session เพื่อให้ resume ได้
             this.stopPolling();
+            this.stopStreaming();
 
             // ลบ event listener
             if (this.resizeHandler) {
@@ -201,12 +213,14 @@ export class ClaudeTerminal extends Component {
         try {
             const result = await rpc("/terminal/connect", {
                 session_id: this.state.session_id,
-                command: this.terminalCommand
+                command: this.terminalCommand,
+                stream: true
             });
 
             if (result.success) {
                 this.state.session_id = result.session_id;
                 this.state.connected = true;
+                this.outputOffset = result.offset || 0;
 
                 // บันทึก session_id ลง localStorage
                 this.saveSessionId(result.session_id);
@@ -228,8 +242,12 @@ export class ClaudeTerminal extends Component {
 
                 this.terminal.focus();
 
-                // เริ่ม polling
-                this.startPolling();
+                // เริ่มรับ output: bus streaming หรือ polling (fallback)
+                if (result.channel) {
+                    this.startStreaming(result.channel, result.stream_input);
+                } else {
+                    this.startPolling();
+                }
             } else {
                 throw new Error(result.error || 'Failed to create session');
             }
@@ -281,12 +299,12 @@ export class ClaudeTerminal extends Component {
         try {
             const result = await rpc("/terminal/poll", {
                 session_id: this.state.session_id,
-                timeout: 30  // รอสูงสุด 30 วินาที
+                timeout: 30,  // รอสูงสุด 30 วินาที
+                offset: this.outputOffset
             });
 
-            if (result.success && result.output) {
-                // แสดง output ใน terminal
-                this.terminal.write(result.output);
+            if (result.success) {
+                this.writeOutput(result);
             }
 
             // Poll ต่อทันที (ไม่ต้องรอ)
@@ -301,6 +319,23 @@ export class ClaudeTerminal extends Component {
         }
     }
 
+    writeOutput(result) {
+        /**
+         * แสดง output ใน terminal และเลื่อน offset
+         * (dropped = output ที่หลุดจาก scrollback ของ server ไปก่อนอ่านทัน)
+         */
+        if (!this.terminal) {
+            return;
+        }
+        if (result.dropped) {
+            this.terminal.write(`\r\n\x1b[2m[... ${result.dropped} bytes skipped ...]\x1b[0m\r\n`);
+        }
+        if (result.output) {
+            this.terminal.write(result.output);
+        }
+        this.outputOffset = result.offset;
+    }
+
     stopPolling() {
         /**
          * หยุด polling (เช่น เมื่อ disconnect)
@@ -308,6 +343,98 @@ export class ClaudeTerminal extends Component {
         this.isPolling = false;
     }
 
+    startStreaming(channel, streamInput) {
+        /**
+         * รับ output ผ่าน Odoo bus (websocket) แทน polling
+         *
+         * Server push output ไปยัง channel ของ session → ทุก viewer ที่
+         * subscribe channel เดียวกันได้ output พร้อมกัน
+         * streamInput = true → ส่ง input/resize ผ่าน websocket เดียวกันด้วย
+         */
+        this.channel = channel;
+        this.streamInput = streamInput;
+        this.streamOffset = this.outputOffset;
+        this.busService.subscribe("itx_ai_helm.terminal/output", this.onBusOutput);
+        this.busService.addChannel(channel);
+
+        // ดึง output ที่เกิดระหว่าง connect กับ subscribe
+        this.catchUp();
+    }
+
+    catchUp() {
+        /**
+         * ดึง output ตั้งแต่ outputOffset ผ่าน /terminal/poll (ไม่รอ)
+         * ใช้ตอนเริ่ม stream และเมื่อ bus frames ขาดช่วง (frame หาย / มาไม่ทัน)
+         */
+        if (this.catchingUp) {
+            return;
+        }
+        this.catchingUp = true;
+
+        rpc("/terminal/poll", {
+            session_id: this.state.session_id,
+            timeout: 0,
+            offset: this.outputOffset
+        }).then((result) => {
+            this.catchingUp = false;
+            if (!result.success) {
+                return;
+            }
+            if (result.offset > this.outputOffset) {
+                this.writeOutput(result);
+            }
+            // frames ที่มาระหว่าง poll ถูกข้ามไป → ตามต่อจนทัน
+            if (this.channel && (result.has_more || this.streamOffset > this.outputOffset)) {
+                this.catchUp();
+            }
+        }).catch((error) => {
+            this.catchingUp = false;
+            console.error('Catch-up poll error:', error);
+        });
+    }
+
+    stopStreaming() {
+        /**
+         * หยุดรับ output ผ่าน bus
+         */
+        if (!this.channel) {
+            return;
+        }
+        this.busService.unsubscribe("itx_ai_helm.terminal/output", this.onBusOutput);
+        this.busService.deleteChannel(this.channel);
+        this.channel = null;
+        this.streamInput = false;
+    }
+
+    onBusOutput(payload) {
+        /**
+         * Output frame จาก bus (กรองเฉพาะ session ของ component นี้)
+         * frame = output bytes [start, offset):
+         * - offset ไม่เกินที่แสดงไปแล้ว = ซ้ำ (ได้จาก poll แล้ว)
+         * - start < outputOffset = ซ้อนกับที่แสดงแล้ว → ตัดส่วนที่ซ้ำออก
+         * - start > outputOffset = ขาดช่วง → poll ส่วนที่ขาดจาก outputOffset
+         */
+        if (payload.session_id !== this.state.session_id) {
+            return;
+        }
+        this.streamOffset = Math.max(this.streamOffset, payload.offset);
+        if (payload.offset <= this.outputOffset || this.catchingUp) {
+            return;
+        }
+        if (payload.start > this.outputOffset) {
+            this.catchUp();
+            return;
+        }
+        if (payload.start < this.outputOffset) {
+            const bytes = new TextEncoder().encode(payload.output);
+            payload = {
+                ...payload,
+                output: new TextDecoder().decode(bytes.subarray(this.outputOffset - payload.start)),
+            };
+        }
+        this.writeOutput(payload);
+    }
+
     setupEventHandlers() {
         /**
          * ตั้งค่า event handlers สำหรับ terminal
@@ -320,6 +447,15 @@ export class ClaudeTerminal extends Component {
             }
 
             try {
+                // ส่ง input ผ่าน websocket (ถ้าได้) ไม่งั้นใช้ HTTP
+                if (this.streamInput) {
+                    this.busService.send("itx_ai_helm.terminal/input", {
+                        session_id: this.state.session_id,
+                        data: data
+                    });
+                    return;
+                }
+
                 // ส่ง input ไปยัง backend
                 await rpc("/terminal/write", {
                     session_id: this.state.session_id,
@@ -337,6 +473,15 @@ export class ClaudeTerminal extends Component {
             }
 
             try {
+                if (this.streamInput) {
+                    this.busService.send("itx_ai_helm.terminal/resize", {
+                        session_id: this.state.session_id,
+                        rows: rows,
+                        cols: cols
+                    });
+                    return;
+                }
+
                 await rpc("/terminal/resize", {
                     session_id: this.state.session_id,
                     rows: rows,
@@ -371,8 +516,9 @@ export class ClaudeTerminal extends Component {
          * ทำลาย session ทั้งหมด (frontend + backend)
          * เรียกเมื่อ user ต้องการ "New Terminal" จริงๆ
          */
-        // หยุด polling
+        // หยุด polling / streaming
         this.stopPolling();
+        this.stopStreaming();
 
         // แจ้ง backend ว่าจะ disconnect
         if (this.state.session_id) {
@@ -0,0 +1,90 @@
+# itx_ai_helm/tests/test_terminal_buffer.py
+"""
+Unit tests ของ OutputRingBuffer (scrollback ของ terminal session)
+
+รัน: python itx_ai_helm/tests/test_terminal_buffer.py
+(ไม่ต้องใช้ Odoo - import เฉพาะ services/terminal_buffer.py)
+"""
+
+import sys
+import os
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.terminal_buffer import OutputRingBuffer, utf8_complete_length
+
+
+class TestOutputRingBuffer(unittest.TestCase):
+
+    def test_read_from_offset(self):
+        buffer = OutputRingBuffer(16)
+        self.assertEqual(buffer.write(b'hello '), 6)
+        self.assertEqual(buffer.write(b'world'), 11)
+
+        self.assertEqual(buffer.read(0), (b'hello world', 11, 0))
+        self.assertEqual(buffer.read(6), (b'world', 11, 0))
+        self.assertEqual(buffer.read(6, limit=3), (b'wor', 9, 0))
+        self.assertEqual(buffer.read(11), (b'', 11, 0))
+
+    def test_wraparound(self):
+        buffer = OutputRingBuffer(8)
+        buffer.write(b'abcdef')
+        buffer.write(b'ghij')
+
+        # ข้อมูลข้ามขอบ buffer: อ่านต่อกันได้ถูกลำดับ
+        self.assertEqual(buffer.start, 2)
+        self.assertEqual(len(buffer), 8)
+        self.assertEqual(buffer.read(2), (b'cdefghij', 10, 0))
+        self.assertEqual(buffer.read(7), (b'hij', 10, 0))
+
+    def test_dropped_when_overwritten(self):
+        buffer = OutputRingBuffer(8)
+        buffer.write(b'0123456789abc')
+
+        # Write ใหญ่กว่า capacity: เก็บเฉพาะส่วนท้าย
+        self.assertEqual(buffer.end, 13)
+        self.assertEqual(buffer.start, 5)
+        data, offset, dropped = buffer.read(0)
+        self.assertEqual((data, offset, dropped), (b'56789abc', 13, 5))
+
+        # Consumer ที่อ่านช้า: ข้ามไป byte เก่าสุดที่ยังอยู่
+        buffer.write(b'XY')
+        self.assertEqual(buffer.read(offset), (b'XY', 15, 0))
+        self.assertEqual(buffer.read(6), (b'789abcXY', 15, 1))
+
+    def test_offset_out_of_range(self):
+        buffer = OutputRingBuffer(8)
+        buffer.write(b'abc')
+
+        self.assertEqual(buffer.read(-5), (b'abc', 3, 0))
+        self.assertEqual(buffer.read(100), (b'', 3, 0))
+
+    def test_tail_lines(self):
+        buffer = OutputRingBuffer(64)
+        buffer.write(b'one\ntwo\nthree\nfour')
+
+        self.assertEqual(buffer.read(buffer.tail_lines(1))[0], b'four')
+        self.assertEqual(buffer.read(buffer.tail_lines(2))[0], b'three\nfour')
+        # มีบรรทัดน้อยกว่าที่ขอ: ทั้ง buffer
+        self.assertEqual(buffer.tail_lines(10), buffer.start)
+
+    def test_tail_lines_after_wraparound(self):
+        buffer = OutputRingBuffer(12)
+        buffer.write(b'line1\nline2\nline3\nline4')
+
+        # line1 / บางส่วนของ line2 ถูกเขียนทับแล้ว
+        self.assertEqual(buffer.read(buffer.tail_lines(2))[0], b'line3\nline4')
+        self.assertEqual(buffer.tail_lines(5), buffer.start)
+
+    def test_utf8_complete_length(self):
+        thai = 'ก'.encode('utf-8')  # 3 bytes
+
+        self.assertEqual(utf8_complete_length(b'abc'), 3)
+        self.assertEqual(utf8_complete_length(b'ab' + thai), 5)
+        self.assertEqual(utf8_complete_length(b'ab' + thai[:2]), 2)
+        self.assertEqual(utf8_complete_length(b'ab' + thai[:1]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
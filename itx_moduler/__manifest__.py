@@ -46,6 +46,9 @@ without deep technical programming knowledge.
         # Sprint 1 & 2: Snapshot Models Views
         'views/itx_moduler_model_views.xml',
         'views/itx_moduler_ui_views.xml',
+        'views/itx_moduler_job_views.xml',
+        'data/itx_moduler_job_data.xml',
+        'data/itx_moduler_export_cache_data.xml',
     ],
     # only loaded in demonstration mode
     'demo': [
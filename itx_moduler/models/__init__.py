@@ -25,3 +25,7 @@ from . import itx_moduler_constraint
 from . import itx_moduler_server_constraint
 from . import itx_moduler_server_action
 from . import itx_moduler_report
+
+# Code generation
+from . import itx_moduler_export_cache
+from . import itx_moduler_job
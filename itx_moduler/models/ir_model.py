@@ -10,7 +10,7 @@ from odoo.exceptions import ValidationError, UserError, MissingError
 from odoo.tools.safe_eval import safe_eval
 from psycopg2._psycopg import ProgrammingError
 
-from ..controllers.main import MAGIC_FIELDS
+from ..tools.code_generator import MAGIC_FIELDS
 
 _logger = logging.getLogger(__name__)
 
@@ -43,7 +43,7 @@ def common_4constrains(el_self, code, message=SYNTAXERRORMSG):
     """
 
     try:
-        safe_eval(code, SAFE_EVAL_4FUNCTION, {'self': el_self}, mode='exec')
+        safe_eval(code, SAFE_EVAL_4FUNCTION, {'self': el_self, 'records': el_self}, mode='exec')
 
     except ValueError:
         raise ValidationError(PREDEFINEDVARS)
@@ -52,6 +52,29 @@ def common_4constrains(el_self, code, message=SYNTAXERRORMSG):
         raise ValidationError(message)
 
 
+def check_server_constrain(code, filename=None):
+    """
+    Check once that a server constrain code compiles (the opcode checks are done by safe_eval)
+    :param code:
+    :param filename:
+    :return:
+    """
+
+    compile(code, filename or '<server constrain>', 'exec')
+
+
+def exec_server_constrain(code, locals_dict, filename=None):
+    """
+    Execute a server constrain code through safe_eval
+    :param code:
+    :param locals_dict:
+    :param filename:
+    :return:
+    """
+
+    safe_eval(code, SAFE_EVAL_BASE, locals_dict, mode='exec', filename=filename)
+
+
 def add_constraint(cr, tablename, constraintname, definition):
     """ Add a constraint on the given table. """
     query1 = 'ALTER TABLE "{}" ADD CONSTRAINT "{}" {}'.format(tablename, constraintname, definition)
@@ -147,6 +170,13 @@ class IrModelServerConstrain(models.Model):
             constrain_detail = SERVERCONSTRAIN % self.constrained
             common_4constrains(self.env[self.m2o_ir_model.model], self.txt_code, SYNTAXERRORMSG % constrain_detail)
 
+    eval_mode = fields.Selection([
+        ('record', 'Per Record'),
+        ('recordset', 'Recordset'),
+    ], string='Evaluation', default='record', required=True,
+        help='Per Record: the code runs once for every record, as self. '
+             'Recordset: the code runs once for all the created/written records, as records (and self).')
+
     m2o_ir_model = fields.Many2one(
         comodel_name='ir.model',
         string='Model',
@@ -156,6 +186,50 @@ class IrModelServerConstrain(models.Model):
         ondelete='cascade'
     )
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        result = super(IrModelServerConstrain, self).create(vals_list)
+        self.env.registry.clear_cache()
+        return result
+
+    def write(self, vals):
+        result = super(IrModelServerConstrain, self).write(vals)
+        self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        result = super(IrModelServerConstrain, self).unlink()
+        self.env.registry.clear_cache()
+        return result
+
+    @api.model
+    @tools.ormcache()
+    def _get_compiled_constrains(self):
+        """
+        Registry level cache of the server constrains:
+        {model name: ((constrained fields, recordset mode, code, filename), ...)}.
+        It is loaded with one query and cleared whenever a server constrain changes, so the models
+        without server constrains only pay a dictionary lookup on create/write.
+        :return:
+        """
+
+        compiled = {}
+        for constrain in self.sudo().search([]):
+            model_name = constrain.m2o_ir_model.model
+            constrained = frozenset(f.strip() for f in constrain.constrained.split(','))
+            filename = '%s/%s' % (self._name, constrain.id)
+            try:
+                check_server_constrain(constrain.txt_code, filename=filename)
+            except (ValueError, SyntaxError):
+                _logger.warning('Server constrain %s on %s does not compile, it is ignored', constrain.id, model_name)
+                continue
+
+            compiled.setdefault(model_name, []).append(
+                (constrained, constrain.eval_mode == 'recordset', constrain.txt_code, filename)
+            )
+
+        return {model_name: tuple(constrains) for model_name, constrains in compiled.items()}
+
 
 class IrActionsReport(models.Model):
     _inherit = 'ir.actions.report'
@@ -334,20 +408,38 @@ class IrModel(models.Model):
 class CodeGeneratorBase(models.AbstractModel):
     _inherit = 'base'
 
-    def _run_safe_eval(self, created=None):
+    def _run_safe_eval(self, created=None, fnames=None):
         """
 
         :param created:
+        :param fnames: written field names, the server constrains not checking any of them are skipped
         :return:
         """
 
         records = created or self
-        for r in records:
-            target_model = self.env['ir.model'].search([('model', '=', r._name)])
-            if target_model and hasattr(self.env, target_model[0]._name) and hasattr(target_model[0], 'o2m_serverconstrains'):
-                codes = target_model.mapped('o2m_serverconstrains').mapped('txt_code')
-                for code in codes:
-                    safe_eval(code, SAFE_EVAL_BASE, {'self': r}, mode="exec")
+        if not records:
+            return
+
+        # The constrains were never evaluated by this hook before: it is opt-in
+        # (get_param is cached, so this costs no query)
+        run_server_constrains = self.env['ir.config_parameter'].sudo().get_param(
+            'itx_moduler.run_server_constrains', default=False
+        )
+        if not run_server_constrains or run_server_constrains == 'False':
+            return
+
+        constrains = self.env['ir.model.server_constrain']._get_compiled_constrains().get(records._name)
+        if not constrains:
+            return
+
+        for constrained, recordset_mode, code, filename in constrains:
+            if fnames is not None and constrained.isdisjoint(fnames):
+                continue
+            if recordset_mode:
+                exec_server_constrain(code, {'self': records, 'records': records}, filename=filename)
+                continue
+            for r in records:
+                exec_server_constrain(code, {'self': r}, filename=filename)
 
     @api.model_create_multi
     def create(self, vals_list):
@@ -361,7 +453,7 @@ class CodeGeneratorBase(models.AbstractModel):
     def write(self, vals):
         result = super(CodeGeneratorBase, self).write(vals)
 
-        self._run_safe_eval()
+        self._run_safe_eval(fnames=vals)
 
         return result
 
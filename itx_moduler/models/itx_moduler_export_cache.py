@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import logging
+
+import psycopg2
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_EXPORT_CACHE_SIZE = 64  # MB
+
+
+class ItxModulerExportCache(models.Model):
+    """
+    Content-addressed cache of generated module files.
+
+    Each entry maps the fingerprint of the snapshot records a file is generated from
+    (see CodeGeneratorExportContext) to the rendered bytes, so a re-export only renders
+    the files whose sources changed. Entries are evicted LRU (by the "ITX Moduler: Evict
+    Export Cache" cron) when the cache outgrows the itx_moduler.export_cache_size setting.
+    """
+    _name = 'itx.moduler.export.cache'
+    _description = 'ITX Moduler Export Cache'
+    _order = 'last_used desc'
+
+    key = fields.Char(
+        string='Key',
+        required=True,
+        index=True,
+        help='SHA-256 fingerprint of the snapshot records the file is generated from'
+    )
+
+    file_path = fields.Char(
+        string='File Path',
+        help='Path of the file inside the exported archive (empty = nothing to generate)'
+    )
+
+    content = fields.Binary(
+        string='Content',
+        attachment=False
+    )
+
+    size = fields.Integer(
+        string='Size (bytes)'
+    )
+
+    last_used = fields.Datetime(
+        string='Last Used',
+        default=fields.Datetime.now,
+        index=True
+    )
+
+    _key_unique = models.Constraint(
+        'UNIQUE(key)',
+        'Export cache key must be unique!',
+    )
+
+    @api.model
+    def _get_max_size(self):
+        """Cache size limit in bytes (0 = cache disabled)"""
+        size = self.env['ir.config_parameter'].sudo().get_param(
+            'itx_moduler.export_cache_size', default=DEFAULT_EXPORT_CACHE_SIZE
+        )
+        return max(int(size or 0), 0) * 1024 * 1024
+
+    @api.model
+    def _get_entries(self, keys):
+        """Return {key: (file_path, content)} for the cached keys, and mark them as used"""
+        if not keys:
+            return {}
+
+        entries = self.search([('key', 'in', list(keys))])
+        if entries:
+            self._touch_entries(entries.ids)
+
+        return {
+            entry.key: (entry.file_path or None, base64.b64decode(entry.content or b''))
+            for entry in entries.with_context(bin_size=False)
+        }
+
+    @api.model
+    def _touch_entries(self, ids):
+        """
+        Bump last_used of the given entries, best-effort, on a separate cursor.
+
+        Entries already used today are left alone and rows locked by a concurrent export are
+        skipped, so reading the cache never holds nor waits for row locks in the export transaction.
+        """
+        try:
+            with self.env.registry.cursor() as cr:
+                cr.execute(f"""
+                    UPDATE {self._table} SET last_used = (now() AT TIME ZONE 'UTC')
+                     WHERE id IN (
+                        SELECT id FROM {self._table}
+                         WHERE id IN %s AND last_used < (now() AT TIME ZONE 'UTC') - INTERVAL '1 day'
+                           FOR UPDATE SKIP LOCKED
+                     )
+                """, [tuple(ids)])
+        except psycopg2.Error as e:
+            _logger.debug('ITX Moduler export cache: last_used update skipped (%s)', e)
+
+    @api.model
+    def _store_entries(self, entries):
+        """Store {key: (file_path, content)} rendered during an export, and wake up the eviction cron"""
+        if not entries:
+            return
+
+        now = fields.Datetime.now()
+        uid = self.env.uid
+        rows = [(
+            key,
+            file_path or None,
+            psycopg2.Binary(base64.b64encode(content)) if content else None,
+            len(content or b''),
+            now, uid, now, uid, now,
+        ) for key, (file_path, content) in entries.items()]
+
+        # Another export may store some of these keys meanwhile: keep theirs
+        self.env.cr.execute(f"""
+            INSERT INTO {self._table}
+                   (key, file_path, content, size, last_used, create_uid, create_date, write_uid, write_date)
+            VALUES {', '.join(['(%s, %s, %s, %s, %s, %s, %s, %s, %s)'] * len(rows))}
+            ON CONFLICT (key) DO NOTHING
+        """, [value for row in rows for value in row])
+
+        if self.env.cr.rowcount:
+            cron = self.env.ref('itx_moduler.ir_cron_itx_moduler_export_cache_evict', raise_if_not_found=False)
+            if cron:
+                cron._trigger()
+
+    @api.model
+    def _cron_evict(self):
+        """Evict the cache in the cron transaction (never in the export ones)"""
+        self._evict()
+
+    @api.model
+    def _evict(self):
+        """Drop the least recently used entries beyond the cache size limit"""
+        max_size = self._get_max_size()
+
+        total = 0
+        to_unlink = []
+        for entry in self.search_read([], ['size'], order='last_used desc, id desc'):
+            total += entry['size']
+            if total > max_size:
+                to_unlink.append(entry['id'])
+
+        if to_unlink:
+            self.browse(to_unlink).unlink()
+            _logger.info('ITX Moduler export cache: evicted %s entries', len(to_unlink))
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import tempfile
+from datetime import timedelta
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+from ..tools.code_generator import CodeGeneratorExportContext, _get_module_files, _get_export_cache_comment
+
+_logger = logging.getLogger(__name__)
+
+# A running job whose progress has not been committed for this long was interrupted
+# (worker killed by limit_time_real, out of memory, server restart)
+STALE_JOB_TIMEOUT = timedelta(hours=2)
+
+# Default size limit of an export file (bytes, 0 = no limit)
+EXPORT_MAX_SIZE = 256 * 1024 * 1024
+
+
+class ItxModulerJob(models.Model):
+    """
+    Background job for the long ITX Moduler operations (snapshot import, module export).
+
+    Jobs are enqueued by the UI and run by the "ITX Moduler: Run Background Jobs" cron,
+    which commits after every module / import phase so the progress (items done, phase,
+    ETA) is visible while the job runs. An export job stores its ZIP as an attachment.
+    """
+    _name = 'itx.moduler.job'
+    _description = 'ITX Moduler Background Job'
+    _order = 'id desc'
+
+    name = fields.Char(
+        string='Job',
+        required=True
+    )
+
+    job_type = fields.Selection([
+        ('import', 'Snapshot Import'),
+        ('export', 'Module Export'),
+    ], string='Type', required=True)
+
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', default='pending', required=True, index=True)
+
+    module_ids = fields.Many2many(
+        'itx.moduler.module',
+        'itx_moduler_job_module_rel',
+        'job_id',
+        'module_id',
+        string='Workspaces'
+    )
+
+    source_module_ids = fields.Many2many(
+        'ir.module.module',
+        'itx_moduler_job_source_module_rel',
+        'job_id',
+        'module_id',
+        string='Odoo Modules to Load',
+        help='Installed modules to load into new workspaces (import jobs)'
+    )
+
+    phase = fields.Char(
+        string='Current Phase'
+    )
+
+    items_done = fields.Integer(
+        string='Done'
+    )
+
+    items_total = fields.Integer(
+        string='Total'
+    )
+
+    progress = fields.Float(
+        string='Progress',
+        compute='_compute_progress'
+    )
+
+    date_start = fields.Datetime(
+        string='Started',
+        readonly=True
+    )
+
+    date_end = fields.Datetime(
+        string='Finished',
+        readonly=True
+    )
+
+    date_eta = fields.Datetime(
+        string='ETA',
+        readonly=True
+    )
+
+    attachment_id = fields.Many2one(
+        'ir.attachment',
+        string='Export File',
+        readonly=True,
+        ondelete='set null'
+    )
+
+    error_message = fields.Text(
+        string='Error',
+        readonly=True
+    )
+
+    @api.depends('items_done', 'items_total')
+    def _compute_progress(self):
+        for job in self:
+            job.progress = 100.0 * job.items_done / job.items_total if job.items_total else 0.0
+
+    # === Enqueue ===
+    @api.model
+    def _enqueue(self, job_type, modules=None, source_modules=None):
+        """Create a pending job and wake up the job cron"""
+        modules = modules or self.env['itx.moduler.module']
+        source_modules = source_modules or self.env['ir.module.module']
+
+        names = (modules.mapped('name') + source_modules.mapped('name'))
+        label = dict(self._fields['job_type'].selection)[job_type]
+
+        job = self.create({
+            'name': '%s: %s' % (label, ', '.join(names[:5]) + (', ...' if len(names) > 5 else '')),
+            'job_type': job_type,
+            'module_ids': [(6, 0, modules.ids)],
+            'source_module_ids': [(6, 0, source_modules.ids)],
+            'items_total': len(modules) + len(source_modules),
+        })
+
+        cron = self.env.ref('itx_moduler.ir_cron_itx_moduler_jobs', raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+
+        return job
+
+    # === Cron ===
+    @api.model
+    def _cron_run_jobs(self, limit=5):
+        """Fail the interrupted jobs, then run the oldest pending jobs"""
+        self._fail_stale_jobs()
+        for job in self.search([('state', '=', 'pending')], order='id', limit=limit):
+            job._run()
+
+    @api.model
+    def _fail_stale_jobs(self):
+        """Mark the running jobs without progress for STALE_JOB_TIMEOUT as failed (so they can be retried)"""
+        stale_jobs = self.search([
+            ('state', '=', 'running'),
+            ('write_date', '<', fields.Datetime.now() - STALE_JOB_TIMEOUT),
+        ])
+        if stale_jobs:
+            _logger.warning(f"⚠️ ITX Moduler jobs interrupted: {', '.join(stale_jobs.mapped('name'))}")
+            stale_jobs.write({
+                'state': 'failed',
+                'date_end': fields.Datetime.now(),
+                'date_eta': False,
+                'error_message': _('The job was interrupted (worker killed or server restarted).'),
+            })
+            self.env.cr.commit()
+
+    def _run(self):
+        """Run the job as the user who enqueued it, committing the progress as it goes"""
+        self.ensure_one()
+
+        self.write({
+            'state': 'running',
+            'date_start': fields.Datetime.now(),
+            'items_done': 0,
+            'phase': _('Starting'),
+            'error_message': False,
+        })
+        self.env.cr.commit()
+
+        try:
+            user_job = self.with_user(self.create_uid)
+            if self.job_type == 'import':
+                user_job._run_import()
+            else:
+                user_job._run_export()
+
+            self.write({
+                'state': 'done',
+                'date_end': fields.Datetime.now(),
+                'date_eta': False,
+                'items_done': self.items_total,
+                'phase': _('Done'),
+            })
+            self.env.cr.commit()
+
+        except Exception as e:
+            self.env.cr.rollback()
+            _logger.exception(f"❌ ITX Moduler job {self.name} failed")
+            self.write({
+                'state': 'failed',
+                'date_end': fields.Datetime.now(),
+                'date_eta': False,
+                'error_message': str(e),
+            })
+            self.env.cr.commit()
+
+    def _set_progress(self, items_done, phase):
+        """Store the progress and the ETA, and commit them (chunked commit)"""
+        now = fields.Datetime.now()
+        date_eta = False
+        if items_done and self.date_start and self.items_total:
+            elapsed = now - self.date_start
+            date_eta = self.date_start + elapsed * self.items_total / items_done
+
+        self.sudo().write({
+            'items_done': items_done,
+            'phase': phase,
+            'date_eta': date_eta,
+        })
+        self.env.cr.commit()
+
+    def _run_import(self):
+        """Load the source Odoo modules into new workspaces, then import the snapshots of every workspace"""
+        workspaces = self.module_ids
+        if self.source_module_ids:
+            for source_module in self.source_module_ids:
+                workspaces |= self.env['itx.moduler.module'].create_from_odoo_module(
+                    source_module.id, import_snapshots=False
+                )
+            # Record the new workspaces on the job: a retry imports them instead of creating them again
+            self.sudo().write({
+                'module_ids': [(6, 0, workspaces.ids)],
+                'source_module_ids': [(5, 0, 0)],
+                'items_total': len(workspaces),
+            })
+        self.env.cr.commit()
+
+        for index, workspace in enumerate(workspaces):
+            workspace._import_snapshots(
+                progress=lambda label, index=index, workspace=workspace: self._set_progress(
+                    index, '%s: %s' % (workspace.name, label)
+                )
+            )
+            self._set_progress(index + 1, workspace.name)
+
+    def _run_export(self):
+        """Generate the workspaces into a ZIP attachment of the job"""
+        modules = self.module_ids
+        if not modules:
+            raise UserError(_('Nothing to export.'))
+
+        s_data2export = self.env['ir.config_parameter'].sudo().get_param(
+            'itx_creator.s_data2export', default='nomenclator'
+        )
+        export_context = CodeGeneratorExportContext(modules)
+
+        with tempfile.TemporaryFile() as zip_file:
+            with ZipFile(zip_file, mode='w', compression=ZIP_DEFLATED) as zipy:
+                for index, module in enumerate(modules):
+                    self._set_progress(index, module.name)
+                    for file_path, content in _get_module_files(export_context, module, s_data2export):
+                        zipy.writestr(file_path, content)
+
+                export_context.flush_cache()
+                zipy.comment = _get_export_cache_comment(export_context.cache_hits, export_context.cache_misses)
+
+            basename = 'modules' if len(modules) > 1 else modules.name.lower().strip()
+            attachment = self._attach_export_file(zip_file, '%s.zip' % basename)
+
+        self.sudo().attachment_id = attachment
+        _logger.info(f"✅ ITX Moduler export job {self.name}: {export_context.query_count} queries")
+
+    def _attach_export_file(self, zip_file, name):
+        """
+        Store the spooled ZIP as the export attachment of the job.
+
+        ir.attachment takes the content as bytes, so the ZIP is loaded in memory once:
+        exports larger than the ``itx_moduler.export_max_size`` parameter (bytes) are refused.
+        """
+        file_size = zip_file.seek(0, os.SEEK_END)
+        max_size = int(self.env['ir.config_parameter'].sudo().get_param(
+            'itx_moduler.export_max_size', default=EXPORT_MAX_SIZE
+        ))
+        if max_size and file_size > max_size:
+            raise UserError(_(
+                'The export file is too large (%s MB, the limit is %s MB). '
+                'Export fewer workspaces at a time.'
+            ) % (file_size // (1024 * 1024), max_size // (1024 * 1024)))
+
+        zip_file.seek(0)
+        return self.env['ir.attachment'].create({
+            'name': name,
+            'mimetype': 'application/zip',
+            'res_model': self._name,
+            'res_id': self.id,
+            'raw': zip_file.read(),
+        })
+
+    # === Actions ===
+    def action_open(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': self.name,
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
+
+    def action_download(self):
+        self.ensure_one()
+        if not self.attachment_id:
+            raise UserError(_('This job has no export file.'))
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % self.attachment_id.id,
+            'target': 'self',
+        }
+
+    def action_retry(self):
+        self.filtered(lambda job: job.state == 'failed').write({'state': 'pending', 'error_message': False})
+        cron = self.env.ref('itx_moduler.ir_cron_itx_moduler_jobs', raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+        return True
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 
 import base64
+import inspect
+import json
 import logging
+import time
+from collections import defaultdict
 
 import lxml
 from docutils.core import publish_string
@@ -335,126 +339,108 @@ class ItxModulerModule(models.Model):
         ('ready', 'Ready'),
         ('applied', 'Applied'),
         ('exported', 'Exported'),
-    ], string='Workspace Status', compute='_compute_workspace_status', store=False)
+    ], string='Workspace Status', compute='_compute_workspace_stats', store=False)
 
     workspace_status_color = fields.Integer(
         string='Status Color',
-        compute='_compute_workspace_status',
+        compute='_compute_workspace_stats',
         store=False,
         help='Color for kanban card (0-11)'
     )
 
     last_activity = fields.Datetime(
         string='Last Activity',
-        compute='_compute_last_activity',
+        compute='_compute_workspace_stats',
         store=False,
         help='Last modification in this workspace'
     )
 
+    # {count field: (snapshot model, extra domain)} of the dashboard statistics
+    _WORKSPACE_STATS_MODELS = {
+        'snapshot_model_count': ('itx.moduler.model', []),
+        'snapshot_view_count': ('itx.moduler.view', []),
+        'snapshot_menu_count': ('itx.moduler.menu', []),
+        'snapshot_action_count': ('itx.moduler.action.window', []),
+        'snapshot_group_count': ('itx.moduler.group', []),
+        'snapshot_acl_count': ('itx.moduler.acl', []),
+        'snapshot_rule_count': ('itx.moduler.rule', []),
+        'snapshot_server_action_count': ('itx.moduler.server.action', []),
+        'snapshot_report_count': ('itx.moduler.report', []),
+        'snapshot_constraint_count': ('itx.moduler.constraint', [('type', 'in', ('u', 'c'))]),  # SQL UNIQUE/CHECK
+        'snapshot_server_constraint_count': ('itx.moduler.server.constraint', []),
+    }
+
+    # Snapshot models whose last write is the workspace last activity
+    _WORKSPACE_ACTIVITY_MODELS = ['itx.moduler.model', 'itx.moduler.view', 'itx.moduler.menu', 'itx.moduler.action.window']
+
+    def _get_workspace_aggregates(self, snapshot_model, domain=None, groupby=(), aggregates=('__count',)):
+        """Return {(module id, *groupby values): aggregates} of the snapshots of these modules (one grouped query)"""
+        aggregated = {}
+        for module, *row in self.env[snapshot_model]._read_group(
+                [('module_id', 'in', self._origin.ids)] + (domain or []),
+                ['module_id'] + list(groupby),
+                list(aggregates)):
+            aggregated[(module.id, *row[:len(groupby)])] = row[len(groupby):]
+        return aggregated
+
     @api.depends('name')
     def _compute_workspace_stats(self):
-        """Compute workspace statistics for dashboard display"""
-        for module in self:
-            # Count snapshot records (workspace items)
-            module.snapshot_model_count = self.env['itx.moduler.model'].search_count([
-                ('module_id', '=', module.id)
-            ])
-            module.snapshot_view_count = self.env['itx.moduler.view'].search_count([
-                ('module_id', '=', module.id)
-            ])
-            module.snapshot_menu_count = self.env['itx.moduler.menu'].search_count([
-                ('module_id', '=', module.id)
-            ])
-            module.snapshot_action_count = self.env['itx.moduler.action.window'].search_count([
-                ('module_id', '=', module.id)
-            ])
-            module.snapshot_group_count = self.env['itx.moduler.group'].search_count([
-                ('module_id', '=', module.id)
-            ])
-            module.snapshot_acl_count = self.env['itx.moduler.acl'].search_count([
-                ('module_id', '=', module.id)
-            ])
-            module.snapshot_rule_count = self.env['itx.moduler.rule'].search_count([
-                ('module_id', '=', module.id)
-            ])
-            module.snapshot_server_action_count = self.env['itx.moduler.server.action'].search_count([
-                ('module_id', '=', module.id)
-            ])
-            module.snapshot_report_count = self.env['itx.moduler.report'].search_count([
-                ('module_id', '=', module.id)
-            ])
-            module.snapshot_constraint_count = self.env['itx.moduler.constraint'].search_count([
-                ('module_id', '=', module.id),
-                ('type', '=', 'u')  # SQL constraints (UNIQUE)
-            ]) + self.env['itx.moduler.constraint'].search_count([
-                ('module_id', '=', module.id),
-                ('type', '=', 'c')  # SQL constraints (CHECK)
-            ])
-            module.snapshot_server_constraint_count = self.env['itx.moduler.server.constraint'].search_count([
-                ('module_id', '=', module.id)
-            ])
+        """Compute workspace statistics, status and last activity for dashboard display
+
+        Everything is aggregated for the whole recordset with one grouped query per snapshot table,
+        so a kanban of workspaces costs a constant number of queries.
+        """
+        counts = {}
+        last_dates = defaultdict(list)
+        for count_field, (snapshot_model, domain) in self._WORKSPACE_STATS_MODELS.items():
+            if snapshot_model == 'itx.moduler.model':
+                continue
+            aggregates = ['__count']
+            if snapshot_model in self._WORKSPACE_ACTIVITY_MODELS:
+                aggregates.append('write_date:max')
+            for (module_id,), values in self._get_workspace_aggregates(snapshot_model, domain,
+                                                                       aggregates=aggregates).items():
+                counts[count_field, module_id] = values[0]
+                if len(values) > 1 and values[1]:
+                    last_dates[module_id].append(values[1])
+
+        # Snapshot models are also grouped by state, for the workspace status
+        model_states = defaultdict(set)
+        for (module_id, state), (count, last_date) in self._get_workspace_aggregates(
+                'itx.moduler.model', groupby=['state'], aggregates=['__count', 'write_date:max']).items():
+            counts['snapshot_model_count', module_id] = counts.get(('snapshot_model_count', module_id), 0) + count
+            model_states[module_id].add(state)
+            if last_date:
+                last_dates[module_id].append(last_date)
 
-    @api.depends('name')
-    def _compute_workspace_status(self):
-        """Compute overall workspace status based on snapshot states"""
         for module in self:
-            # Get all snapshot models
-            models = self.env['itx.moduler.model'].search([('module_id', '=', module.id)])
+            module_id = module._origin.id
+            for count_field in self._WORKSPACE_STATS_MODELS:
+                module[count_field] = counts.get((count_field, module_id), 0)
 
-            if not models:
+            # Overall workspace status based on snapshot model states
+            states = model_states[module_id]
+            if not states:
                 module.workspace_status = 'empty'
                 module.workspace_status_color = 7  # Gray
+            elif 'exported' in states:
+                module.workspace_status = 'exported'
+                module.workspace_status_color = 10  # Green
+            elif all(state == 'applied' for state in states):
+                module.workspace_status = 'applied'
+                module.workspace_status_color = 3  # Blue
+            elif 'applied' in states:
+                module.workspace_status = 'ready'
+                module.workspace_status_color = 9  # Purple
+            elif 'validated' in states:
+                module.workspace_status = 'editing'
+                module.workspace_status_color = 1  # Orange
             else:
-                # Check states
-                states = models.mapped('state')
-
-                if 'exported' in states:
-                    module.workspace_status = 'exported'
-                    module.workspace_status_color = 10  # Green
-                elif all(state == 'applied' for state in states):
-                    module.workspace_status = 'applied'
-                    module.workspace_status_color = 3  # Blue
-                elif any(state == 'applied' for state in states):
-                    module.workspace_status = 'ready'
-                    module.workspace_status_color = 9  # Purple
-                elif any(state == 'validated' for state in states):
-                    module.workspace_status = 'editing'
-                    module.workspace_status_color = 1  # Orange
-                else:
-                    module.workspace_status = 'draft'
-                    module.workspace_status_color = 8  # Yellow
-
-    @api.depends('name')
-    def _compute_last_activity(self):
-        """Compute last modification time in workspace"""
-        for module in self:
-            # Get latest write_date from all workspace items
-            dates = []
-
-            models = self.env['itx.moduler.model'].search([
-                ('module_id', '=', module.id)
-            ], order='write_date desc', limit=1)
-            if models:
-                dates.append(models.write_date)
-
-            views = self.env['itx.moduler.view'].search([
-                ('module_id', '=', module.id)
-            ], order='write_date desc', limit=1)
-            if views:
-                dates.append(views.write_date)
-
-            menus = self.env['itx.moduler.menu'].search([
-                ('module_id', '=', module.id)
-            ], order='write_date desc', limit=1)
-            if menus:
-                dates.append(menus.write_date)
-
-            actions = self.env['itx.moduler.action.window'].search([
-                ('module_id', '=', module.id)
-            ], order='write_date desc', limit=1)
-            if actions:
-                dates.append(actions.write_date)
+                module.workspace_status = 'draft'
+                module.workspace_status_color = 8  # Yellow
 
+            # Last modification time in workspace
+            dates = last_dates[module_id]
             module.last_activity = max(dates) if dates else fields.Datetime.now()
 
     @api.depends('name', 'description')
@@ -521,8 +507,11 @@ class ItxModulerModule(models.Model):
         }
 
     @api.model
-    def create_from_odoo_module(self, module_id):
-        """Create a itx.moduler.module from an existing ir.module.module"""
+    def create_from_odoo_module(self, module_id, import_snapshots=True):
+        """Create a itx.moduler.module from an existing ir.module.module
+
+        :param import_snapshots: False to leave the snapshot import to the caller (e.g. a background job)
+        """
         source_module = self.env['ir.module.module'].browse(module_id)
 
         # Check if already exists
@@ -585,354 +574,335 @@ class ItxModulerModule(models.Model):
         # ========================================
 
         # Import snapshots (models, fields, views, menus, actions)
-        new_module.action_import_snapshots()
+        if import_snapshots:
+            new_module.action_import_snapshots()
 
         return new_module
 
-    def action_import_snapshots(self):
-        """Import module data into snapshot tables"""
-        self.ensure_one()
-
-        # Import Models and Fields
-        model_data = self.env['ir.model.data'].search([
+    # Snapshot tables checked by action_import_snapshots, keyed by the source ir.* model
+    _SNAPSHOT_SOURCE_MODELS = [
+        'ir.model', 'ir.ui.view', 'ir.actions.act_window', 'ir.ui.menu', 'res.groups', 'ir.model.access',
+        'ir.rule', 'ir.actions.server', 'ir.actions.report', 'ir.model.constraint',
+    ]
+
+    _SNAPSHOT_SUPPORTED_TTYPES = [
+        'char', 'text', 'html', 'integer', 'float', 'monetary',
+        'boolean', 'date', 'datetime', 'binary', 'selection',
+        'many2one', 'one2many', 'many2many', 'many2one_reference',
+        'reference', 'json', 'properties', 'properties_definition'
+    ]
+
+    def _get_snapshot_sources(self):
+        """Return {source model: records} of this module, found with a single ir.model.data query"""
+        source_ids = defaultdict(list)
+        for data in self.env['ir.model.data'].search_read([
             ('module', '=', self.name),
-            ('model', '=', 'ir.model')
-        ])
+            ('model', 'in', self._SNAPSHOT_SOURCE_MODELS)
+        ], ['model', 'res_id']):
+            source_ids[data['model']].append(data['res_id'])
 
-        if model_data:
-            model_ids = model_data.mapped('res_id')
-            ir_models = self.env['ir.model'].browse(model_ids)
-
-            for ir_model in ir_models:
-                # Skip if already imported
-                existing_snapshot = self.env['itx.moduler.model'].search([
-                    ('model', '=', ir_model.model),
-                    ('module_id', '=', self.id)
-                ], limit=1)
+        return {
+            model_name: self.env[model_name].browse(source_ids[model_name])
+            for model_name in self._SNAPSHOT_SOURCE_MODELS
+        }
 
-                if existing_snapshot:
-                    continue
+    def _get_snapshot_keys(self, snapshot_model, key_fields):
+        """Return the set of key tuples of the snapshots of this module (one query per table)"""
+        return {
+            tuple(row[key] if not isinstance(row[key], tuple) else row[key][0] for key in key_fields)
+            for row in self.env[snapshot_model].search_read([('module_id', '=', self.id)], key_fields)
+        }
 
-                # Create model snapshot
-                model_snapshot = self.env['itx.moduler.model'].create({
-                    'name': ir_model.name,
-                    'model': ir_model.model,
-                    'module_id': self.id,
-                    'description': ir_model.info or '',
-                    'transient_model': ir_model.transient,
-                    'state': 'applied',
-                    'ir_model_id': ir_model.id,
-                })
+    def _get_snapshot_model_map(self, key='model'):
+        """Return {model name (or ir.model id): snapshot model id} for this module"""
+        snapshot_map = {}
+        for row in self.env['itx.moduler.model'].search_read([('module_id', '=', self.id)], ['model', 'ir_model_id']):
+            value = row[key][0] if isinstance(row[key], tuple) else row[key]
+            if value:
+                snapshot_map.setdefault(value, row['id'])
+        return snapshot_map
+
+    @staticmethod
+    def _get_snapshot_group_category_id(ir_group):
+        """Odoo 19: res.groups.category_id moved to res.groups.privilege_id.category_id"""
+        try:
+            if hasattr(ir_group, 'privilege_id') and ir_group.privilege_id:
+                # Odoo 19+: category is under privilege
+                if hasattr(ir_group.privilege_id, 'category_id') and ir_group.privilege_id.category_id:
+                    return ir_group.privilege_id.category_id.id
+            elif hasattr(ir_group, 'category_id') and ir_group.category_id:
+                # Odoo 18 and earlier: category directly on group
+                return ir_group.category_id.id
+        except AttributeError:
+            # Some groups may not have category - that's ok
+            pass
+        return False
+
+    @staticmethod
+    def _get_snapshot_context_str(ir_action):
+        """Safely convert an action context to string"""
+        context_str = '{}'
+        if ir_action.context:
+            try:
+                # Try to convert context to JSON string
+                if isinstance(ir_action.context, dict):
+                    context_str = json.dumps(ir_action.context)
+                else:
+                    context_str = str(ir_action.context)
+            except Exception:
+                context_str = '{}'
+        return context_str
 
-                # Import fields
-                for ir_field in ir_model.field_id:
-                    # Skip magic fields
-                    if ir_field.name in ('id', 'create_uid', 'create_date',
-                                         'write_uid', 'write_date', '__last_update',
-                                         'display_name'):
-                        continue
+    def action_import_snapshots(self):
+        """Import module data into snapshot tables"""
+        return self._import_snapshots()
 
-                    # Skip fields with unsupported types
-                    supported_types = [
-                        'char', 'text', 'html', 'integer', 'float', 'monetary',
-                        'boolean', 'date', 'datetime', 'binary', 'selection',
-                        'many2one', 'one2many', 'many2many', 'many2one_reference',
-                        'reference', 'json', 'properties', 'properties_definition'
-                    ]
-                    if ir_field.ttype not in supported_types:
-                        continue
+    def action_enqueue_import_snapshots(self):
+        """Import module data into snapshot tables in a background job"""
+        job = self.env['itx.moduler.job']._enqueue('import', modules=self)
+        return job.action_open()
 
-                    field_vals = {
-                        'model_id': model_snapshot.id,
-                        'name': ir_field.name,
-                        'field_description': ir_field.field_description,
-                        'ttype': ir_field.ttype,
-                        'required': ir_field.required,
-                        'readonly': ir_field.readonly,
-                        'help': ir_field.help or '',
-                    }
+    def action_enqueue_export(self):
+        """Export the workspaces as a ZIP attachment in a background job"""
+        job = self.env['itx.moduler.job']._enqueue('export', modules=self)
+        return job.action_open()
 
-                    # Relational fields
-                    if ir_field.ttype in ('many2one', 'one2many', 'many2many'):
-                        field_vals['relation'] = ir_field.relation
-                        if ir_field.ttype == 'one2many':
-                            # Skip one2many without relation_field
-                            if not ir_field.relation_field:
-                                continue
-                            field_vals['relation_field'] = ir_field.relation_field
-
-                    # Selection fields
-                    if ir_field.ttype == 'selection' and ir_field.selection_ids:
-                        field = self.env['itx.moduler.model.field'].create(field_vals)
-                        for selection in ir_field.selection_ids:
-                            self.env['itx.moduler.model.field.selection'].create({
-                                'field_id': field.id,
-                                'value': selection.value,
-                                'label': selection.name,
-                                'sequence': selection.sequence,
-                            })
-                    else:
-                        self.env['itx.moduler.model.field'].create(field_vals)
+    def _import_snapshots(self, progress=None):
+        """Import module data into snapshot tables.
 
-        # Import Views
-        view_data = self.env['ir.model.data'].search([
-            ('module', '=', self.name),
-            ('model', '=', 'ir.ui.view')
-        ])
+        Set-based import: the source records come from one ir.model.data query, existing
+        snapshots are loaded once per table into in-memory key sets / lookup maps, and each
+        snapshot table is filled with a single batched create(vals_list).
 
-        if view_data:
-            view_ids = view_data.mapped('res_id')
-            ir_views = self.env['ir.ui.view'].browse(view_ids)
+        :param progress: optional callable(phase) called after each phase (background jobs commit there)
+        """
+        self.ensure_one()
 
-            for ir_view in ir_views:
-                # Find corresponding model snapshot
-                model_snapshot = self.env['itx.moduler.model'].search([
-                    ('model', '=', ir_view.model),
-                    ('module_id', '=', self.id)
-                ], limit=1)
+        import_report = []
+        started = time.perf_counter()
 
-                if not model_snapshot:
-                    continue
+        def _phase(label, snapshot_model, vals_list, skipped=0):
+            """Create a phase's snapshots in one batch and record its timing"""
+            phase_started = time.perf_counter()
+            records = self.env[snapshot_model].with_context(
+                tracking_disable=True, mail_create_nolog=True, mail_notrack=True
+            ).create(vals_list) if vals_list else self.env[snapshot_model]
+            import_report.append((label, len(records), skipped, time.perf_counter() - phase_started))
+            if progress:
+                progress(label)
+            return records
 
-                # Skip if already imported
-                existing = self.env['itx.moduler.view'].search([
-                    ('name', '=', ir_view.name),
-                    ('model_id', '=', model_snapshot.id)
-                ], limit=1)
+        sources = self._get_snapshot_sources()
 
-                if existing:
+        # Import Models and Fields
+        existing_models = {key[0] for key in self._get_snapshot_keys('itx.moduler.model', ['model'])}
+        ir_models = sources['ir.model'].filtered(lambda m: m.model not in existing_models)
+        model_snapshots = _phase('Models', 'itx.moduler.model', [{
+            'name': ir_model.name,
+            'model': ir_model.model,
+            'module_id': self.id,
+            'description': ir_model.info or '',
+            'transient_model': ir_model.transient,
+            'state': 'applied',
+            'ir_model_id': ir_model.id,
+        } for ir_model in ir_models], len(sources['ir.model']) - len(ir_models))
+
+        field_vals_list = []
+        field_selections = []
+        for ir_model, model_snapshot in zip(ir_models, model_snapshots):
+            for ir_field in ir_model.field_id:
+                # Skip magic fields and fields with unsupported types
+                if ir_field.name in ('id', 'create_uid', 'create_date', 'write_uid', 'write_date',
+                                     '__last_update', 'display_name') or \
+                        ir_field.ttype not in self._SNAPSHOT_SUPPORTED_TTYPES:
                     continue
 
-                self.env['itx.moduler.view'].create({
-                    'name': ir_view.name,
-                    'module_id': self.id,
+                field_vals = {
                     'model_id': model_snapshot.id,
-                    'view_type': ir_view.type,
-                    'arch': ir_view.arch,
-                    'mode': 'extension' if ir_view.inherit_id else 'primary',
-                    'inherit_id': ir_view.inherit_id.id if ir_view.inherit_id else False,
-                    'state': 'applied',
-                    'ir_view_id': ir_view.id,
-                })
+                    'name': ir_field.name,
+                    'field_description': ir_field.field_description,
+                    'ttype': ir_field.ttype,
+                    'required': ir_field.required,
+                    'readonly': ir_field.readonly,
+                    'help': ir_field.help or '',
+                }
+
+                # Relational fields
+                if ir_field.ttype in ('many2one', 'one2many', 'many2many'):
+                    field_vals['relation'] = ir_field.relation
+                    if ir_field.ttype == 'one2many':
+                        # Skip one2many without relation_field
+                        if not ir_field.relation_field:
+                            continue
+                        field_vals['relation_field'] = ir_field.relation_field
 
-        # Import Actions
-        action_data = self.env['ir.model.data'].search([
-            ('module', '=', self.name),
-            ('model', '=', 'ir.actions.act_window')
-        ])
+                field_vals_list.append(field_vals)
+                field_selections.append(ir_field.selection_ids if ir_field.ttype == 'selection' else None)
 
-        if action_data:
-            action_ids = action_data.mapped('res_id')
-            ir_actions = self.env['ir.actions.act_window'].browse(action_ids)
+        field_snapshots = _phase('Fields', 'itx.moduler.model.field', field_vals_list)
 
-            for ir_action in ir_actions:
-                # Find corresponding model snapshot
-                model_snapshot = self.env['itx.moduler.model'].search([
-                    ('model', '=', ir_action.res_model),
-                    ('module_id', '=', self.id)
-                ], limit=1)
+        # Selection values of the selection fields
+        _phase('Selections', 'itx.moduler.model.field.selection', [{
+            'field_id': field_snapshot.id,
+            'value': selection.value,
+            'label': selection.name,
+            'sequence': selection.sequence,
+        } for field_snapshot, selections in zip(field_snapshots, field_selections) if selections
+            for selection in selections])
 
-                if not model_snapshot:
-                    continue
+        model_map = self._get_snapshot_model_map()
 
-                # Skip if already imported
-                existing = self.env['itx.moduler.action.window'].search([
-                    ('name', '=', ir_action.name),
-                    ('model_id', '=', model_snapshot.id)
-                ], limit=1)
+        # Import Views
+        existing_views = self._get_snapshot_keys('itx.moduler.view', ['name', 'model_id'])
+        view_vals_list = []
+        for ir_view in sources['ir.ui.view']:
+            model_snapshot_id = model_map.get(ir_view.model)
+            if not model_snapshot_id or (ir_view.name, model_snapshot_id) in existing_views:
+                continue
+            existing_views.add((ir_view.name, model_snapshot_id))
 
-                if existing:
-                    continue
+            view_vals_list.append({
+                'name': ir_view.name,
+                'module_id': self.id,
+                'model_id': model_snapshot_id,
+                'view_type': ir_view.type,
+                'arch': ir_view.arch,
+                'mode': 'extension' if ir_view.inherit_id else 'primary',
+                'inherit_id': ir_view.inherit_id.id if ir_view.inherit_id else False,
+                'state': 'applied',
+                'ir_view_id': ir_view.id,
+            })
+        _phase('Views', 'itx.moduler.view', view_vals_list, len(sources['ir.ui.view']) - len(view_vals_list))
 
-                # Safely convert context to string
-                context_str = '{}'
-                if ir_action.context:
-                    try:
-                        import json
-                        # Try to convert context to JSON string
-                        if isinstance(ir_action.context, dict):
-                            context_str = json.dumps(ir_action.context)
-                        else:
-                            context_str = str(ir_action.context)
-                    except:
-                        context_str = '{}'
-
-                self.env['itx.moduler.action.window'].create({
-                    'name': ir_action.name,
-                    'module_id': self.id,
-                    'model_id': model_snapshot.id,
-                    'view_mode': ir_action.view_mode,
-                    'domain': ir_action.domain or '[]',
-                    'context': context_str,
-                    'limit': ir_action.limit,
-                    'target': ir_action.target,
-                    'help': ir_action.help or '',
-                    'state': 'applied',
-                    'ir_action_id': ir_action.id,
-                })
+        # Import Actions
+        existing_actions = self._get_snapshot_keys('itx.moduler.action.window', ['name', 'model_id'])
+        action_vals_list = []
+        for ir_action in sources['ir.actions.act_window']:
+            model_snapshot_id = model_map.get(ir_action.res_model)
+            if not model_snapshot_id or (ir_action.name, model_snapshot_id) in existing_actions:
+                continue
+            existing_actions.add((ir_action.name, model_snapshot_id))
 
-        # Import Menus
-        menu_data = self.env['ir.model.data'].search([
-            ('module', '=', self.name),
-            ('model', '=', 'ir.ui.menu')
-        ])
+            action_vals_list.append({
+                'name': ir_action.name,
+                'module_id': self.id,
+                'model_id': model_snapshot_id,
+                'view_mode': ir_action.view_mode,
+                'domain': ir_action.domain or '[]',
+                'context': self._get_snapshot_context_str(ir_action),
+                'limit': ir_action.limit,
+                'target': ir_action.target,
+                'help': ir_action.help or '',
+                'state': 'applied',
+                'ir_action_id': ir_action.id,
+            })
+        _phase('Actions', 'itx.moduler.action.window', action_vals_list,
+               len(sources['ir.actions.act_window']) - len(action_vals_list))
 
-        if menu_data:
-            menu_ids = menu_data.mapped('res_id')
-            ir_menus = self.env['ir.ui.menu'].browse(menu_ids).sorted(
-                lambda m: len(m.parent_path or ''), reverse=False
-            )
+        # Import Menus, one batch per menu depth so parents exist before their children
+        ir_menus = sources['ir.ui.menu']
+        existing_menus = {key[0] for key in self._get_snapshot_keys('itx.moduler.menu', ['name'])}
 
-            for ir_menu in ir_menus:
-                # Skip if already imported
-                existing = self.env['itx.moduler.menu'].search([
-                    ('name', '=', ir_menu.name),
-                    ('module_id', '=', self.id)
-                ], limit=1)
+        menu_map = {}
+        for row in self.env['itx.moduler.menu'].search_read(
+                [('ir_menu_id', 'in', ir_menus.mapped('parent_id').ids)], ['ir_menu_id']):
+            menu_map.setdefault(row['ir_menu_id'][0], row['id'])
 
-                if existing:
+        action_map = {}
+        menu_action_ids = [
+            ir_menu.action.id for ir_menu in ir_menus if ir_menu.action and 'act_window' in ir_menu.action._name
+        ]
+        for row in self.env['itx.moduler.action.window'].search_read(
+                [('ir_action_id', 'in', menu_action_ids)], ['ir_action_id']):
+            action_map.setdefault(row['ir_action_id'][0], row['id'])
+
+        menus_by_depth = defaultdict(list)
+        for ir_menu in ir_menus:
+            menus_by_depth[len(ir_menu.parent_path or '')].append(ir_menu)
+
+        menu_count = 0
+        for depth in sorted(menus_by_depth):
+            level_menus = []
+            menu_vals_list = []
+            for ir_menu in menus_by_depth[depth]:
+                # Skip if already imported
+                if ir_menu.name in existing_menus:
                     continue
+                existing_menus.add(ir_menu.name)
 
-                # Find parent menu snapshot
-                parent_snapshot = False
-                if ir_menu.parent_id:
-                    parent_snapshot = self.env['itx.moduler.menu'].search([
-                        ('ir_menu_id', '=', ir_menu.parent_id.id)
-                    ], limit=1)
-
-                # Find action snapshot
-                action_snapshot = False
+                action_id = False
                 if ir_menu.action and 'act_window' in ir_menu.action._name:
-                    action_snapshot = self.env['itx.moduler.action.window'].search([
-                        ('ir_action_id', '=', ir_menu.action.id)
-                    ], limit=1)
+                    action_id = action_map.get(ir_menu.action.id, False)
 
-                self.env['itx.moduler.menu'].create({
+                level_menus.append(ir_menu)
+                menu_vals_list.append({
                     'name': ir_menu.name,
                     'module_id': self.id,
                     'sequence': ir_menu.sequence,
-                    'parent_id': parent_snapshot.id if parent_snapshot else False,
-                    'action_id': action_snapshot.id if action_snapshot else False,
+                    'parent_id': menu_map.get(ir_menu.parent_id.id, False) if ir_menu.parent_id else False,
+                    'action_id': action_id,
                     'web_icon': ir_menu.web_icon,
                     'state': 'applied',
                     'ir_menu_id': ir_menu.id,
                 })
 
-        # Import Groups into snapshot table
-        group_data = self.env['ir.model.data'].search([
-            ('module', '=', self.name),
-            ('model', '=', 'res.groups')
-        ])
-
-        if group_data:
-            group_ids = group_data.mapped('res_id')
-            ir_groups = self.env['res.groups'].browse(group_ids)
-
-            for ir_group in ir_groups:
-                # Skip if already imported
-                existing = self.env['itx.moduler.group'].search([
-                    ('name', '=', ir_group.name),
-                    ('module_id', '=', self.id)
-                ], limit=1)
+            menu_snapshots = _phase('Menus (level %s)' % depth, 'itx.moduler.menu', menu_vals_list)
+            for ir_menu, menu_snapshot in zip(level_menus, menu_snapshots):
+                menu_map.setdefault(ir_menu.id, menu_snapshot.id)
+            menu_count += len(menu_snapshots)
 
-                if existing:
-                    continue
+        # Import Groups into snapshot table
+        existing_groups = {key[0] for key in self._get_snapshot_keys('itx.moduler.group', ['name'])}
+        group_vals_list = []
+        for ir_group in sources['res.groups']:
+            if ir_group.name in existing_groups:
+                continue
+            existing_groups.add(ir_group.name)
 
-                # Create group snapshot
-                # Odoo 19: res.groups.category_id moved to res.groups.privilege_id.category_id
-                category_id = False
-                try:
-                    if hasattr(ir_group, 'privilege_id') and ir_group.privilege_id:
-                        # Odoo 19+: category is under privilege
-                        if hasattr(ir_group.privilege_id, 'category_id') and ir_group.privilege_id.category_id:
-                            category_id = ir_group.privilege_id.category_id.id
-                    elif hasattr(ir_group, 'category_id') and ir_group.category_id:
-                        # Odoo 18 and earlier: category directly on group
-                        category_id = ir_group.category_id.id
-                except AttributeError:
-                    # Some groups may not have category - that's ok
-                    pass
-
-                self.env['itx.moduler.group'].create({
-                    'name': ir_group.name,
-                    'module_id': self.id,
-                    'category_id': category_id,
-                    'comment': ir_group.comment or '',
-                    'implied_ids': [(6, 0, ir_group.implied_ids.ids)],
-                    'state': 'applied',
-                    'ir_group_id': ir_group.id,
-                })
-                _logger.info(f"✅ Imported Group: {ir_group.name}")
+            group_vals_list.append({
+                'name': ir_group.name,
+                'module_id': self.id,
+                'category_id': self._get_snapshot_group_category_id(ir_group),
+                'comment': ir_group.comment or '',
+                'implied_ids': [(6, 0, ir_group.implied_ids.ids)],
+                'state': 'applied',
+                'ir_group_id': ir_group.id,
+            })
+        _phase('Groups', 'itx.moduler.group', group_vals_list, len(sources['res.groups']) - len(group_vals_list))
 
-        # Import ACLs (Access Control Lists) into snapshot table
         self.env.flush_all()
 
-        # Get ACLs by ir.model.data
-        acl_data = self.env['ir.model.data'].search([
-            ('module', '=', self.name),
-            ('model', '=', 'ir.model.access')
-        ])
-
-        acl_records = self.env['ir.model.access'].browse([])
+        group_map = {}
+        for row in self.env['itx.moduler.group'].search_read([('module_id', '=', self.id)], ['ir_group_id']):
+            if row['ir_group_id']:
+                group_map.setdefault(row['ir_group_id'][0], row['id'])
 
-        if acl_data:
-            acl_records = self.env['ir.model.access'].browse(acl_data.mapped('res_id'))
+        # Import ACLs (Access Control Lists) into snapshot table
+        acl_records = sources['ir.model.access']
+        if acl_records:
             _logger.info(f"🔍 Found {len(acl_records)} ACLs via ir.model.data")
-        else:
+        elif model_map:
             # Fallback: Search ACLs by models in this module (for CSV imports)
-            model_names = self.env['itx.moduler.model'].search([
-                ('module_id', '=', self.id)
-            ]).mapped('model')
-
-            if model_names:
-                model_ids = self.env['ir.model'].search([('model', 'in', model_names)])
-                acl_records = self.env['ir.model.access'].search([
-                    ('model_id', 'in', model_ids.ids)
-                ])
-                _logger.info(f"🔍 Fallback found {len(acl_records)} ACLs by model")
-
-        # Import ACLs into snapshot
-        for ir_acl in acl_records:
-            # Skip if already imported
-            existing = self.env['itx.moduler.acl'].search([
-                ('name', '=', ir_acl.name),
-                ('module_id', '=', self.id)
-            ], limit=1)
-
-            if existing:
-                continue
-
-            # Find model snapshot
-            model_snapshot = self.env['itx.moduler.model'].search([
-                ('model', '=', ir_acl.model_id.model),
-                ('module_id', '=', self.id)
-            ], limit=1)
+            acl_records = self.env['ir.model.access'].search([('model_id.model', 'in', list(model_map))])
+            _logger.info(f"🔍 Fallback found {len(acl_records)} ACLs by model")
 
-            if not model_snapshot:
+        existing_acls = {key[0] for key in self._get_snapshot_keys('itx.moduler.acl', ['name'])}
+        acl_vals_list = []
+        for ir_acl in acl_records:
+            model_snapshot_id = model_map.get(ir_acl.model_id.model)
+            if ir_acl.name in existing_acls or not model_snapshot_id:
                 continue
+            existing_acls.add(ir_acl.name)
 
-            # Find group snapshot (if ACL has group)
-            group_snapshot = False
-            external_group = False
+            # Group snapshot if the group is in this module, external group otherwise (e.g., base.group_user)
+            group_snapshot_id = group_map.get(ir_acl.group_id.id, False) if ir_acl.group_id else False
 
-            if ir_acl.group_id:
-                # Check if group is in this module
-                group_snapshot = self.env['itx.moduler.group'].search([
-                    ('ir_group_id', '=', ir_acl.group_id.id),
-                    ('module_id', '=', self.id)
-                ], limit=1)
-
-                if not group_snapshot:
-                    # External group (e.g., base.group_user)
-                    external_group = ir_acl.group_id
-
-            # Create ACL snapshot
-            self.env['itx.moduler.acl'].create({
+            acl_vals_list.append({
                 'name': ir_acl.name,
                 'module_id': self.id,
-                'model_id': model_snapshot.id,
-                'group_id': group_snapshot.id if group_snapshot else False,
-                'external_group_id': external_group.id if external_group else False,
+                'model_id': model_snapshot_id,
+                'group_id': group_snapshot_id,
+                'external_group_id': ir_acl.group_id.id if ir_acl.group_id and not group_snapshot_id else False,
                 'perm_read': ir_acl.perm_read,
                 'perm_write': ir_acl.perm_write,
                 'perm_create': ir_acl.perm_create,
@@ -940,189 +910,116 @@ class ItxModulerModule(models.Model):
                 'state': 'applied',
                 'ir_access_id': ir_acl.id,
             })
-            _logger.info(f"✅ Imported ACL: {ir_acl.name}")
+        _phase('ACLs', 'itx.moduler.acl', acl_vals_list, len(acl_records) - len(acl_vals_list))
 
         # Import Rules (Record Rules) into snapshot table
-        rule_data = self.env['ir.model.data'].search([
-            ('module', '=', self.name),
-            ('model', '=', 'ir.rule')
-        ])
-
-        if rule_data:
-            rule_ids = rule_data.mapped('res_id')
-            ir_rules = self.env['ir.rule'].browse(rule_ids)
-
-            for ir_rule in ir_rules:
-                existing = self.env['itx.moduler.rule'].search([
-                    ('name', '=', ir_rule.name),
-                    ('module_id', '=', self.id)
-                ], limit=1)
-
-                if existing:
-                    continue
-
-                model_snapshot = self.env['itx.moduler.model'].search([
-                    ('model', '=', ir_rule.model_id.model),
-                    ('module_id', '=', self.id)
-                ], limit=1)
-
-                if not model_snapshot:
-                    continue
-
-                # Find group snapshots
-                group_snapshots = self.env['itx.moduler.group'].search([
-                    ('ir_group_id', 'in', ir_rule.groups.ids),
-                    ('module_id', '=', self.id)
-                ])
+        existing_rules = {key[0] for key in self._get_snapshot_keys('itx.moduler.rule', ['name'])}
+        rule_vals_list = []
+        for ir_rule in sources['ir.rule']:
+            model_snapshot_id = model_map.get(ir_rule.model_id.model)
+            if ir_rule.name in existing_rules or not model_snapshot_id:
+                continue
+            existing_rules.add(ir_rule.name)
 
-                external_groups = ir_rule.groups - self.env['res.groups'].browse(group_snapshots.mapped('ir_group_id').ids)
+            group_snapshot_ids = [group_map[group.id] for group in ir_rule.groups if group.id in group_map]
+            external_groups = ir_rule.groups.filtered(lambda group: group.id not in group_map)
 
-                self.env['itx.moduler.rule'].create({
-                    'name': ir_rule.name,
-                    'module_id': self.id,
-                    'model_id': model_snapshot.id,
-                    'active': ir_rule.active,
-                    'domain_force': ir_rule.domain_force or '[]',
-                    'group_ids': [(6, 0, group_snapshots.ids)],
-                    'external_group_ids': [(6, 0, external_groups.ids)],
-                    'perm_read': ir_rule.perm_read,
-                    'perm_write': ir_rule.perm_write,
-                    'perm_create': ir_rule.perm_create,
-                    'perm_unlink': ir_rule.perm_unlink,
-                    'global_rule': getattr(ir_rule, 'global', False),
-                    'state': 'applied',
-                    'ir_rule_id': ir_rule.id,
-                })
-                _logger.info(f"✅ Imported Rule: {ir_rule.name}")
+            rule_vals_list.append({
+                'name': ir_rule.name,
+                'module_id': self.id,
+                'model_id': model_snapshot_id,
+                'active': ir_rule.active,
+                'domain_force': ir_rule.domain_force or '[]',
+                'group_ids': [(6, 0, group_snapshot_ids)],
+                'external_group_ids': [(6, 0, external_groups.ids)],
+                'perm_read': ir_rule.perm_read,
+                'perm_write': ir_rule.perm_write,
+                'perm_create': ir_rule.perm_create,
+                'perm_unlink': ir_rule.perm_unlink,
+                'global_rule': getattr(ir_rule, 'global', False),
+                'state': 'applied',
+                'ir_rule_id': ir_rule.id,
+            })
+        _phase('Rules', 'itx.moduler.rule', rule_vals_list, len(sources['ir.rule']) - len(rule_vals_list))
 
         # Import Action Servers (Automated Actions) into snapshot table
-        action_server_data = self.env['ir.model.data'].search([
-            ('module', '=', self.name),
-            ('model', '=', 'ir.actions.server')
-        ])
-
-        if action_server_data:
-            server_ids = action_server_data.mapped('res_id')
-            ir_servers = self.env['ir.actions.server'].browse(server_ids)
-
-            for ir_server in ir_servers:
-                existing = self.env['itx.moduler.server.action'].search([
-                    ('name', '=', ir_server.name),
-                    ('module_id', '=', self.id)
-                ], limit=1)
-
-                if existing:
-                    continue
-
-                model_snapshot = self.env['itx.moduler.model'].search([
-                    ('model', '=', ir_server.model_id.model),
-                    ('module_id', '=', self.id)
-                ], limit=1)
-
-                if not model_snapshot:
-                    continue
+        existing_servers = {key[0] for key in self._get_snapshot_keys('itx.moduler.server.action', ['name'])}
+        server_vals_list = []
+        for ir_server in sources['ir.actions.server']:
+            model_snapshot_id = model_map.get(ir_server.model_id.model)
+            if ir_server.name in existing_servers or not model_snapshot_id:
+                continue
+            existing_servers.add(ir_server.name)
 
-                self.env['itx.moduler.server.action'].create({
-                    'name': ir_server.name,
-                    'module_id': self.id,
-                    'model_id': model_snapshot.id,
-                    'state': ir_server.state,
-                    'code': ir_server.code or '',
-                    'action_state': 'applied',
-                    'ir_action_id': ir_server.id,
-                })
-                _logger.info(f"✅ Imported Server Action: {ir_server.name}")
+            server_vals_list.append({
+                'name': ir_server.name,
+                'module_id': self.id,
+                'model_id': model_snapshot_id,
+                'state': ir_server.state,
+                'code': ir_server.code or '',
+                'action_state': 'applied',
+                'ir_action_id': ir_server.id,
+            })
+        _phase('Server Actions', 'itx.moduler.server.action', server_vals_list,
+               len(sources['ir.actions.server']) - len(server_vals_list))
 
         # Import Reports into snapshot table
-        report_data = self.env['ir.model.data'].search([
-            ('module', '=', self.name),
-            ('model', '=', 'ir.actions.report')
-        ])
-
-        if report_data:
-            report_ids = report_data.mapped('res_id')
-            ir_reports = self.env['ir.actions.report'].browse(report_ids)
-
-            for ir_report in ir_reports:
-                existing = self.env['itx.moduler.report'].search([
-                    ('name', '=', ir_report.name),
-                    ('module_id', '=', self.id)
-                ], limit=1)
-
-                if existing:
-                    continue
-
-                model_snapshot = self.env['itx.moduler.model'].search([
-                    ('model', '=', ir_report.model),
-                    ('module_id', '=', self.id)
-                ], limit=1)
-
-                if not model_snapshot:
-                    continue
+        existing_reports = {key[0] for key in self._get_snapshot_keys('itx.moduler.report', ['name'])}
+        report_vals_list = []
+        for ir_report in sources['ir.actions.report']:
+            model_snapshot_id = model_map.get(ir_report.model)
+            if ir_report.name in existing_reports or not model_snapshot_id:
+                continue
+            existing_reports.add(ir_report.name)
 
-                self.env['itx.moduler.report'].create({
-                    'name': ir_report.name,
-                    'module_id': self.id,
-                    'model_id': model_snapshot.id,
-                    'report_type': ir_report.report_type,
-                    'report_name': ir_report.report_name,
-                    'report_file': ir_report.report_file or ir_report.report_name,
-                    'print_report_name': ir_report.print_report_name or '',
-                    'paperformat_id': ir_report.paperformat_id.id if ir_report.paperformat_id else False,
-                    'multi': ir_report.multi,
-                    'state': 'applied',
-                    'ir_report_id': ir_report.id,
-                })
-                _logger.info(f"✅ Imported Report: {ir_report.name}")
+            report_vals_list.append({
+                'name': ir_report.name,
+                'module_id': self.id,
+                'model_id': model_snapshot_id,
+                'report_type': ir_report.report_type,
+                'report_name': ir_report.report_name,
+                'report_file': ir_report.report_file or ir_report.report_name,
+                'print_report_name': ir_report.print_report_name or '',
+                'paperformat_id': ir_report.paperformat_id.id if ir_report.paperformat_id else False,
+                'multi': ir_report.multi,
+                'state': 'applied',
+                'ir_report_id': ir_report.id,
+            })
+        _phase('Reports', 'itx.moduler.report', report_vals_list,
+               len(sources['ir.actions.report']) - len(report_vals_list))
 
         # Import SQL Constraints into snapshot table
-        constraint_data = self.env['ir.model.data'].search([
-            ('module', '=', self.name),
-            ('model', '=', 'ir.model.constraint')
-        ])
-
-        if constraint_data:
-            constraint_ids = constraint_data.mapped('res_id')
-            ir_constraints = self.env['ir.model.constraint'].browse(constraint_ids)
-
-            for ir_constraint in ir_constraints:
-                existing = self.env['itx.moduler.constraint'].search([
-                    ('name', '=', ir_constraint.name),
-                    ('module_id', '=', self.id)
-                ], limit=1)
-
-                if existing:
-                    continue
-
-                model_snapshot = self.env['itx.moduler.model'].search([
-                    ('ir_model_id', '=', ir_constraint.model.id),
-                    ('module_id', '=', self.id)
-                ], limit=1)
-
-                if not model_snapshot:
-                    continue
+        model_map_by_ir_model = self._get_snapshot_model_map(key='ir_model_id')
+        existing_constraints = {key[0] for key in self._get_snapshot_keys('itx.moduler.constraint', ['name'])}
+        constraint_vals_list = []
+        for ir_constraint in sources['ir.model.constraint']:
+            model_snapshot_id = model_map_by_ir_model.get(ir_constraint.model.id)
+            if ir_constraint.name in existing_constraints or not model_snapshot_id:
+                continue
+            existing_constraints.add(ir_constraint.name)
 
-                self.env['itx.moduler.constraint'].create({
-                    'name': ir_constraint.name,
-                    'module_id': self.id,
-                    'model_id': model_snapshot.id,
-                    'type': ir_constraint.type,
-                    'definition': ir_constraint.definition or '',
-                    'message': ir_constraint.message or '',
-                    'state': 'applied',
-                    'ir_constraint_id': ir_constraint.id,
-                })
-                _logger.info(f"✅ Imported SQL Constraint: {ir_constraint.name}")
+            constraint_vals_list.append({
+                'name': ir_constraint.name,
+                'module_id': self.id,
+                'model_id': model_snapshot_id,
+                'type': ir_constraint.type,
+                'definition': ir_constraint.definition or '',
+                'message': ir_constraint.message or '',
+                'state': 'applied',
+                'ir_constraint_id': ir_constraint.id,
+            })
+        _phase('SQL Constraints', 'itx.moduler.constraint', constraint_vals_list,
+               len(sources['ir.model.constraint']) - len(constraint_vals_list))
 
         # Import Python Constraints from model registry
-        import inspect
-
         model_snapshots = self.env['itx.moduler.model'].search([
             ('module_id', '=', self.id)
         ])
 
         _logger.info(f"🔍 Checking Python Constraints for {len(model_snapshots)} models...")
 
+        existing_server_constraints = self._get_snapshot_keys('itx.moduler.server.constraint', ['name', 'model_id'])
+        server_constraint_vals_list = []
         for model_snapshot in model_snapshots:
             if not model_snapshot.ir_model_id:
                 _logger.debug(f"⏭️  Skipping {model_snapshot.model} - no ir_model_id")
@@ -1131,7 +1028,6 @@ class ItxModulerModule(models.Model):
             try:
                 # Get the actual Python model class
                 py_model = self.env[model_snapshot.model]
-                _logger.debug(f"🔍 Checking model: {model_snapshot.model}")
 
                 # In Odoo, constraint methods are stored in _constraint_methods
                 # It stores function objects, not strings
@@ -1140,7 +1036,6 @@ class ItxModulerModule(models.Model):
                 # Method 1: Try _constraint_methods attribute (contains function objects)
                 if hasattr(py_model, '_constraint_methods'):
                     constraint_methods = list(py_model._constraint_methods)
-                    _logger.debug(f"   Found _constraint_methods: {constraint_methods}")
 
                 # Method 2: Scan all methods for @api.constrains decorator
                 if not constraint_methods:
@@ -1149,81 +1044,70 @@ class ItxModulerModule(models.Model):
                             attr = getattr(py_model.__class__, attr_name, None)
                             if callable(attr) and hasattr(attr, '_constrains'):
                                 constraint_methods.append(attr)  # Append function object
-                    _logger.debug(f"   Found by scanning: {constraint_methods}")
-
-                if not constraint_methods:
-                    _logger.debug(f"   No Python constraints found for {model_snapshot.model}")
-                    continue
 
-                # Process each constraint method
                 for method in constraint_methods:
-                    try:
-                        # Extract method name from function object
-                        method_name = method.__name__
-                        _logger.debug(f"   Processing constraint: {method_name}")
-
-                        # Get constraint info from method
-                        constraint_fields = getattr(method, '_constrains', [])
-                        if not constraint_fields:
-                            _logger.debug(f"   ⏭️  Method {method_name} has no _constrains")
-                            continue
-
-                        # Check if already imported
-                        existing = self.env['itx.moduler.server.constraint'].search([
-                            ('name', '=', method_name),
-                            ('model_id', '=', model_snapshot.id),
-                            ('module_id', '=', self.id)
-                        ], limit=1)
+                    # Extract method name from function object
+                    method_name = method.__name__
 
-                        if existing:
-                            _logger.debug(f"   ⏭️  {method_name} already imported")
-                            continue
+                    # Get constraint info from method
+                    constraint_fields = getattr(method, '_constrains', [])
+                    if not constraint_fields or (method_name, model_snapshot.id) in existing_server_constraints:
+                        continue
+                    existing_server_constraints.add((method_name, model_snapshot.id))
 
-                        # Get method docstring as description
-                        description = method.__doc__ or f"Python constraint on {', '.join(constraint_fields)}"
+                    # Get method docstring as description
+                    description = method.__doc__ or f"Python constraint on {', '.join(constraint_fields)}"
 
-                        # Try to get source code
-                        try:
-                            source_code = inspect.getsource(method)
-                        except Exception as e:
-                            _logger.warning(f"   ⚠️  Could not get source for {method_name}: {e}")
-                            # Fallback if source not available
-                            source_code = f'''# Constraint method: {method_name}
+                    # Try to get source code
+                    try:
+                        source_code = inspect.getsource(method)
+                    except Exception as e:
+                        _logger.warning(f"   ⚠️  Could not get source for {method_name}: {e}")
+                        # Fallback if source not available
+                        source_code = f'''# Constraint method: {method_name}
 # Validates: {', '.join(constraint_fields)}
 for record in self:
     # Original validation logic
     pass
 '''
 
-                        # Create Python constraint snapshot
-                        self.env['itx.moduler.server.constraint'].create({
-                            'name': method_name,
-                            'module_id': self.id,
-                            'model_id': model_snapshot.id,
-                            'field_names': ', '.join(constraint_fields),
-                            'code': source_code,
-                            'description': description.strip(),
-                            'message': 'Validation failed',  # Default message
-                            'state': 'applied',
-                        })
-                        _logger.info(f"✅ Imported Python Constraint: {method_name} on {model_snapshot.model} (fields: {', '.join(constraint_fields)})")
-
-                    except Exception as e:
-                        _logger.error(f"   ❌ Failed to import constraint {method_name}: {e}", exc_info=True)
-                        continue
+                    server_constraint_vals_list.append({
+                        'name': method_name,
+                        'module_id': self.id,
+                        'model_id': model_snapshot.id,
+                        'field_names': ', '.join(constraint_fields),
+                        'code': source_code,
+                        'description': description.strip(),
+                        'message': 'Validation failed',  # Default message
+                        'state': 'applied',
+                    })
 
             except Exception as e:
                 _logger.error(f"❌ Could not process Python constraints for {model_snapshot.model}: {e}", exc_info=True)
                 continue
 
-        _logger.info(f"✅ Python Constraints import completed")
+        _phase('Python Constraints', 'itx.moduler.server.constraint', server_constraint_vals_list)
+
+        # Progress / timing report
+        total_seconds = time.perf_counter() - started
+        total_created = sum(created for __, created, __, __ in import_report)
+        for label, created, skipped, seconds in import_report:
+            _logger.info(f"✅ Imported {label}: {created} created, {skipped} skipped in {seconds:.2f}s")
+        _logger.info(f"✅ Snapshot import of {self.name} completed: {total_created} records in {total_seconds:.2f}s")
 
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
             'params': {
                 'title': _('Import Complete'),
-                'message': _('Module "%s" imported successfully into snapshots') % self.name,
+                'message': _('Module "%(module)s" imported successfully into snapshots: '
+                             '%(count)s records in %(seconds).1fs (%(models)s models, %(menus)s menus)') % {
+                    'module': self.name,
+                    'count': total_created,
+                    'seconds': total_seconds,
+                    'models': len(model_snapshots),
+                    'menus': menu_count,
+                },
                 'type': 'success',
                 'sticky': False,
             }
@@ -16,3 +16,24 @@ class CodeGeneratorConfigSettings(models.TransientModel):
         default='nomenclator',
         config_parameter='itx_moduler.s_data2export'
     )
+
+    i_export_workers = fields.Integer(
+        string='Export workers',
+        help='Number of modules rendered in parallel when several modules are exported at once (0 = automatic)',
+        default=0,
+        config_parameter='itx_moduler.export_workers'
+    )
+
+    i_export_cache_size = fields.Integer(
+        string='Export cache size (MB)',
+        help='Size of the cache of generated files reused by unchanged models (0 = cache disabled)',
+        default=64,
+        config_parameter='itx_moduler.export_cache_size'
+    )
+
+    b_run_server_constrains = fields.Boolean(
+        string='Run server constrains',
+        help='Evaluate the server constrains of the models on every create/write of their records',
+        default=False,
+        config_parameter='itx_moduler.run_server_constrains'
+    )
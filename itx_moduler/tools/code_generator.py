@@ -0,0 +1,1593 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import hashlib
+import io
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from zipfile import ZipFile, ZIP_DEFLATED
+
+import jinja2
+from odoo import api
+from odoo.models import MAGIC_COLUMNS
+
+_logger = logging.getLogger(__name__)
+
+UNDEFINEDMESSAGE = 'Restriction message not yet define.'
+MAGIC_FIELDS = MAGIC_COLUMNS + ['display_name', '__last_update']
+MODULE_NAME = 'itx_creator'
+ENCODING = ['# -*- coding: utf-8 -*-']
+BLANCK_LINE = ['']
+BREAK_LINE = ['\n']
+BLANCK_HEAD = ENCODING + BLANCK_LINE
+BREAK_HEAD = ENCODING + BREAK_LINE
+XML_VERSION = ['<?xml version= "1.0" encoding="utf-8"?>']
+XML_ODOO_OPENING_TAG = ['<odoo>']
+XML_HEAD = XML_VERSION + XML_ODOO_OPENING_TAG
+XML_ODOO_CLOSING_TAG = ['</odoo>']
+FROM_ODOO_IMPORTS = ['from odoo import api, models, fields']
+MODEL_HEAD = BLANCK_HEAD + FROM_ODOO_IMPORTS + BREAK_LINE
+TAB4 = ' ' * 4
+TAB8 = ' ' * 8
+EXPORT_MAX_WORKERS = 8
+EXPORT_CACHE_VERSION = '1'
+
+
+class CodeGeneratorZipStream(io.RawIOBase):
+    """
+    Write-only, unseekable ZIP target that keeps only the bytes not yet sent to the client
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        """
+        Util function to pop the pending chunks
+        :return:
+        """
+
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+
+class CodeGeneratorZipFile(ZipFile):
+    """
+    ITX Moduler ZipFile class, written as a stream of chunks (no temporary files, no in-memory archive)
+    """
+
+    def __init__(self, compression=ZIP_DEFLATED):
+        self.stream = CodeGeneratorZipStream()
+        super().__init__(self.stream, mode='w', compression=compression)
+
+    def writestr_chunks(self, file_path, content):
+        """
+        Util function to add a file to the archive and get the chunks ready to be sent
+        :param file_path:
+        :param content:
+        :return:
+        """
+
+        self.writestr(file_path, content)
+        return self.stream.drain()
+
+    def close_chunks(self):
+        """
+        Util function to write the central directory and get the last chunks
+        :return:
+        """
+
+        self.close()
+        return self.stream.drain()
+
+
+class CodeGeneratorExportContext(object):
+    """
+    ITX Moduler export context: loads, with a handful of grouped queries, everything the generators read for the
+    exported modules (fields, groups, ACLs, rules, views, actions, menus and their xml ids) and counts the queries
+    issued by the export.
+    It also fingerprints the sources of every model file to reuse the bytes kept in the export cache.
+    """
+
+    def __init__(self, modules):
+        self.env = modules.env
+        self._sql_log_start = self.env.cr.sql_log_count
+        self._xmlids = {}
+        self._access_xmlids = {}
+        self._access_ids = collections.defaultdict(list)
+        self._rule_ids = collections.defaultdict(list)
+        self._view_ids = collections.defaultdict(list)
+        self._act_window_ids = collections.defaultdict(list)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache_keys = {}
+        self._cache_entries = {}
+        self._cache_new = {}
+        self._prefetch(modules)
+
+    @property
+    def query_count(self):
+        return self.env.cr.sql_log_count - self._sql_log_start
+
+    def _prefetch(self, modules):
+        """
+        Function to load the export data of all the modules at once
+        :param modules:
+        :return:
+        """
+
+        models = modules.mapped('o2m_models')
+        model_fields = models.mapped('field_ids')
+        model_names = models.mapped('model')
+
+        accesses = self.env['ir.model.access'].search([('model_id.model', 'in', model_names)])
+        for access in accesses:
+            self._access_ids[access.model_id.model].append(access.id)
+
+        for data in self.env['ir.model.data'].search_read([
+            ('module', '=', MODULE_NAME),
+            ('model', '=', 'ir.model.access'),
+            ('res_id', 'in', accesses.ids)
+        ], ['name', 'res_id']):
+            self._access_xmlids.setdefault(data['res_id'], data['name'])
+
+        rules = self.env['ir.rule'].search([('model_id.model', 'in', model_names)])
+        for rule in rules:
+            self._rule_ids[rule.model_id.model].append(rule.id)
+
+        views = self.env['itx.moduler.view'].search([('model_id', 'in', models.ids)])
+        for view in views:
+            self._view_ids[view.model_id.id].append(view.id)
+
+        act_windows = self.env['itx.moduler.action.window'].search([('model_id', 'in', models.ids)])
+        for act_window in act_windows:
+            self._act_window_ids[act_window.model_id.id].append(act_window.id)
+
+        menus = modules.with_context({'ir.ui.menu.full_list': True}).mapped('o2m_menus')
+
+        groups = modules.mapped('o2m_groups')
+        groups |= groups.mapped('implied_ids') | model_fields.mapped('groups') | accesses.mapped('group_id') | \
+            rules.mapped('groups') | views.mapped('group_ids') | act_windows.mapped('group_ids') | \
+            menus.mapped('group_ids')
+
+        self.preload_xmlids(groups)
+        self.preload_xmlids(rules.mapped('model_id'))
+        self.preload_xmlids(views)
+        self.preload_xmlids(act_windows)
+        self.preload_xmlids(menus | menus.mapped('parent_id'))
+
+        export_cache = self.env['itx.moduler.export.cache'].sudo()
+        if export_cache._get_max_size():
+            for model in models:
+                self._cache_keys[model.id] = self._get_model_cache_keys(model)
+
+            self._cache_entries = export_cache._get_entries(
+                {key for model_keys in self._cache_keys.values() for key in model_keys.values()}
+            )
+
+    def _get_fingerprint(self, *sources):
+        """
+        Function to hash the sources of a generated file: strings and the (id, write_date, xml id) of records
+        :param sources:
+        :return:
+        """
+
+        sha = hashlib.sha256(EXPORT_CACHE_VERSION.encode())
+        for source in sources:
+            if isinstance(source, str):
+                sha.update(('%s;' % source).encode())
+                continue
+
+            for record in source:
+                sha.update(('%s,%s,%s,%s;' % (
+                    record._name, record.id, record.write_date, self._xmlids.get((record._name, record.id)) or ''
+                )).encode())
+
+        return sha.hexdigest()
+
+    def _get_model_cache_keys(self, model):
+        """
+        Function to obtain the export cache keys of the files of a model
+        :param model:
+        :return:
+        """
+
+        module_path = model.module_id.name.lower().strip()
+        export_fields = self.get_export_fields(model)
+        views = self.get_views(model)
+        act_windows = self.get_act_windows(model)
+
+        server_actions = model.o2m_server_action
+
+        return {
+            'py': self._get_fingerprint(
+                'py', module_path, model, export_fields, export_fields.mapped('groups'),
+                model.o2m_serverconstrains, model.o2m_constraints
+            ),
+            'xmlview': self._get_fingerprint(
+                'xmlview', module_path, model, views, act_windows, views.mapped('group_ids'),
+                act_windows.mapped('group_ids'), server_actions, server_actions.mapped('model_id')
+            ),
+        }
+
+    def get_cached_file(self, model, kind, render):
+        """
+        Function to obtain a generated file of a model from the export cache, rendering it on a miss
+        :param model:
+        :param kind:
+        :param render: function returning the (file_path, content) tuple, or None when there is no file
+        :return:
+        """
+
+        model_keys = self._cache_keys.get(model.id)
+        if not model_keys:
+            return render()
+
+        key = model_keys[kind]
+        if key in self._cache_entries:
+            self.cache_hits += 1
+            file_path, content = self._cache_entries[key]
+            return (file_path, content) if file_path else None
+
+        self.cache_misses += 1
+        model_file = render()
+        self._cache_entries[key] = self._cache_new[key] = model_file or (None, b'')
+
+        return model_file
+
+    def flush_cache(self):
+        """
+        Function to store in the export cache the files rendered by this export
+        :return:
+        """
+
+        self.env['itx.moduler.export.cache'].sudo()._store_entries(self._cache_new)
+        self._cache_new = {}
+
+    def preload_xmlids(self, records):
+        """
+        Function to load with one query the xml ids of the records not yet known
+        :param records:
+        :return:
+        """
+
+        res_ids = [res_id for res_id in records.ids if (records._name, res_id) not in self._xmlids]
+        if not res_ids:
+            return
+
+        for res_id in res_ids:
+            self._xmlids[(records._name, res_id)] = False
+
+        for data in self.env['ir.model.data'].search_read([
+            ('model', '=', records._name),
+            ('res_id', 'in', res_ids)
+        ], ['module', 'name', 'res_id']):
+            key = (records._name, data['res_id'])
+            if not self._xmlids[key]:
+                self._xmlids[key] = '%s.%s' % (data['module'], data['name'])
+
+    def get_xmlid(self, record):
+        """
+        Function to obtain the xml id (module.name) of a record, False if it has none
+        :param record:
+        :return:
+        """
+
+        key = (record._name, record.id)
+        if key not in self._xmlids:
+            self.preload_xmlids(record)
+
+        return self._xmlids[key]
+
+    def get_access_xmlid(self, access):
+        return self._access_xmlids.get(access.id, False)
+
+    def get_access(self, model):
+        return self.env['ir.model.access'].browse(self._access_ids[model.model])
+
+    def get_rules(self, model):
+        return self.env['ir.rule'].browse(self._rule_ids[model.model])
+
+    def get_views(self, model):
+        return self.env['itx.moduler.view'].browse(self._view_ids[model.id])
+
+    def get_act_windows(self, model):
+        return self.env['itx.moduler.action.window'].browse(self._act_window_ids[model.id])
+
+    def get_export_fields(self, model):
+        """
+        Function to obtain the fields to export of a model (no magic fields, no fields of the inherited model)
+        :param model:
+        :return:
+        """
+
+        f2exports = model.field_id.filtered(lambda field: field.name not in MAGIC_FIELDS)
+
+        if model.m2o_inherit_model:
+            father = model.env['ir.model'].browse(model.m2o_inherit_model.id)
+            fatherfieldnames = father.field_id.filtered(lambda field: field.name not in MAGIC_FIELDS).mapped('name')
+            f2exports = f2exports.filtered(lambda field: field.name not in fatherfieldnames)
+
+        return f2exports
+
+
+def _get_l_map(fn, collection):
+    """
+    Util function to get a list of a map operation
+    :param fn:
+    :param collection:
+    :return:
+    """
+
+    return list(map(fn, collection))
+
+
+def _get_class_name(model):
+    """
+    Util function to get a model class name representation from a model name (code.generator -> CodeGenerator)
+    :param model:
+    :return:
+    """
+
+    result = []
+    bypoint = model.split('.')
+    for byp in bypoint:
+        result += byp.split('_')
+    return ''.join(_get_l_map(lambda e: e.capitalize(), result))
+
+
+def _lower_replace(string, replacee=' ', replacer='_'):
+    """
+    Util function to replace and get the lower content of a string
+    :param string:
+    :return:
+    """
+
+    return str(string).lower().replace(replacee, replacer)
+
+
+def _get_model_model(model_model, replacee='.'):
+    """
+    Util function to get a model res_id-like representation (code.generator -> itx_creator)
+    :param model_model:
+    :param replacee:
+    :return:
+    """
+    return _lower_replace(model_model, replacee=replacee)
+
+
+def _get_python_class_4inherit(model):
+    """
+    Util function to get the Python Classes for inheritance
+    :param model:
+    :return:
+    """
+
+    class_4inherit = 'models.TransientModel' if model.transient else \
+        ('models.AbstractModel' if model._abstract else 'models.Model')
+    if model.m2o_inherit_py_class.name:
+        class_4inherit += ', %s' % model.m2o_inherit_py_class.name
+
+    return class_4inherit
+
+
+def _get_odoo_ttype_class(ttype):
+    """
+    Util function to get a field class name from a field type (char -> Char, many2one -> Many2one)
+    :param ttype:
+    :return:
+    """
+
+    return 'fields.%s' % ttype.capitalize()
+
+
+def _get_starting_spaces(compute_line):
+    """
+    Util function to count the starting spaces of a string
+    :param compute_line:
+    :return:
+    """
+
+    space_counter = 0
+    for character in compute_line:
+        if character.isspace():
+            space_counter += 1
+
+        else:
+            break
+
+    return space_counter
+
+
+def _set_limit_4xmlid(xmlid):
+    """
+    Util function to truncate (to 64 characters) an xml_id
+    :param xmlid:
+    :return:
+    """
+
+    return '%s...' % xmlid[:61 - len(xmlid)] if (64 - len(xmlid)) < 0 else xmlid
+
+
+def _get_ir_model_data(export_context, record, give_a_default=False):
+    """
+    Function to obtain the model data from a record
+    :param export_context:
+    :param record:
+    :param give_a_default:
+    :return:
+    """
+
+    xmlid = export_context.get_xmlid(record)
+    return xmlid if xmlid else \
+        (_set_limit_4xmlid('%s_%s' % (
+            _get_model_model(record._name), _lower_replace(getattr(record, record._rec_name) if record._rec_name else '')
+        ))) if give_a_default else False
+
+
+def _get_group_data_name(export_context, group):
+    """
+    Function to obtain the res_id-like group name (ITX Moduler / Manager -> itx_moduler_manager)
+    :param export_context:
+    :param group:
+    :return:
+    """
+
+    return _get_ir_model_data(export_context, group) or _lower_replace(group.name.replace(' /', ''))
+
+
+def _get_model_data_name(export_context, model):
+    """
+    Function to obtain the res_id-like model name (itx.moduler.module -> itx_moduler_module)
+    :param export_context:
+    :param model:
+    :return:
+    """
+
+    return _get_ir_model_data(export_context, model) or 'model_%s' % _get_model_model(model.model)
+
+
+def _get_view_data_name(export_context, view):
+    """
+    Function to obtain the res_id-like view name
+    :param export_context:
+    :param view:
+    :return:
+    """
+
+    return _get_ir_model_data(export_context, view) or '%s_%sview>' % (_get_model_model(view.model), view.type)
+
+
+def _get_action_data_name(export_context, action, server=False, creating=False):
+    """
+    Function to obtain the res_id-like action name
+    :param export_context:
+    :param action:
+    :param server:
+    :param creating:
+    :return:
+    """
+
+    if not creating and _get_ir_model_data(export_context, action):
+        return _get_ir_model_data(export_context, action)
+
+    else:
+        model = getattr(action, 'res_model') if not server else getattr(action, 'model_id').model
+        model_model = _get_model_model(model)
+        actiontype = 'actionwindow' if not server else 'serveraction'
+
+        actionname = _set_limit_4xmlid('%s' % action.name[:64 - len(model_model) - len(actiontype)])
+
+        return '%s_%s_%s' % (model_model, _lower_replace(actionname), actiontype)
+
+
+def _get_menu_data_name(export_context, menu):
+    """
+    Function to obtain the res_id-like menu name
+    :param export_context:
+    :param menu:
+    :return:
+    """
+
+    return _get_ir_model_data(export_context, menu) or _lower_replace(menu.name)
+
+
+jinjaenv = jinja2.Environment()
+
+
+def _jinjarender(content):
+    """
+    Function to render the content of a file
+    :param content:
+    :return:
+    """
+
+    return jinjaenv.from_string('\n'.join(content)).render().encode('utf-8')
+
+
+def _prepare_compute_constrained_fields(l_fields):
+    """
+
+    :param l_fields:
+    :return:
+    """
+
+    counter = 1
+    prepared = ''
+    for field in l_fields:
+        prepared += '\'%s\'%s' % (field, ', ' if counter < len(l_fields) else '')
+        counter += 1
+
+    return prepared
+
+
+def _get_m2m_groups(export_context, m2m_groups):
+    """
+
+    :param export_context:
+    :param m2m_groups:
+    :return:
+    """
+
+    return '<field name="groups_id" eval="[(6,0, [%s])]" />' % ', '.join(
+        m2m_groups.mapped(lambda g: 'ref(%s)' % _get_group_data_name(export_context, g))
+    )
+
+
+def _get_model_fields(export_context, model):
+    """
+    Function to obtain the model fields
+    :param export_context:
+    :param model:
+    :return:
+    """
+
+    l_model_fields = []
+
+    for f2export in export_context.get_export_fields(model):
+
+        l_model_fields += BLANCK_LINE
+
+        l_model_fields.append('%s%s = %s(' % (TAB4, f2export.name, _get_odoo_ttype_class(f2export.ttype)))
+
+        l_model_fields.append('%sstring=\'%s\',' % (TAB8, f2export.field_description))
+
+        if f2export.help:
+            l_model_fields.append('%shelp=\'%s\',' % (TAB8, f2export.help))
+
+        if f2export.ttype in ['many2one', 'one2many', 'many2many']:
+            if f2export.relation:
+                l_model_fields.append('%scomodel_name=\'%s\',' % (TAB8, f2export.relation))
+
+            if f2export.ttype == 'one2many' and f2export.relation_field:
+                l_model_fields.append('%sinverse_name=\'%s\',' % (TAB8, f2export.relation_field))
+
+            if f2export.ttype == 'many2one' and f2export.on_delete:
+                l_model_fields.append('%son_delete=\'%s\',' % (TAB8, f2export.on_delete))
+
+            if f2export.domain and f2export.domain != '[]':
+                l_model_fields.append('%sdomain="%s",' % (TAB8, f2export.domain))
+
+            if f2export.ttype == 'many2many':
+                if f2export.relation_table:
+                    l_model_fields.append('%srelation=\'%s\',' % (TAB8, f2export.relation_table))
+                if f2export.column1:
+                    l_model_fields.append('%scolumn1=\'%s\',' % (TAB8, f2export.column1))
+                if f2export.column2:
+                    l_model_fields.append('%scolumn2=\'%s\',' % (TAB8, f2export.column2))
+
+        if (f2export.ttype == 'char' or f2export.ttype == 'reference') and f2export.size != 0:
+            l_model_fields.append('%ssize=%s,' % (TAB8, f2export.size))
+
+        if (f2export.ttype == 'reference' or f2export.ttype == 'selection') and f2export.selection:
+            l_model_fields.append('%sselection=%s,' % (TAB8, f2export.selection))
+
+        if f2export.related:
+            l_model_fields.append('%srelated=\'%s\',' % (TAB8, f2export.related))
+
+        if f2export.required:
+            l_model_fields.append('%srequired=True,' % TAB8)
+
+        if f2export.readonly:
+            l_model_fields.append('%sreadonly=True,' % TAB8)
+
+        if f2export.index:
+            l_model_fields.append('%sindex=True,' % TAB8)
+
+        if f2export.translate:
+            l_model_fields.append('%stranslate=True,' % TAB8)
+
+        if not f2export.selectable:
+            l_model_fields.append('%sselectable=False,' % TAB8)
+
+        if f2export.groups:
+            l_model_fields.append('%sgroups=\'%s\',' % (
+                TAB8, ','.join(f2export.groups.mapped(lambda g: _get_group_data_name(export_context, g)))
+            ))
+
+        compute = f2export.compute and f2export.depends
+        if compute:
+            l_model_fields.append('%scompute=\'_compute_%s\',' % (TAB8, f2export.name))
+
+        if (f2export.ttype == 'one2many' or f2export.related or compute) and f2export.copied:
+            l_model_fields.append('%scopy=True,' % TAB8)
+
+        elif f2export.ttype != 'one2many' and not f2export.related and not compute and not f2export.copied:
+            l_model_fields.append('%scopy=False,' % TAB8)
+
+        l_model_fields.append('%s)' % TAB4)
+
+        if compute:
+            l_model_fields += BLANCK_LINE
+
+            l_depends = _get_l_map(lambda e: e.strip(), f2export.depends.split(','))
+
+            l_model_fields.append('%s@api.depends(%s)' % (TAB4, _prepare_compute_constrained_fields(l_depends)))
+            l_model_fields.append('%sdef _compute_%s(self):' % (TAB4, f2export.name))
+
+            l_compute = f2export.compute.split('\n')
+            starting_spaces = 2
+            for line in l_compute:
+                if _get_starting_spaces(line) == 2:
+                    starting_spaces += 1
+                l_model_fields.append('%s%s' % (TAB4 * starting_spaces, line.strip()))
+
+    return l_model_fields
+
+
+def _get_model_constrains(model):
+    """
+    Function to obtain the model constrains
+    :param model:
+    :return:
+    """
+
+    l_model_constrains = []
+
+    if model.o2m_serverconstrains:
+
+        l_model_constrains += BLANCK_LINE
+
+        for sconstrain in model.o2m_serverconstrains:
+            l_constrained = _get_l_map(lambda e: e.strip(), sconstrain.constrained.split(','))
+
+            l_model_constrains.append(
+                '%s@api.constrains(%s)' % (TAB4, _prepare_compute_constrained_fields(l_constrained))
+            )
+            l_model_constrains.append('%sdef _check_%s(self):' % (TAB4, '_'.join(l_constrained)))
+            if sconstrain.eval_mode == 'recordset':
+                l_model_constrains.append('%srecords = self' % (TAB4 * 2))
+
+            l_code = sconstrain.txt_code.split('\n')
+            starting_spaces = 2
+            for line in l_code:
+                if _get_starting_spaces(line) == 2:
+                    starting_spaces += 1
+                l_model_constrains.append('%s%s' % (TAB4 * starting_spaces, line.strip()))
+                starting_spaces = 2
+
+            l_model_constrains += BLANCK_LINE
+
+        l_model_constrains += BLANCK_LINE
+
+    if model.o2m_constraints:
+
+        if not l_model_constrains:
+            l_model_constrains += BLANCK_LINE
+
+        l_model_constrains += ['%s_sql_constraints = [' % TAB4]
+
+        constraint_counter = 0
+        for constraint in model.o2m_constraints:
+            constraint_name = constraint.name.replace('%s_' % _get_model_model(model.model), '')
+            constraint_definition = constraint.definition
+            constraint_message = constraint.message if constraint.message else UNDEFINEDMESSAGE
+            constraint_counter += 1
+            constraint_separator = ',' if constraint_counter < len(model.o2m_constraints) else ''
+
+            l_model_constrains.append(
+                '%s(\'%s\', \'%s\', \'%s\')%s' % (
+                    TAB8, constraint_name, constraint_definition, constraint_message, constraint_separator
+                )
+            )
+
+        l_model_constrains.append('%s]' % TAB4)
+
+        l_model_constrains += BREAK_LINE
+
+    return l_model_constrains
+
+
+def _get_model_access(export_context, model):
+    """
+    Function to obtain the model access
+    :param export_context:
+    :param model:
+    :return:
+    """
+
+    l_model_csv_access = []
+
+    for access in export_context.get_access(model):
+        access_name = access.name
+
+        access_id = export_context.get_access_xmlid(access) or _lower_replace(access_name)
+
+        access_model = _get_model_model(access.model_id.model)
+
+        access_group = _get_group_data_name(export_context, access.group_id) if access.group_id else ''
+
+        access_read, access_create, access_write, access_unlink = \
+            1 if access.perm_read else 0, \
+            1 if access.perm_create else 0, \
+            1 if access.perm_write else 0, \
+            1 if access.perm_unlink else 0, \
+
+        l_model_csv_access.append(
+            '%s,%s,model_%s,%s,%s,%s,%s,%s' % (
+                access_id,
+                access_name,
+                access_model,
+                access_group,
+                access_read,
+                access_create,
+                access_write,
+                access_unlink
+            )
+        )
+
+    return l_model_csv_access
+
+
+def _get_model_rules(export_context, model):
+    """
+    Function to obtain the model rules
+    :param export_context:
+    :param model:
+    :return:
+    """
+
+    l_model_rules = []
+
+    for rule in export_context.get_rules(model):
+
+        if rule.name:
+            l_model_rules.append('<record model="ir.rule" id="%s">' % _lower_replace(rule.name))
+            l_model_rules.append('<field name="name">%s</field>' % rule.name)
+
+        else:
+            l_model_rules.append('<record model="ir.rule" id="%s_rrule_%s">' % (
+                _get_model_data_name(export_context, rule.model_id), rule.id
+            ))
+
+        l_model_rules.append(
+            '<field name="model_id" ref="%s"/>' % _get_model_data_name(export_context, rule.model_id)
+        )
+
+        if rule.domain_force:
+            l_model_rules.append('<field name="domain_force">%s</field>' % rule.domain_force)
+
+        if not rule.active:
+            l_model_rules.append('<field name="active" eval="False" />')
+
+        if rule.groups:
+            l_model_rules.append(_get_m2m_groups(export_context, rule.groups))
+
+        if not rule.perm_read:
+            l_model_rules.append('<field name="perm_read" eval="False" />')
+
+        if not rule.perm_create:
+            l_model_rules.append('<field name="perm_create" eval="False" />')
+
+        if not rule.perm_write:
+            l_model_rules.append('<field name="perm_write" eval="False" />')
+
+        if not rule.perm_unlink:
+            l_model_rules.append('<field name="perm_unlink" eval="False" />')
+
+        l_model_rules.append('</record>\n')
+
+    return l_model_rules
+
+
+def _set_module_folders(module_name):
+    """
+    Function to set the module folders (paths inside the ZIP archive)
+    :param module_name:
+    :return:
+    """
+
+    module_path = module_name
+    data_path = '%s/%s' % (module_path, 'data')
+    models_path = '%s/%s' % (module_path, 'models')
+    security_path = '%s/%s' % (module_path, 'security')
+    views_path = '%s/%s' % (module_path, 'views')
+    wizards_path = '%s/%s' % (module_path, 'wizards')
+    reports_path = '%s/%s' % (module_path, 'reports')
+
+    return module_path, data_path, models_path, security_path, views_path, wizards_path, reports_path
+
+
+def _set_module_security(export_context, security_path, module, l_model_rules, l_model_csv_access):
+    """
+    Function to set the module security file
+    :param export_context:
+    :param security_path:
+    :param module:
+    :param l_model_rules:
+    :param l_model_csv_access:
+    :return:
+    """
+
+    l_security_files = []
+    security_file = None
+    if module.o2m_groups or l_model_rules:
+        l_module_security = ['<data>\n']
+
+        for group in module.o2m_groups:
+
+            l_module_security += ['<record model="res.groups" id="%s">' % _get_group_data_name(export_context, group)]
+            l_module_security += ['<field name="name">%s</field>' % group.name]
+
+            if group.comment:
+                l_module_security += ['<field name="comment">%s</field>' % group.comment]
+
+            if group.implied_ids:
+                l_module_security += [
+                    '<field name="implied_ids" eval="[%s]"/>' % ', '.join(
+                        group.implied_ids.mapped(lambda g: '(4, ref(\'%s\'))' % _get_group_data_name(export_context, g))
+                    )
+                ]
+
+            l_module_security += ['</record>\n']
+
+        l_module_security += l_model_rules
+
+        l_module_security += ['</data>']
+
+        module_name = module.name.lower().strip()
+        security_file_path = '%s/%s.xml' % (security_path, module_name)
+        security_file = security_file_path, _jinjarender(XML_HEAD + l_module_security + XML_ODOO_CLOSING_TAG)
+
+        l_security_files.append('security/%s.xml' % module_name)
+
+    model_access_file_path = '%s/ir.model.access.csv' % security_path
+    model_access_file = model_access_file_path, _jinjarender(l_model_csv_access)
+
+    l_security_files.append('security/ir.model.access.csv')
+
+    return security_file, model_access_file, l_security_files
+
+
+def _set_model_py_file(export_context, model, model_model, wizards_path, models_path, reports_path):
+    """
+    Function to set the model files
+    :param export_context:
+    :param model:
+    :param model_model:
+    :param wizards_path:
+    :param models_path:
+    :param reports_path:
+    :return:
+    """
+
+    l_model = MODEL_HEAD
+
+    l_model = l_model[:4:]
+
+    if model.m2o_inherit_py_class.name and model.m2o_inherit_py_class.module:
+        l_model += \
+            ['from %s import %s' % (model.m2o_inherit_py_class.module, model.m2o_inherit_py_class.name)] + BREAK_LINE
+
+    l_model += ['class %s(%s):' % (_get_class_name(model.model), _get_python_class_4inherit(model))]
+
+    if model.m2o_inherit_model.model:
+        l_model += ['%s_inherit = \'%s\'' % (TAB4, model.m2o_inherit_model.model)]
+
+    l_model += ['%s_name = \'%s\'' % (TAB4, model.model)]
+    l_model += ['%s_description = \'%s\'' % (TAB4, model.name)]
+
+    l_model += _get_model_fields(export_context, model)
+
+    l_model += _get_model_constrains(model)
+
+    pypath = models_path
+    if model.transient:
+        pypath = wizards_path
+
+    elif model.o2m_reports and model.env[model.model]._abstract:
+        pypath = reports_path
+
+    model_file_path = '%s/%s.py' % (pypath, model_model)
+
+    return model_file_path, _jinjarender(l_model)
+
+
+def _set_model_xmlview_file(export_context, model, model_model, wizards_path, views_path):
+    """
+    Function to set the model xml files
+    :param export_context:
+    :param model:
+    :param model_model:
+    :param wizards_path:
+    :param views_path:
+    :return:
+    """
+
+    views = export_context.get_views(model)
+    act_windows = export_context.get_act_windows(model)
+
+    if views or act_windows or model.o2m_server_action:
+
+        l_model_view_file = XML_HEAD + BLANCK_LINE
+
+        #
+        # Views
+        #
+        for view in views:
+
+            view_type = view.type
+
+            l_model_view_file.append('<record model="ir.ui.view" id="%s_%sview">' % (model_model, view_type))
+
+            if view.name:
+                l_model_view_file.append('<field name="name">%s</field>' % view.name)
+
+            l_model_view_file.append('<field name="model">%s</field>' % view.model)
+
+            if view.key:
+                l_model_view_file.append('<field name="key">%s</field>' % view.key)
+
+            if view.priority != 16:
+                l_model_view_file.append('<field name="priority">%s</field>' % view.priority)
+
+            if view.inherit_id:
+                l_model_view_file.append(
+                    '<field name="inherit_id" ref="%s"/>' % _get_view_data_name(export_context, view)
+                )
+
+                if view.mode == 'primary':
+                    l_model_view_file.append('<field name="mode">primary</field>')
+
+            if not view.active:
+                l_model_view_file.append('<field name="active" eval="False" />')
+
+            if view.arch_db:
+                l_model_view_file.append('<field name="arch" type="xml">%s</field>' % view.arch_db)
+
+            if view.group_ids:
+                l_model_view_file.append(_get_m2m_groups(export_context, view.group_ids))
+
+            l_model_view_file.append('</record>\n')
+
+        #
+        # Action Windows
+        #
+        for act_window in act_windows:
+
+            l_model_view_file.append(
+                '<record model="ir.actions.act_window" id="%s">' % _get_action_data_name(
+                    export_context, act_window, creating=True
+                )
+            )
+
+            if act_window.name:
+                l_model_view_file.append('<field name="name">%s</field>' % act_window.name)
+
+            if act_window.res_model or act_window.m2o_res_model:
+                l_model_view_file.append(
+                    '<field name="res_model">%s</field>' % act_window.res_model or act_window.m2o_res_model.model
+                )
+
+            if act_window.binding_model_id:
+                l_model_view_file.append(
+                    '<field name="binding_model_id" ref="%s" />' % _get_model_data_name(
+                        export_context, act_window.binding_model_id
+                    )
+                )
+
+            if act_window.view_id:
+                l_model_view_file.append(
+                    '<field name="view_id" ref="%s" />' % _get_view_data_name(export_context, act_window.view_id)
+                )
+
+            if act_window.domain != '[]':
+                l_model_view_file.append('<field name="domain">%s</field>' % act_window.domain)
+
+            if act_window.context != '{}':
+                l_model_view_file.append('<field name="context">%s</field>' % act_window.context)
+
+            if act_window.src_model or act_window.m2o_src_model:
+                l_model_view_file.append(
+                    '<field name="src_model">%s</field>' % act_window.src_model or act_window.m2o_src_model.model
+                )
+
+            if act_window.target != 'current':
+                l_model_view_file.append('<field name="target">%s</field>' % act_window.target)
+
+            if act_window.view_mode != 'tree,form':
+                l_model_view_file.append('<field name="view_mode">%s</field>' % act_window.view_mode)
+
+            if act_window.view_type != 'form':
+                l_model_view_file.append('<field name="view_type">%s</field>' % act_window.view_type)
+
+            if act_window.usage:
+                l_model_view_file.append('<field name="usage" eval="True" />')
+
+            if act_window.limit != 80:
+                l_model_view_file.append('<field name="limit">%s</field>' % act_window.limit)
+
+            if act_window.search_view_id:
+                l_model_view_file.append(
+                    '<field name="search_view_id" ref="%s" />' % _get_view_data_name(
+                        export_context, act_window.search_view_id
+                    )
+                )
+
+            if act_window.filter:
+                l_model_view_file.append('<field name="filter" eval="True" />')
+
+            if not act_window.auto_search:
+                l_model_view_file.append('<field name="auto_search" eval="False" />')
+
+            if act_window.multi:
+                l_model_view_file.append('<field name="multi" eval="True" />')
+
+            if act_window.help:
+                l_model_view_file.append('<field name="name" type="html">%s</field>' % act_window.help)
+
+            if act_window.group_ids:
+                l_model_view_file.append(_get_m2m_groups(export_context, act_window.group_ids))
+
+            l_model_view_file.append('</record>\n')
+
+        #
+        # Server Actions
+        #
+        for server_action in model.o2m_server_action:
+
+            l_model_view_file.append('<record model="ir.actions.server" id="%s">' % _get_action_data_name(
+                export_context, server_action, server=True, creating=True
+            ))
+
+            l_model_view_file.append('<field name="name">%s</field>' % server_action.name)
+
+            l_model_view_file.append(
+                '<field name="model_id" ref="%s" />' % _get_model_data_name(export_context, server_action.model_id)
+            )
+
+            l_model_view_file.append(
+                '<field name="binding_model_id" ref="%s" />' % _get_model_data_name(export_context, model)
+            )
+
+            if server_action.state == 'code':
+
+                l_model_view_file.append('<field name="state">code</field>')
+
+                l_model_view_file.append('<field name="code">\n%s</field>' % server_action.code)
+
+            else:
+                l_model_view_file.append('<field name="state">multi</field>')
+
+                if server_action.child_ids:
+                    l_model_view_file.append(
+                        '<field name="child_ids" eval="[(6,0, [%s])]" />' % ', '.join(
+                            server_action.child_ids.mapped(lambda child: 'ref(%s)' % _get_action_data_name(
+                                export_context, child, server=True
+                            ))
+                        )
+                    )
+
+            l_model_view_file.append('</record>\n')
+
+        l_model_view_file += XML_ODOO_CLOSING_TAG
+
+        # Determine folder based on model type
+        folder = 'wizards' if model.transient else 'views'
+        folder_path = wizards_path if model.transient else views_path
+
+        xml_file_path = '%s/%s.xml' % (folder_path, model_model)
+
+        return (xml_file_path, _jinjarender(l_model_view_file)), ['%s/%s.xml' % (folder, model_model)]
+
+    else:
+        return None, []
+
+
+def _set_model_xmlreport_file(export_context, model, model_model, reports_path):
+    """
+
+    :param export_context:
+    :param model:
+    :param model_model:
+    :param reports_path:
+    :return:
+    """
+
+    if model.o2m_reports:
+
+        l_model_report_file = XML_HEAD + BLANCK_LINE
+
+        for report in model.o2m_reports:
+
+            l_model_report_file.append('<template id="%s">' % report.report_name)
+
+            l_model_report_file.append('<field name="arch" type="xml">%s</field>' % report.m2o_template.arch_db)
+
+            l_model_report_file.append('</template>\n')
+
+            l_model_report_file.append('<record model="ir.actions.report" id="%s_actionreport">' % report.report_name)
+
+            l_model_report_file.append('<field name="model">%s</field>' % report.model)
+
+            l_model_report_file.append('<field name="name">%s</field>' % report.report_name)
+
+            l_model_report_file.append('<field name="file">%s</field>' % report.report_name)
+
+            l_model_report_file.append('<field name="string">%s</field>' % report.name)
+
+            l_model_report_file.append('<field name="report_type">%s</field>' % report.report_type)
+
+            if report.print_report_name:
+                l_model_report_file.append('<field name="print_report_name">%s</field>' % report.print_report_name)
+
+            if report.multi:
+                l_model_report_file.append('<field name="multi">%s</field>' % report.multi)
+
+            if report.attachment_use:
+                l_model_report_file.append('<field name="attachment_use">%s</field>' % report.attachment_use)
+
+            if report.attachment:
+                l_model_report_file.append('<field name="attachment">%s</field>' % report.attachment)
+
+            if report.binding_model_id:
+                l_model_report_file.append(
+                    '<field name="binding_model_id" ref="%s" />' % _get_model_data_name(
+                        export_context, report.binding_model_id
+                    )
+                )
+
+            if report.group_ids:
+                l_model_report_file.append(_get_m2m_groups(export_context, report.group_ids))
+
+            l_model_report_file.append('</record>')
+
+            l_model_report_file += XML_ODOO_CLOSING_TAG
+
+        xmlreport_file_path = '%s/%s.xml' % (reports_path, model_model)
+
+        return (xmlreport_file_path, _jinjarender(l_model_report_file)), ['reports/%s.xml' % model_model]
+
+    else:
+        return None, []
+
+
+def _get_from_rec_name(record, model):
+    """
+    Util function to handle the _rec_name / rec_name access
+    :param record:
+    :param model:
+    :return:
+    """
+
+    return getattr(record, model._rec_name) if getattr(record, model._rec_name) else getattr(record, model.rec_name)
+
+
+def _set_model_xmldata_file(export_context, model, model_model, data_path):
+    """
+    Function to set the module data file
+    :param export_context:
+    :param model:
+    :param model_model:
+    :param data_path:
+    :return:
+    """
+
+    nomenclador_data = model.env[model.model].sudo().search([])
+    if nomenclador_data:
+
+        l_model_data_file = XML_HEAD + BLANCK_LINE
+
+        f2exports = model.field_id.filtered(lambda field: field.name not in MAGIC_FIELDS)
+        for rfield in f2exports.filtered(lambda field: field.ttype in ['many2one', 'one2many', 'many2many']):
+            export_context.preload_xmlids(nomenclador_data.mapped(rfield.name))
+
+        for record in nomenclador_data:
+
+            l_model_data_file.append('<record model="%s" id="%s">' % (
+                model.model, _set_limit_4xmlid('%s_%s' % (
+                    model_model,
+                    _lower_replace(_get_from_rec_name(record, model)) if _get_from_rec_name(record, model)
+                    else uuid.uuid1().int
+                ))
+            ))
+
+            for rfield in f2exports:
+
+                record_value = getattr(record, rfield.name)
+                if record_value:
+
+                    if rfield.ttype == 'many2one':
+                        l_model_data_file.append(
+                            '<field name="%s" ref="%s" />' % (
+                                rfield.name, _get_ir_model_data(export_context, record_value, give_a_default=True)
+                            )
+                        )
+
+                    elif rfield.ttype == 'one2many':
+                        l_model_data_file.append(
+                            '<field name="%s" eval="[%s]"/>' % (rfield.name, ', '.join(
+                                record_value.mapped(lambda rvalue: '(4, ref(\'%s\'))' % _get_ir_model_data(
+                                    export_context, rvalue, give_a_default=True
+                                ))
+                            ))
+                        )
+
+                    elif rfield.ttype == 'many2many':
+                        l_model_data_file.append(
+                            '<field name="%s" eval="[(6,0, [%s])]" />' % (rfield.name, ', '.join(
+                                record_value.mapped(lambda rvalue: 'ref(%s)' % _get_ir_model_data(
+                                    export_context, rvalue, give_a_default=True
+                                ))
+                            ))
+                        )
+
+                    else:
+                        l_model_data_file.append('<field name="%s">%s</field>' % (rfield.name, record_value))
+
+            l_model_data_file.append('</record>\n')
+
+        l_model_data_file += XML_ODOO_CLOSING_TAG
+
+        data_file_path = '%s/%s.xml' % (data_path, model_model)
+
+        return (data_file_path, _jinjarender(l_model_data_file)), ['data/%s.xml' % model_model]
+
+    else:
+        return None, []
+
+
+def _set_module_menues(export_context, module, views_path):
+    """
+    Function to set the module menues file
+    :param export_context:
+    :param module:
+    :param views_path:
+    :return:
+    """
+
+    menues = module.with_context({'ir.ui.menu.full_list': True}).o2m_menus
+    if menues:
+
+        l_module_menues_file = XML_HEAD + BLANCK_LINE
+
+        for menu in menues:
+
+            l_module_menues_file.append(
+                '<record model="ir.ui.menu" id="%s">' % _get_menu_data_name(export_context, menu)
+            )
+
+            l_module_menues_file.append('<field name="name">%s</field>' % menu.name)
+
+            if menu.action:
+                l_module_menues_file.append(
+                    '<field name="action" ref="%s" />' % _get_action_data_name(export_context, menu.action)
+                )
+
+            if not menu.active:
+                l_module_menues_file.append('<field name="active" eval="False" />')
+
+            if menu.sequence != 10:
+                l_module_menues_file.append('<field name="sequence">%s</field>' % menu.sequence)
+
+            if menu.parent_id:
+                l_module_menues_file.append(
+                    '<field name="parent_id" ref="%s" />' % _get_menu_data_name(export_context, menu.parent_id)
+                )
+
+            if menu.group_ids:
+                l_module_menues_file.append(_get_m2m_groups(export_context, menu.group_ids))
+
+            l_module_menues_file.append('</record>\n')
+
+        l_module_menues_file += XML_ODOO_CLOSING_TAG
+
+        menu_file_path = '%s/menues.xml' % views_path
+
+        return (menu_file_path, _jinjarender(l_module_menues_file)), ['views/menues.xml']
+
+    else:
+        return None, []
+
+
+def _set_manifest_file(module, module_path, l_manifest_data_files):
+    """
+    Function to set the module manifest file
+    :param module:
+    :param module_path:
+    :param l_manifest_data_files:
+    :return:
+    """
+
+    l_manifest_file = ['{', '%s\'name\': \'%s\',' % (TAB4, module.shortdesc)]
+
+    if module.category_id:
+        l_manifest_file.append('%s\'category\': \'%s\',' % (TAB4, module.category_id.name))
+
+    if module.summary and module.summary != 'false':
+        l_manifest_file.append('%s\'summary\': \'%s\',' % (TAB4, module.summary))
+
+    if module.description:
+        # Use triple quotes for multi-line descriptions
+        l_manifest_file.append('%s\'description\': """%s""",' % (TAB4, module.description))
+
+    if module.author:
+        l_manifest_file.append('%s\'author\': \'%s\',' % (TAB4, module.author))
+
+    if module.website:
+        l_manifest_file.append('%s\'website\': \'%s\',' % (TAB4, module.website))
+
+    if module.auto_install:
+        l_manifest_file.append('%s\'auto_install\': %s,' % (TAB4, True))
+
+    if module.demo:
+        l_manifest_file.append('%s\'demo\': %s,' % (TAB4, True))
+
+    if module.license != 'LGPL-3':
+        l_manifest_file.append('%s\'license\': \'%s\',' % (TAB4, module.license))
+
+    if module.application:
+        l_manifest_file.append('%s\'application\': %s,' % (TAB4, True))
+
+    if module.dependencies_id:
+        l_manifest_file.append('%s\'depends\': [\n%s\n],' % (
+            TAB4, ', \n'.join(module.dependencies_id.mapped(lambda did: '\'%s\'' % did.depend_id.name))
+        ))
+
+    l_manifest_file.append('%s\'data\': [\n%s\n%s],' % (
+        TAB4, ', \n'.join(_get_l_map(lambda dfile: '%s\'%s\'' % (TAB8, dfile), l_manifest_data_files)), TAB4
+    ))
+
+    l_manifest_file.append('%s\'installable\': %s,' % (TAB4, True))
+
+    l_manifest_file.append('}')
+
+    manifest_file_path = '%s/__manifest__.py' % module_path
+
+    return manifest_file_path, _jinjarender(BLANCK_HEAD + l_manifest_file + BREAK_LINE)
+
+
+def _get_module_files(export_context, module, s_data2export):
+    """
+    Function to obtain the files of a module, as (file_path, content) tuples
+    :param export_context:
+    :param module:
+    :param s_data2export:
+    :return:
+    """
+
+    module_path, data_path, models_path, security_path, views_path, wizards_path, reports_path = \
+        _set_module_folders(module.name.lower().strip())
+
+    models_init_imports = []
+    wizards_init_imports = []
+
+    l_model_csv_access = ['id,name,model_id:id,group_id:id,perm_read,perm_write,perm_create,perm_unlink']
+    l_model_rules = []
+
+    l_manifest_data_files = []
+
+    for model in module.o2m_models:
+
+        model_model = _get_model_model(model.model)
+
+        yield export_context.get_cached_file(model, 'py', lambda: _set_model_py_file(
+            export_context, model, model_model, wizards_path, models_path, reports_path
+        ))
+
+        xml_file = export_context.get_cached_file(model, 'xmlview', lambda: _set_model_xmlview_file(
+            export_context, model, model_model, wizards_path, views_path
+        )[0])
+
+        if xml_file:
+            l_manifest_data_files.append(xml_file[0].split('/', 1)[1])
+            yield xml_file
+
+        xmlreport_file, l_manifest_data_file = \
+            _set_model_xmlreport_file(export_context, model, model_model, reports_path)
+
+        l_manifest_data_files += l_manifest_data_file
+        if xmlreport_file:
+            yield xmlreport_file
+
+        if s_data2export != 'nomenclator' or (s_data2export == 'nomenclator' and model.nomenclator):
+            data_file, l_manifest_data_file = _set_model_xmldata_file(export_context, model, model_model, data_path)
+
+            l_manifest_data_files += l_manifest_data_file
+            if data_file:
+                yield data_file
+
+        if model.transient:
+            wizards_init_imports.append('from . import %s' % model_model)
+
+        else:
+            models_init_imports.append('from . import %s' % model_model)
+
+        l_model_csv_access += _get_model_access(export_context, model)
+
+        l_model_rules += _get_model_rules(export_context, model)
+
+    menu_file, l_manifest_data_file = _set_module_menues(export_context, module, views_path)
+
+    l_manifest_data_files += l_manifest_data_file
+    if menu_file:
+        yield menu_file
+
+    yield '%s/__init__.py' % models_path, _jinjarender(BLANCK_HEAD + models_init_imports + BREAK_LINE)
+
+    yield '%s/__init__.py' % wizards_path, _jinjarender(BLANCK_HEAD + wizards_init_imports + BREAK_LINE)
+
+    security_file, model_access_file, set_module_security_result = \
+        _set_module_security(export_context, security_path, module, l_model_rules, l_model_csv_access)
+    yield model_access_file
+    if security_file:
+        yield security_file
+
+    security_file_insert_pos = 0
+    for security_file in set_module_security_result:
+        l_manifest_data_files.insert(security_file_insert_pos, security_file)
+        security_file_insert_pos += 1
+
+    yield _set_manifest_file(module, module_path, l_manifest_data_files)
+
+    yield '%s/__init__.py' % module_path, _jinjarender(BLANCK_HEAD + ['from . import models, wizards'] + BREAK_LINE)
+
+
+def _render_module_files(registry, uid, context, module_id, s_data2export):
+    """
+    Function to render all the files of a module on its own cursor (worker pool task).
+    It returns the files and the export cache hits and misses.
+    :param registry:
+    :param uid:
+    :param context:
+    :param module_id:
+    :param s_data2export:
+    :return:
+    """
+
+    threading.current_thread().dbname = registry.db_name
+    threading.current_thread().uid = uid
+
+    with registry.cursor() as cr:
+        env = api.Environment(cr, uid, context)
+        module = env['itx.moduler.module'].browse(module_id)
+        export_context = CodeGeneratorExportContext(module)
+
+        module_files = list(_get_module_files(export_context, module, s_data2export))
+        export_context.flush_cache()
+
+        _logger.info('ITX Moduler export of module %s: %s queries, export cache %s hits / %s misses',
+                     module.name, export_context.query_count, export_context.cache_hits, export_context.cache_misses)
+
+        return module_files, export_context.cache_hits, export_context.cache_misses
+
+
+def _iter_rendered_modules(registry, uid, context, module_ids, s_data2export, workers):
+    """
+    Function to render the modules over a thread pool and get their results back in the module_ids order.
+    At most 2 * workers rendered modules are kept in memory waiting for the archive.
+    :param registry:
+    :param uid:
+    :param context:
+    :param module_ids:
+    :param s_data2export:
+    :param workers:
+    :return:
+    """
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='itx_moduler_export')
+    pending = collections.deque()
+
+    try:
+        for module_id in module_ids:
+            pending.append(executor.submit(
+                _render_module_files, registry, uid, context, module_id, s_data2export
+            ))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _get_export_workers(parameters, module_count):
+    """
+    Util function to get the number of export workers
+    :param parameters:
+    :param module_count:
+    :return:
+    """
+
+    workers = int(parameters.get_param('itx_moduler.export_workers', default=0) or 0)
+    if workers <= 0:
+        workers = min(os.cpu_count() or 1, EXPORT_MAX_WORKERS)
+
+    return max(1, min(workers, module_count))
+
+
+def _get_export_cache_comment(cache_hits, cache_misses):
+    """
+    Util function to get the ZIP comment reporting the export cache usage
+    :param cache_hits:
+    :param cache_misses:
+    :return:
+    """
+
+    return ('ITX Moduler export cache: %s hits, %s misses' % (cache_hits, cache_misses)).encode()
+
+
+def _stream_modules_zip(registry, uid, context, module_ids):
+    """
+    Function to generate the modules and stream them as ZIP chunks.
+    It runs after the request cursor is closed, so it works on its own cursor(s): a single module is generated
+    in place, several modules are rendered in parallel (one cursor per worker) and merged in the requested order.
+    The export cache hits and misses are reported in the ZIP comment.
+    :param registry:
+    :param uid:
+    :param context:
+    :param module_ids:
+    :return:
+    """
+
+    zipy = CodeGeneratorZipFile()
+
+    with registry.cursor() as cr:
+        env = api.Environment(cr, uid, context)
+        parameters = env['ir.config_parameter'].sudo()
+
+        s_data2export = parameters.get_param('itx_creator.s_data2export', default='nomenclator')
+        workers = _get_export_workers(parameters, len(module_ids))
+
+        if workers == 1:
+            modules = env['itx.moduler.module'].browse(module_ids)
+            export_context = CodeGeneratorExportContext(modules)
+
+            for module in modules:
+                for file_path, content in _get_module_files(export_context, module, s_data2export):
+                    yield from zipy.writestr_chunks(file_path, content)
+
+            export_context.flush_cache()
+
+            zipy.comment = _get_export_cache_comment(export_context.cache_hits, export_context.cache_misses)
+            yield from zipy.close_chunks()
+
+            _logger.info('ITX Moduler export of %s module(s): %s queries, export cache %s hits / %s misses',
+                         len(modules), export_context.query_count, export_context.cache_hits,
+                         export_context.cache_misses)
+            return
+
+    cache_hits = cache_misses = 0
+    for module_files, module_cache_hits, module_cache_misses in _iter_rendered_modules(
+            registry, uid, context, module_ids, s_data2export, workers):
+        for file_path, content in module_files:
+            yield from zipy.writestr_chunks(file_path, content)
+
+        cache_hits += module_cache_hits
+        cache_misses += module_cache_misses
+
+    zipy.comment = _get_export_cache_comment(cache_hits, cache_misses)
+    yield from zipy.close_chunks()
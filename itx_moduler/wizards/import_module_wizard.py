@@ -32,3 +32,8 @@ class ImportModuleWizard(models.TransientModel):
             'domain': [('id', 'in', loaded_modules.ids)],
             'context': {'create': True},
         }
+
+    def action_enqueue_import_modules(self):
+        """Load selected modules into itx.moduler.module workspace in a background job"""
+        job = self.env['itx.moduler.job']._enqueue('import', source_modules=self.module_ids)
+        return job.action_open()
@@ -16,14 +16,14 @@ def pre_init_hook(env):
     _logger.info("ITX Security Shield: Starting pre-installation checks...")
 
     try:
-        from .lib import ITXSecurityVerifier
+        from .lib import get_verifier, get_fingerprint
 
         # Test library loading
-        verifier = ITXSecurityVerifier()
+        get_verifier()
         _logger.info("✓ Native C library loaded successfully")
 
         # Test hardware detection
-        fingerprint = verifier.get_fingerprint()
+        fingerprint = get_fingerprint()
         _logger.info(f"✓ Hardware fingerprint: {fingerprint[:16]}...")
 
         _logger.info("ITX Security Shield: Pre-installation checks passed")
@@ -41,10 +41,9 @@ def post_init_hook(env):
     _logger.info("ITX Security Shield: Post-installation setup...")
 
     try:
-        from .lib import ITXSecurityVerifier
+        from .lib import get_hardware_info, get_fingerprint
 
-        verifier = ITXSecurityVerifier()
-        hw_info = verifier.get_hardware_info()
+        hw_info = get_hardware_info()
 
         _logger.info("=" * 60)
         _logger.info("ITX Security Shield - Hardware Information")
@@ -58,7 +57,7 @@ def post_init_hook(env):
         _logger.info(f"Docker:        {'YES' if hw_info['is_docker'] else 'NO'}")
         _logger.info(f"VM:            {'YES' if hw_info['is_vm'] else 'NO'}")
         _logger.info(f"Debugger:      {'DETECTED!' if hw_info['debugger_detected'] else 'None'}")
-        _logger.info(f"Fingerprint:   {verifier.get_fingerprint()}")
+        _logger.info(f"Fingerprint:   {get_fingerprint()}")
         _logger.info("=" * 60)
 
         _logger.info("✓ ITX Security Shield installed successfully")
@@ -51,6 +51,8 @@ Security:
     'data': [
         # Security
         'security/ir.model.access.csv',
+        # Data
+        'data/license_cron.xml',
         # Views (must load views with actions BEFORE menus that reference them)
         'views/license_check_views.xml',      # Contains action_license_check
         'views/license_log_views.xml',        # Contains action_license_log, action_license_violations
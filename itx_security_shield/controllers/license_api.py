@@ -30,7 +30,35 @@ class LicenseAPIController(http.Controller):
     # PUBLIC ENDPOINTS (require authentication)
     # ========================================================================
 
-    @http.route('/license/status', type='json', auth='user', methods=['GET', 'POST'])
+    @http.route('/license/status', type='http', auth='user', methods=['GET'])
+    def get_license_status_http(self, **kwargs):
+        """
+        Get current license status (plain HTTP, for polling)
+
+        Same JSON body as the JSON-RPC endpoint below, with an ETag: pollers
+        sending it back in If-None-Match get an empty 304 until the status
+        changes. Served from the per-worker status snapshot cache.
+
+        Example:
+            curl http://localhost:8069/license/status \\
+                -H 'If-None-Match: "<etag of the previous response>"'
+        """
+        try:
+            etag, body = request.env['license.config'].sudo().get_status_snapshot()
+        except Exception as e:
+            _logger.exception(f"Error getting license status: {e}")
+            return request.make_json_response(self._license_status_error(e), status=500)
+
+        headers = [
+            ('ETag', f'"{etag}"'),
+            ('Cache-Control', 'private, no-cache'),
+        ]
+        if request.httprequest.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+
+        return Response(body, headers=headers + [('Content-Type', 'application/json')])
+
+    @http.route('/license/status', type='json', auth='user', methods=['POST'])
     def get_license_status(self, **kwargs):
         """
         Get current license status
@@ -43,6 +71,9 @@ class LicenseAPIController(http.Controller):
         - grace_period (bool): Whether grace period is active
         - last_check (str): When license was last validated
 
+        The status is a snapshot refreshed by every validation and
+        configuration change, cached per worker: polling only reads its ETag.
+
         Example:
             curl -X POST http://localhost:8069/license/status \\
                 -H "Content-Type: application/json" \\
@@ -59,55 +90,24 @@ class LicenseAPIController(http.Controller):
             }
         """
         try:
-            # Get configuration
-            config = request.env['license.config'].sudo().get_config()
-
-            # Get most recent check
-            recent_check = request.env['license.check'].sudo().search(
-                [],
-                order='check_date desc',
-                limit=1
-            )
-
-            if not recent_check:
-                return {
-                    'valid': False,
-                    'status': 'no_checks',
-                    'message': 'No license validations have been performed yet',
-                    'expiry_days': 0,
-                    'grace_period': False,
-                    'last_check': None,
-                }
-
-            # Check if grace period is active
-            grace_active = config.grace_period_active and config.check_grace_period_expired()
-
-            # Check if emergency unlock is active
-            emergency_unlock = config.emergency_unlock_enabled and config.check_emergency_unlock_expired()
-
-            response = {
-                'valid': recent_check.status == 'valid' or grace_active or emergency_unlock,
-                'status': recent_check.status,
-                'message': recent_check.validation_message or 'No validation message',
-                'expiry_days': recent_check.days_until_expiry,
-                'grace_period': grace_active,
-                'emergency_unlock': emergency_unlock,
-                'last_check': recent_check.check_date.strftime('%Y-%m-%d %H:%M:%S') if recent_check.check_date else None,
-            }
-
-            _logger.info(f"License status request: {response['status']}")
-            return response
+            _etag, body = request.env['license.config'].sudo().get_status_snapshot()
+            return json.loads(body)
 
         except Exception as e:
             _logger.exception(f"Error getting license status: {e}")
-            return {
-                'valid': False,
-                'status': 'error',
-                'message': f'Error retrieving license status: {str(e)}',
-                'expiry_days': 0,
-                'grace_period': False,
-                'last_check': None,
-            }
+            return self._license_status_error(e)
+
+    @staticmethod
+    def _license_status_error(error):
+        """Status response of a failed status request"""
+        return {
+            'valid': False,
+            'status': 'error',
+            'message': f'Error retrieving license status: {str(error)}',
+            'expiry_days': 0,
+            'grace_period': False,
+            'last_check': None,
+        }
 
     @http.route('/license/info', type='json', auth='user', methods=['GET', 'POST'])
     def get_license_info(self, **kwargs):
@@ -226,17 +226,14 @@ class LicenseAPIController(http.Controller):
         """
         try:
             # Import wrapper
-            from ..lib import ITXSecurityVerifier
+            from ..lib import get_hardware_info, get_fingerprint
             from ..lib.exceptions import ITXSecurityError
 
-            # Initialize verifier
-            verifier = ITXSecurityVerifier(debug=False)
-
-            # Get hardware info
-            hw_info = verifier.get_hardware_info()
+            # Get hardware info (TTL-cached in the process)
+            hw_info = get_hardware_info()
 
             # Get fingerprint
-            fingerprint = verifier.get_fingerprint()
+            fingerprint = get_fingerprint()
             hw_info['fingerprint'] = fingerprint
 
             _logger.info("Hardware info request completed")
@@ -383,6 +380,15 @@ class LicenseAPIController(http.Controller):
                     "hardware_mismatch": 2,
                     "file_tampered": 3
                 },
+                "checks_by_status": {
+                    "valid": 115,
+                    "invalid": 5
+                },
+                "series": [
+                    {"day": "2025-01-01", "checks": 4, "violations": 1,
+                     "by_type": {"file_tampered": 1}},
+                    ...
+                ],
                 "config": {
                     "periodic_checks": true,
                     "check_interval": 6,
@@ -394,22 +400,16 @@ class LicenseAPIController(http.Controller):
             # Get configuration
             config = request.env['license.config'].sudo().get_config()
 
-            # Get violation summary
-            summary = request.env['license.log'].sudo().get_violation_summary(days=days)
-
-            # Get total checks in period
-            from datetime import timedelta
-            cutoff_date = datetime.now() - timedelta(days=days)
-
-            total_checks = request.env['license.check'].sudo().search_count([
-                ('check_date', '>=', cutoff_date)
-            ])
+            # Checks and violations per day and type (daily rollups)
+            statistics = request.env['license.stat.daily'].sudo().get_statistics(days=days)
 
             return {
                 'period_days': days,
-                'total_checks': total_checks,
-                'total_violations': summary['total_violations'],
-                'by_type': summary['by_type'],
+                'total_checks': statistics['total_checks'],
+                'total_violations': statistics['total_violations'],
+                'by_type': statistics['by_type'],
+                'checks_by_status': statistics['checks_by_status'],
+                'series': statistics['series'],
                 'config': {
                     'periodic_checks': config.periodic_check_enabled,
                     'check_interval': config.periodic_check_interval,
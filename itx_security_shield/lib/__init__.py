@@ -8,8 +8,10 @@ error handling and exception management.
 from .verifier import (
     ITXSecurityVerifier,
     HardwareInfo,
+    get_verifier,
     get_hardware_info,
     get_fingerprint,
+    clear_hardware_cache,
 )
 from .exceptions import (
     ITXSecurityError,
@@ -24,8 +26,10 @@ __version__ = '1.0.0'
 __all__ = [
     'ITXSecurityVerifier',
     'HardwareInfo',
+    'get_verifier',
     'get_hardware_info',
     'get_fingerprint',
+    'clear_hardware_cache',
     'ITXSecurityError',
     'LibraryError',
     'HardwareDetectionError',
@@ -7,8 +7,10 @@ with comprehensive error handling and exception management.
 
 import os
 import sys
+import time
 import ctypes
 import platform
+import threading
 from pathlib import Path
 from typing import Dict, Optional, Any
 
@@ -413,6 +415,71 @@ class ITXSecurityVerifier:
         return f"ITXSecurityVerifier(library_path='{self._library_path}', debug={self.debug})"
 
 
+# ============================================================================
+# Shared Hardware Identity
+# ============================================================================
+
+# Seconds a probed hardware identity is reused (0 = probe on every call)
+HARDWARE_CACHE_TTL = int(os.environ.get('ITX_HW_CACHE_TTL', '300'))
+
+_verifier = None
+_identity = {}  # {'hardware'|'fingerprint': (expires_at, value)}, process memory only
+_identity_lock = threading.Lock()
+
+
+def get_verifier() -> ITXSecurityVerifier:
+    """
+    Get the process-wide verifier (libintegrity.so is loaded once per process).
+
+    Returns:
+        ITXSecurityVerifier instance
+
+    Raises:
+        LibraryError: If the C library cannot be loaded
+        PlatformError: If running on an unsupported platform
+    """
+    global _verifier
+    with _identity_lock:
+        if _verifier is None:
+            _verifier = ITXSecurityVerifier(debug=False)
+        return _verifier
+
+
+def _get_identity(key: str, probe):
+    """
+    Return a hardware identity value from the process cache, and only probe
+    the hardware when it is stale.
+
+    The cache is never persisted: a value that other local processes could
+    edit must not feed the license enforcement.
+    """
+    now = time.monotonic()
+    with _identity_lock:
+        cached = _identity.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+    value = probe()
+
+    with _identity_lock:
+        _identity[key] = (now + HARDWARE_CACHE_TTL, value)
+
+    return value
+
+
+def _probe_hardware_identity() -> Dict[str, Any]:
+    """Hardware info without the debugger state (which is never cached)."""
+    hardware = get_verifier().get_hardware_info()
+    hardware.pop('debugger_detected', None)
+    return hardware
+
+
+def clear_hardware_cache():
+    """Forget the cached hardware identity of this process."""
+    with _identity_lock:
+        _identity.clear()
+
+
 # ============================================================================
 # Convenience Functions (for easy imports)
 # ============================================================================
@@ -421,8 +488,11 @@ def get_hardware_info(debug: bool = False) -> Dict[str, Any]:
     """
     Convenience function to get hardware info without creating verifier instance.
 
+    The result is cached in the process for HARDWARE_CACHE_TTL seconds,
+    unless debug is enabled. debugger_detected is always probed live.
+
     Args:
-        debug: Enable debug logging
+        debug: Enable debug logging (always probes the hardware)
 
     Returns:
         Dictionary with hardware information
@@ -432,16 +502,23 @@ def get_hardware_info(debug: bool = False) -> Dict[str, Any]:
         >>> hw_info = get_hardware_info()
         >>> print(hw_info['fingerprint'])
     """
-    verifier = ITXSecurityVerifier(debug=debug)
-    return verifier.get_hardware_info()
+    if debug:
+        return ITXSecurityVerifier(debug=True).get_hardware_info()
+
+    hw_info = dict(_get_identity('hardware', _probe_hardware_identity))
+    hw_info['debugger_detected'] = get_verifier().is_debugger_attached()
+    return hw_info
 
 
 def get_fingerprint(debug: bool = False) -> str:
     """
     Convenience function to get hardware fingerprint.
 
+    The result is cached in the process for HARDWARE_CACHE_TTL seconds,
+    unless debug is enabled.
+
     Args:
-        debug: Enable debug logging
+        debug: Enable debug logging (always probes the hardware)
 
     Returns:
         Hardware fingerprint (64-char hex string)
@@ -450,5 +527,7 @@ def get_fingerprint(debug: bool = False) -> str:
         >>> from odoo.addons.itx_security_shield.lib.verifier import get_fingerprint
         >>> fingerprint = get_fingerprint()
     """
-    verifier = ITXSecurityVerifier(debug=debug)
-    return verifier.get_fingerprint()
+    if debug:
+        return ITXSecurityVerifier(debug=True).get_fingerprint()
+
+    return _get_identity('fingerprint', lambda: get_verifier().get_fingerprint())
@@ -2,6 +2,8 @@
 
 from . import license_check
 from . import license_log
+from . import license_stat_daily
 from . import license_config
 from . import license_generator
+from . import license_batch_generator
 from . import license_generated
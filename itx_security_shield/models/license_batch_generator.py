@@ -0,0 +1,140 @@
+"""
+ITX Security Shield - Bulk License Generator
+
+Wizard issuing the licenses of a CSV/JSON batch file (renewals, new contracts)
+in one run.
+"""
+
+import base64
+import time
+from odoo import models, fields
+from odoo.exceptions import UserError
+from odoo.modules.module import get_module_path
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class LicenseBatchGenerator(models.TransientModel):
+    """Wizard for generating many license files from a batch file."""
+
+    _name = 'itxss.license.batch.generator'
+    _description = 'Bulk License Generator'
+
+    # ========================================================================
+    # Batch Input
+    # ========================================================================
+    batch_file = fields.Binary(
+        string='Batch File',
+        required=True,
+        help='CSV or JSON file of the licenses to issue (customers, instances, addons)'
+    )
+    batch_filename = fields.Char(string='Batch Filename')
+    issue_date = fields.Date(
+        string='Issue Date',
+        default=fields.Date.today,
+        required=True,
+        help='Issue date of every license of the batch'
+    )
+    include_file_hashes = fields.Boolean(
+        string='Include File Hashes',
+        default=False,
+        help='Store the SHA-256 of the licensed addons files (and of ITX Security Shield) '
+             'for the periodic file integrity checks'
+    )
+    max_workers = fields.Integer(
+        string='Worker Threads',
+        default=1,
+        help='Threads encrypting licenses in parallel (1 = no worker thread, at most 4). '
+             'Use issue_licenses.py for process-parallel issuance of large batches.'
+    )
+
+    # ========================================================================
+    # RSA Key Upload
+    # ========================================================================
+    private_key_file = fields.Binary(
+        string='Private Key File',
+        required=True,
+        help='Upload RSA private key (PEM format). This authorizes license creation.'
+    )
+    private_key_filename = fields.Char(string='Key Filename')
+    private_key_passphrase = fields.Char(
+        string='Key Passphrase',
+        help='Passphrase for encrypted private key (leave empty if not encrypted)'
+    )
+
+    # ========================================================================
+    # Actions
+    # ========================================================================
+    def action_generate_licenses(self):
+        """Issue every license of the batch file."""
+        self.ensure_one()
+
+        from ..tools.license_batch import (
+            parse_batch,
+            licensed_addon_names,
+            build_license_data,
+            issue_licenses,
+            license_filename,
+        )
+        from ..tools.file_integrity import hash_addons
+
+        start = time.monotonic()
+
+        try:
+            entries = parse_batch(base64.b64decode(self.batch_file), self.batch_filename or '')
+            if not entries:
+                raise UserError('The batch file contains no license!')
+
+            # Hash the addons licensed by any entry once for the whole batch
+            file_hashes = None
+            if self.include_file_hashes:
+                addon_paths = {name: get_module_path(name) for name in licensed_addon_names(entries)}
+                file_hashes = hash_addons({name: path for name, path in addon_paths.items() if path})
+
+            issue_date = self.issue_date.strftime('%Y-%m-%d')
+            licenses = [build_license_data(entry, issue_date, file_hashes) for entry in entries]
+
+            passphrase = self.private_key_passphrase.encode('utf-8') if self.private_key_passphrase else None
+            encrypted = issue_licenses(
+                licenses,
+                base64.b64decode(self.private_key_file),
+                passphrase,
+                max_workers=self.max_workers or 1,
+                use_processes=False,
+            )
+        except ValueError as e:
+            raise UserError(f'Bulk license generation failed: {e}')
+
+        # Store every license with a single create
+        generated = self.env['itxss.license.generated'].create([
+            {
+                'customer_name': license_data.customer_name,
+                'po_number': license_data.po_number,
+                'contract_number': license_data.contract_number,
+                'licensed_addons': ', '.join(license_data.licensed_addons),
+                'max_instances': license_data.max_instances,
+                'hardware_fingerprint': (
+                    license_data.registered_instances[0]['hardware_fingerprint']
+                    if license_data.registered_instances else ''
+                ),
+                'issue_date': license_data.issue_date,
+                'expiry_date': license_data.expiry_date,
+                'license_file': base64.b64encode(encrypted_data),
+                'license_filename': license_filename(license_data),
+                'file_size': len(encrypted_data),
+            }
+            for license_data, encrypted_data in zip(licenses, encrypted)
+        ])
+
+        elapsed = time.monotonic() - start
+        _logger.info(f"Bulk license generation: {len(generated)} licenses in {elapsed:.1f}s")
+
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Generated Licenses',
+            'res_model': 'itxss.license.generated',
+            'view_mode': 'list,form',
+            'domain': [('id', 'in', generated.ids)],
+            'target': 'current',
+        }
@@ -5,17 +5,17 @@ Core license checking logic with hardware binding
 """
 
 import os
-import hashlib
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError, UserError
+from odoo.modules.module import get_module_path
 
 # Import our Python wrapper
 try:
-    from ..lib import ITXSecurityVerifier
+    from ..lib import get_hardware_info, get_fingerprint
     from ..lib.exceptions import (
         ITXSecurityError,
         LibraryError,
@@ -25,7 +25,9 @@ try:
         PlatformError,
     )
     # Import license crypto tools
-    from ..tools.license_crypto import load_license_file
+    from ..tools.license_crypto import load_license_file_cached
+    from ..tools.file_integrity import get_integrity_index, hash_files, list_addon_files
+    from ..tools.file_manifest import MerkleManifest
 except ImportError as e:
     raise ImportError(f"Failed to import ITX Security Shield wrapper: {e}")
 
@@ -186,6 +188,12 @@ class LicenseCheck(models.Model):
             else:
                 record.days_until_expiry = 0
 
+    def unlink(self):
+        """Refresh the status snapshot, which may show a deleted check"""
+        res = super().unlink()
+        self.env['license.config'].get_config().refresh_status_snapshot()
+        return res
+
     def _generate_check_reference(self):
         """Generate unique check reference"""
         return f"CHK-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
@@ -236,6 +244,28 @@ class LicenseCheck(models.Model):
         })
         validation_result['check_id'] = check_record.id
 
+        validation_result = check_record._run_validation(check_type, validation_result)
+
+        # Publish the outcome to /license/status (failures raise and roll back)
+        self.env['license.config'].get_config().refresh_status_snapshot()
+        return validation_result
+
+    def _run_validation(self, check_type, validation_result):
+        """
+        Run the validation steps of verify_license on this check record
+
+        Args:
+            check_type (str): Type of check
+            validation_result (dict): Result to fill (see verify_license)
+
+        Returns:
+            dict: validation_result
+
+        Raises:
+            ValidationError: If license validation fails critically
+        """
+        check_record = self
+
         try:
             # Step 1: Check hardware fingerprint
             _logger.info("Step 1: Checking hardware fingerprint...")
@@ -362,11 +392,8 @@ class LicenseCheck(models.Model):
         _logger.info("Checking hardware fingerprint against license...")
 
         try:
-            # Initialize ITX Security Verifier
-            verifier = ITXSecurityVerifier(debug=False)
-
-            # Get current hardware info
-            hw_info = verifier.get_hardware_info()
+            # Get current hardware info (TTL-cached in the process)
+            hw_info = get_hardware_info()
 
             # DEBUG: Log all hardware info
             _logger.info(f"DEBUG hw_info keys: {list(hw_info.keys())}")
@@ -394,7 +421,7 @@ class LicenseCheck(models.Model):
             # Fallback: if fingerprint not in struct, call get_fingerprint() separately
             if not current_fingerprint:
                 _logger.warning("Fingerprint not found in struct, calling get_fingerprint() separately")
-                current_fingerprint = verifier.get_fingerprint()
+                current_fingerprint = get_fingerprint()
 
             self.hardware_fingerprint = current_fingerprint
 
@@ -479,15 +506,24 @@ class LicenseCheck(models.Model):
             self.error_details = str(e)
             raise ValidationError(f"Expiry check failed: {e}")
 
-    def check_file_hashes(self, sample_percentage=10):
+    def check_file_hashes(self, sample_percentage=100):
         """
         Detect file tampering by comparing file hashes
 
         From design document Phase 6:
-        - Randomly sample 10% of addon files every 6 hours
+        - Check addon files every 6 hours
         - Compare SHA-256 hashes against production.lic
         - Log violations
 
+        Hashes come from the process-wide integrity index: files whose
+        stat tuple (size, mtime, ctime, inode) did not change since the
+        previous check are verified by stat alone, so checking 100% of
+        the files is cheap once the index is warm.
+
+        Licenses carrying a Merkle file manifest are always checked in
+        full: the root hashes are compared first, and only mismatching
+        subtrees are descended into to locate the tampered files.
+
         Args:
             sample_percentage (int): Percentage of files to check (1-100)
 
@@ -497,6 +533,11 @@ class LicenseCheck(models.Model):
         _logger.info(f"Checking file integrity (sampling {sample_percentage}% of files)...")
 
         try:
+            # Licenses with a Merkle file manifest (format 1.1)
+            manifest = self._load_license_file_manifest()
+            if manifest:
+                return self._check_file_manifest(manifest)
+
             # Load file hashes from license
             license_hashes = self._load_license_file_hashes()
 
@@ -504,51 +545,59 @@ class LicenseCheck(models.Model):
                 _logger.warning("No file hashes found in license - skipping integrity check")
                 return True  # No hashes = can't verify, assume OK
 
-            # Get list of addon files
-            addon_path = Path(__file__).parent.parent
-            addon_files = self._get_addon_files(addon_path)
+            # Get the files of the addons covered by the license ("addon/relative/path" keys)
+            addon_files = self._get_licensed_addon_files({key.split('/', 1)[0] for key in license_hashes})
+            file_keys = list(addon_files)
 
             # Sample files
-            import random
-            sample_size = max(1, len(addon_files) * sample_percentage // 100)
-            sampled_files = random.sample(addon_files, min(sample_size, len(addon_files)))
+            if sample_percentage >= 100:
+                sampled_keys = file_keys
+                # Deleted files must not stay in the index
+                get_integrity_index().prune(addon_files.values())
+            else:
+                import random
+                sample_size = max(1, len(file_keys) * sample_percentage // 100)
+                sampled_keys = random.sample(file_keys, min(sample_size, len(file_keys)))
 
-            _logger.info(f"Sampling {len(sampled_files)} of {len(addon_files)} files")
+            _logger.info(f"Checking {len(sampled_keys)} of {len(file_keys)} files")
 
             modified_files = []
+            get_integrity_index().reset_counters()
 
-            # Check each sampled file
-            for file_path in sampled_files:
-                relative_path = file_path.relative_to(addon_path)
+            # Hash the sampled files in parallel (unchanged files are verified by stat)
+            current_hashes = hash_files(addon_files[key] for key in sampled_keys)
 
-                # Calculate current hash
-                current_hash = self._calculate_file_hash(file_path)
+            # Check each sampled file
+            for relative_path in sampled_keys:
+                current_hash = current_hashes.get(str(addon_files[relative_path]))
 
                 # Get expected hash from license
-                expected_hash = license_hashes.get(str(relative_path))
+                expected_hash = license_hashes.get(relative_path)
 
                 if not expected_hash:
                     _logger.warning(f"File not in license: {relative_path}")
                     modified_files.append(f"{relative_path} (not in license)")
+                elif not current_hash:
+                    _logger.warning(f"File not readable: {relative_path}")
+                    modified_files.append(f"{relative_path} (not readable)")
                 elif current_hash != expected_hash:
                     _logger.warning(f"Hash mismatch: {relative_path}")
                     _logger.warning(f"  Current:  {current_hash}")
                     _logger.warning(f"  Expected: {expected_hash}")
                     modified_files.append(f"{relative_path} (hash mismatch)")
 
-            # Update check record
-            self.write({
-                'files_checked': len(sampled_files),
-                'files_modified': len(modified_files),
-                'modified_files': '\n'.join(modified_files) if modified_files else None,
-            })
+            # With full coverage, licensed files missing on disk are detected too
+            if sample_percentage >= 100:
+                for relative_path in sorted(set(license_hashes) - set(addon_files)):
+                    _logger.warning(f"File missing: {relative_path}")
+                    modified_files.append(f"{relative_path} (missing)")
 
-            if modified_files:
-                _logger.error(f"✗ File tampering detected: {len(modified_files)} files modified")
-                return False
-            else:
-                _logger.info(f"✓ File integrity verified: all {len(sampled_files)} files match")
-                return True
+            _logger.info(
+                f"Integrity index: {get_integrity_index().files_hashed} files hashed, "
+                f"{get_integrity_index().files_cached} verified by stat"
+            )
+
+            return self._set_file_check_result(len(sampled_keys), modified_files)
 
         except Exception as e:
             _logger.exception(f"Error checking file hashes: {e}")
@@ -556,6 +605,65 @@ class LicenseCheck(models.Model):
             # Don't fail on hash check errors - log and continue
             return True
 
+    def _check_file_manifest(self, manifest):
+        """
+        Verify all the licensed addon files against the license Merkle manifest
+
+        Args:
+            manifest (MerkleManifest): File manifest from the license
+
+        Returns:
+            bool: True if all files match, False if tampering detected
+        """
+        addon_files = self._get_licensed_addon_files(manifest.addons)
+        get_integrity_index().prune(addon_files.values())
+        get_integrity_index().reset_counters()
+
+        current_hashes = hash_files(addon_files.values())
+        current = MerkleManifest.from_file_hashes({
+            key: current_hashes[str(path)]
+            for key, path in addon_files.items()
+            if str(path) in current_hashes
+        })
+
+        _logger.info(
+            f"Integrity index: {get_integrity_index().files_hashed} files hashed, "
+            f"{get_integrity_index().files_cached} verified by stat"
+        )
+
+        modified_files = []
+        if current.root_hash != manifest.root_hash:
+            labels = {'mismatch': 'hash mismatch', 'missing': 'missing', 'added': 'not in license'}
+            for relative_path, status in manifest.diff(current):
+                _logger.warning(f"File {labels[status]}: {relative_path}")
+                modified_files.append(f"{relative_path} ({labels[status]})")
+
+        return self._set_file_check_result(len(addon_files), modified_files)
+
+    def _set_file_check_result(self, files_checked, modified_files):
+        """
+        Store the file integrity result on the check record
+
+        Args:
+            files_checked (int): Number of files checked
+            modified_files (list[str]): Descriptions of the modified files
+
+        Returns:
+            bool: True if no file was modified
+        """
+        self.write({
+            'files_checked': files_checked,
+            'files_modified': len(modified_files),
+            'modified_files': '\n'.join(modified_files) if modified_files else None,
+        })
+
+        if modified_files:
+            _logger.error(f"✗ File tampering detected: {len(modified_files)} files modified")
+            return False
+
+        _logger.info(f"✓ File integrity verified: all {files_checked} files match")
+        return True
+
     # ========================================================================
     # HELPER METHODS
     # ========================================================================
@@ -588,8 +696,8 @@ class LicenseCheck(models.Model):
                 _logger.warning(f"License file not found: {LICENSE_FILE_PATH}")
                 return None
 
-            # Load and decrypt license file
-            license_data = load_license_file(LICENSE_FILE_PATH)
+            # Load license file (decrypted once, then served from the process cache)
+            license_data = load_license_file_cached(LICENSE_FILE_PATH)
 
             # Get registered instances
             if license_data.registered_instances:
@@ -619,8 +727,8 @@ class LicenseCheck(models.Model):
                 _logger.warning(f"License file not found: {LICENSE_FILE_PATH}")
                 return None
 
-            # Load and decrypt license file
-            license_data = load_license_file(LICENSE_FILE_PATH)
+            # Load license file (decrypted once, then served from the process cache)
+            license_data = load_license_file_cached(LICENSE_FILE_PATH)
 
             # Parse expiry date
             if license_data.expiry_date:
@@ -647,8 +755,8 @@ class LicenseCheck(models.Model):
                 _logger.warning(f"License file not found: {LICENSE_FILE_PATH}")
                 return {}
 
-            # Load and decrypt license file
-            license_data = load_license_file(LICENSE_FILE_PATH)
+            # Load license file (decrypted once, then served from the process cache)
+            license_data = load_license_file_cached(LICENSE_FILE_PATH)
 
             # Return file hashes
             if license_data.file_hashes:
@@ -662,32 +770,62 @@ class LicenseCheck(models.Model):
             _logger.error(f"Error loading license file hashes: {e}")
             return {}
 
+    def _load_license_file_manifest(self):
+        """
+        Load the Merkle file manifest from production.lic file
+
+        Returns:
+            MerkleManifest: File manifest from license, or None if not found
+        """
+        try:
+            if not os.path.exists(LICENSE_FILE_PATH):
+                return None
+
+            return load_license_file_cached(LICENSE_FILE_PATH).file_manifest
+
+        except Exception as e:
+            _logger.error(f"Error loading license file manifest: {e}")
+            return None
+
     def _get_addon_files(self, addon_path):
         """
-        Get list of all Python files in addon
+        Get list of all files of an addon covered by file hashes
 
         Args:
             addon_path (Path): Root path of addon
 
         Returns:
-            list[Path]: List of Python file paths
+            list[Path]: List of .py, .xml, .js and .css file paths
         """
-        addon_files = []
+        return list_addon_files(addon_path)
 
-        # Scan for .py files, excluding certain directories
-        exclude_dirs = {'__pycache__', '.git', 'tests', 'native'}
+    def _get_licensed_addon_files(self, addon_names):
+        """
+        Get the files of the addons covered by the license file hashes
 
-        for py_file in addon_path.rglob('*.py'):
-            # Skip excluded directories
-            if any(excluded in py_file.parts for excluded in exclude_dirs):
+        Args:
+            addon_names (iterable): Addon names (first segment of the license file hash keys)
+
+        Returns:
+            dict: Mapping of "addon/relative/path" keys to file paths
+        """
+        addon_files = {}
+
+        for addon_name in sorted(addon_names):
+            addon_path = get_module_path(addon_name)
+            if not addon_path:
+                _logger.warning(f"Licensed addon not found: {addon_name}")
                 continue
-            addon_files.append(py_file)
+
+            addon_path = Path(addon_path)
+            for file_path in self._get_addon_files(addon_path):
+                addon_files[f"{addon_name}/{file_path.relative_to(addon_path).as_posix()}"] = file_path
 
         return addon_files
 
     def _calculate_file_hash(self, file_path):
         """
-        Calculate SHA-256 hash of file
+        Calculate SHA-256 hash of file (rehashed only if its stat changed)
 
         Args:
             file_path (Path): Path to file
@@ -695,13 +833,7 @@ class LicenseCheck(models.Model):
         Returns:
             str: Hex-encoded SHA-256 hash
         """
-        sha256 = hashlib.sha256()
-
-        with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                sha256.update(chunk)
-
-        return sha256.hexdigest()
+        return get_integrity_index().get_hash(file_path)
 
     # ========================================================================
     # UI ACTIONS
@@ -4,14 +4,21 @@ ITX Security Shield - License Configuration Management
 Stores license parameters, grace periods, and system configuration
 """
 
+import json
+import hashlib
 import logging
 from datetime import datetime, timedelta
 
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
 
+from ..tools.license_crypto import clear_license_cache
+
 _logger = logging.getLogger(__name__)
 
+# Status snapshot bodies cached per worker: {dbname: (etag, JSON body)}
+_status_snapshot_cache = {}
+
 
 class LicenseConfig(models.Model):
     """
@@ -204,6 +211,25 @@ class LicenseConfig(models.Model):
         help='When emergency unlock automatically expires',
     )
 
+    # Status snapshot (served by /license/status)
+    status_snapshot = fields.Text(
+        string='Status Snapshot',
+        readonly=True,
+        help='License status (JSON) served by /license/status, refreshed by validations and configuration changes',
+    )
+
+    status_snapshot_expires = fields.Datetime(
+        string='Status Snapshot Expires',
+        readonly=True,
+        help='When the grace period or emergency unlock of the status snapshot ends (snapshot refreshed then)',
+    )
+
+    status_snapshot_etag = fields.Char(
+        string='Status Snapshot ETag',
+        readonly=True,
+        help='Hash of the status snapshot: workers reuse their cached snapshot while it matches',
+    )
+
     # ========================================================================
     # CONSTRAINTS
     # ========================================================================
@@ -277,6 +303,126 @@ class LicenseConfig(models.Model):
             _logger.info("Created new license configuration record")
         return config
 
+    # ========================================================================
+    # STATUS SNAPSHOT
+    # ========================================================================
+
+    def write(self, vals):
+        """Refresh the status snapshot when the configuration changes"""
+        res = super().write(vals)
+        if set(vals) - {'status_snapshot', 'status_snapshot_expires', 'status_snapshot_etag'} and \
+                not self.env.context.get('skip_status_snapshot'):
+            for config in self:
+                config.refresh_status_snapshot()
+        return res
+
+    def _build_status_snapshot(self):
+        """
+        Build the license status served by /license/status
+
+        Returns:
+            tuple: (status dict, datetime when it expires or False)
+        """
+        self.ensure_one()
+
+        # Get most recent check
+        recent_check = self.env['license.check'].search(
+            [],
+            order='check_date desc',
+            limit=1
+        )
+
+        if not recent_check:
+            return {
+                'valid': False,
+                'status': 'no_checks',
+                'message': 'No license validations have been performed yet',
+                'expiry_days': 0,
+                'grace_period': False,
+                'last_check': None,
+            }, False
+
+        # Check if grace period is active
+        grace_active = self.grace_period_active and self.check_grace_period_expired()
+
+        # Check if emergency unlock is active
+        emergency_unlock = self.emergency_unlock_enabled and self.check_emergency_unlock_expired()
+
+        snapshot = {
+            'valid': recent_check.status == 'valid' or grace_active or emergency_unlock,
+            'status': recent_check.status,
+            'message': recent_check.validation_message or 'No validation message',
+            'expiry_days': recent_check.days_until_expiry,
+            'grace_period': grace_active,
+            'emergency_unlock': emergency_unlock,
+            'last_check': recent_check.check_date.strftime('%Y-%m-%d %H:%M:%S') if recent_check.check_date else None,
+        }
+
+        # The snapshot changes by itself when the grace period or emergency unlock ends
+        expires = [
+            end for active, end in (
+                (grace_active, self.grace_period_ends),
+                (emergency_unlock, self.emergency_unlock_expires),
+            )
+            if active and end
+        ]
+        return snapshot, min(expires) if expires else False
+
+    def refresh_status_snapshot(self):
+        """
+        Recompute and store the status snapshot and its ETag (the cached
+        copies of the workers are replaced when they see the new ETag).
+        Nothing is written when the ETag and the expiry are unchanged.
+
+        Returns:
+            dict: License status
+        """
+        self.ensure_one()
+
+        config = self.with_context(skip_status_snapshot=True)
+        snapshot, expires = config._build_status_snapshot()
+        body = json.dumps(snapshot, sort_keys=True)
+        etag = hashlib.sha256(body.encode('utf-8')).hexdigest()[:32]
+
+        # Unchanged snapshot: don't lock the singleton row (concurrent checks and pollers)
+        if etag == config.status_snapshot_etag and (expires or False) == (config.status_snapshot_expires or False):
+            return snapshot
+
+        config.write({
+            'status_snapshot': body,
+            'status_snapshot_expires': expires,
+            'status_snapshot_etag': etag,
+        })
+
+        return snapshot
+
+    @api.model
+    def get_status_snapshot(self):
+        """
+        Get the license status served by /license/status
+
+        Steady state only reads the ETag of the stored snapshot: the body is
+        served from the worker cache while the ETag matches, and the snapshot
+        is only recomputed when missing or expired.
+
+        Returns:
+            tuple: (etag, JSON body)
+        """
+        stored = self.search_read([], ['status_snapshot_etag', 'status_snapshot_expires'], limit=1)
+        if not stored or not stored[0]['status_snapshot_etag'] or (
+                stored[0]['status_snapshot_expires'] and fields.Datetime.now() >= stored[0]['status_snapshot_expires']):
+            self.get_config().refresh_status_snapshot()
+            stored = self.search_read([], ['status_snapshot_etag'], limit=1)
+
+        etag = stored[0]['status_snapshot_etag']
+        cached = _status_snapshot_cache.get(self.env.cr.dbname)
+        if cached and cached[0] == etag:
+            return cached
+
+        body = self.browse(stored[0]['id']).status_snapshot
+        _status_snapshot_cache[self.env.cr.dbname] = (etag, body)
+        return etag, body
+
     # ========================================================================
     # GRACE PERIOD MANAGEMENT
     # ========================================================================
@@ -376,6 +522,9 @@ class LicenseConfig(models.Model):
         """
         self.ensure_one()
 
+        # Force the next license load to decrypt the file again
+        clear_license_cache()
+
         # TODO: Implement license file decryption and parsing
         _logger.warning("License file parsing not yet implemented")
 
@@ -404,6 +553,9 @@ class LicenseConfig(models.Model):
         # 4. Write to license_file_path
         # 5. Update configuration
 
+        # The installed file replaces any license decrypted so far
+        clear_license_cache()
+
         _logger.warning("License installation not yet implemented")
         raise ValidationError("License installation not yet implemented")
 
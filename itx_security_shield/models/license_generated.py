@@ -236,16 +236,12 @@ class LicenseGenerated(models.Model):
         addon_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         production_lic_path = os.path.join(addon_path, 'production.lic')
 
-        try:
-            # Delete old production.lic if exists
-            if os.path.exists(production_lic_path):
-                os.remove(production_lic_path)
-                _logger.info(f"Deleted old production.lic: {production_lic_path}")
+        from ..tools.license_crypto import write_file_atomic
 
-            # Write new production.lic
+        try:
+            # Replace production.lic atomically (workers may be loading it)
             license_data = base64.b64decode(self.license_file)
-            with open(production_lic_path, 'wb') as f:
-                f.write(license_data)
+            write_file_atomic(production_lic_path, license_data)
 
             _logger.info(f"Deployed license to production.lic: {production_lic_path}")
 
@@ -6,10 +6,10 @@ Wizard for generating encrypted license files with hybrid RSA+AES encryption.
 
 import base64
 import os
-import tempfile
 from datetime import datetime, timedelta
 from odoo import models, fields, api
 from odoo.exceptions import UserError, ValidationError
+from odoo.modules.module import get_module_path
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -99,6 +99,12 @@ class LicenseGenerator(models.TransientModel):
         default=True,
         help='Automatically bind license to current machine hardware'
     )
+    include_file_hashes = fields.Boolean(
+        string='Include File Hashes',
+        default=False,
+        help='Store the SHA-256 of the licensed addons files (and of ITX Security Shield) '
+             'for the periodic file integrity checks'
+    )
 
     # ========================================================================
     # RSA Key Upload
@@ -167,7 +173,8 @@ class LicenseGenerator(models.TransientModel):
         try:
             # Import license tools
             from ..tools.license_format import LicenseData, InstanceInfo
-            from ..tools.license_crypto import encrypt_license_hybrid
+            from ..tools.license_crypto import encrypt_license_hybrid, load_private_key_pem
+            from ..tools.file_integrity import hash_addons
             from ..lib.verifier import get_hardware_info
 
             log_lines = []
@@ -180,136 +187,137 @@ class LicenseGenerator(models.TransientModel):
             if not self.private_key_file:
                 raise UserError('Private key file is required to generate license!')
 
-            # Save private key to temporary file
-            key_temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pem')
-            try:
-                key_data = base64.b64decode(self.private_key_file)
-                key_temp_file.write(key_data)
-                key_temp_file.close()
-                private_key_path = key_temp_file.name
-
-                log_lines.append(f"✓ Private key loaded: {len(key_data)} bytes")
-
-                # Collect hardware information if binding enabled
-                registered_instances = []
-                if self.bind_hardware:
-                    log_lines.append("")
-                    log_lines.append("Collecting hardware information...")
-
-                    hw_info = get_hardware_info()
-
-                    log_lines.append(f"  - Machine ID: {hw_info.get('machine_id', 'N/A')}")
-                    log_lines.append(f"  - CPU: {hw_info.get('cpu_model', 'N/A')[:50]}...")
-                    log_lines.append(f"  - MAC: {hw_info.get('mac_address', 'N/A')}")
-                    log_lines.append(f"  - Fingerprint: {hw_info.get('fingerprint', 'N/A')[:16]}...")
-
-                    instance = InstanceInfo(
-                        instance_id=1,
-                        hardware_fingerprint=hw_info.get('fingerprint', ''),
-                        machine_id=hw_info.get('machine_id', ''),
-                        hostname=os.uname().nodename,
-                        registered_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        last_seen=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        status='active',
-                    )
-                    registered_instances.append(instance.to_dict())
-                    log_lines.append(f"✓ Hardware binding enabled (1 instance registered)")
-                else:
-                    log_lines.append("⚠ Hardware binding disabled (not recommended)")
-
-                # Parse addon list
-                addons = [a.strip() for a in self.licensed_addons.split(',') if a.strip()]
-                if not addons:
-                    raise UserError('At least one addon must be specified!')
+            # Parse the uploaded private key in memory (no temporary key file)
+            key_data = base64.b64decode(self.private_key_file)
+            passphrase = self.private_key_passphrase.encode('utf-8') if self.private_key_passphrase else None
+            private_key = load_private_key_pem(key_data, passphrase)
 
-                log_lines.append("")
-                log_lines.append(f"Licensed addons: {', '.join(addons)}")
-                log_lines.append(f"Max instances: {self.max_instances}")
-                log_lines.append(f"Concurrent users: {self.concurrent_users or 'unlimited'}")
-
-                # Create license data
-                license_data = LicenseData(
-                    customer_name=self.customer_name,
-                    po_number=self.po_number or '',
-                    contract_number=self.contract_number or '',
-                    contact_email=self.contact_email or '',
-                    contact_phone=self.contact_phone or '',
-                    licensed_addons=addons,
-                    max_instances=self.max_instances,
-                    concurrent_users=self.concurrent_users,
-                    registered_instances=registered_instances,
-                    issue_date=self.issue_date.strftime('%Y-%m-%d'),
-                    expiry_date=self.expiry_date.strftime('%Y-%m-%d'),
-                    grace_period_days=self.grace_period_days,
-                    maintenance_until=self.maintenance_until.strftime('%Y-%m-%d') if self.maintenance_until else '',
-                    license_type='production',
-                    license_version='1.0',
-                    features={
-                        'hardware_binding': self.bind_hardware,
-                        'file_integrity_check': False,
-                        'debug_detection': False,
-                    },
-                )
+            log_lines.append(f"✓ Private key loaded: {len(key_data)} bytes")
 
+            # Collect hardware information if binding enabled
+            registered_instances = []
+            if self.bind_hardware:
                 log_lines.append("")
-                log_lines.append("Encrypting license with hybrid RSA+AES...")
-
-                # Encrypt license
-                passphrase = self.private_key_passphrase.encode('utf-8') if self.private_key_passphrase else None
-                encrypted_data = encrypt_license_hybrid(
-                    license_data,
-                    private_key_path=private_key_path,
-                    private_key_passphrase=passphrase
+                log_lines.append("Collecting hardware information...")
+
+                hw_info = get_hardware_info()
+
+                log_lines.append(f"  - Machine ID: {hw_info.get('machine_id', 'N/A')}")
+                log_lines.append(f"  - CPU: {hw_info.get('cpu_model', 'N/A')[:50]}...")
+                log_lines.append(f"  - MAC: {hw_info.get('mac_address', 'N/A')}")
+                log_lines.append(f"  - Fingerprint: {hw_info.get('fingerprint', 'N/A')[:16]}...")
+
+                instance = InstanceInfo(
+                    instance_id=1,
+                    hardware_fingerprint=hw_info.get('fingerprint', ''),
+                    machine_id=hw_info.get('machine_id', ''),
+                    hostname=os.uname().nodename,
+                    registered_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    last_seen=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    status='active',
                 )
+                registered_instances.append(instance.to_dict())
+                log_lines.append(f"✓ Hardware binding enabled (1 instance registered)")
+            else:
+                log_lines.append("⚠ Hardware binding disabled (not recommended)")
 
-                log_lines.append(f"✓ License encrypted: {len(encrypted_data)} bytes")
-                log_lines.append(f"  - Encryption: Hybrid (RSA-4096 + AES-256-GCM)")
-                log_lines.append(f"  - File format: ODLI v1.0")
+            # Parse addon list
+            addons = [a.strip() for a in self.licensed_addons.split(',') if a.strip()]
+            if not addons:
+                raise UserError('At least one addon must be specified!')
 
-                # Save to model
-                filename = f"{self.customer_name.replace(' ', '_')}_license.lic"
-                self.write({
-                    'license_generated': True,
-                    'license_file': base64.b64encode(encrypted_data),
-                    'license_filename': filename,
-                    'generation_log': '\n'.join(log_lines) + '\n\n✓ License generation completed successfully!'
-                })
+            log_lines.append("")
+            log_lines.append(f"Licensed addons: {', '.join(addons)}")
+            log_lines.append(f"Max instances: {self.max_instances}")
+            log_lines.append(f"Concurrent users: {self.concurrent_users or 'unlimited'}")
+
+            # Hash the licensed addons files (parallel hashing engine)
+            file_hashes = {}
+            if self.include_file_hashes:
+                addon_paths = {}
+                for addon_name in set(addons) | {'itx_security_shield'}:
+                    addon_path = get_module_path(addon_name)
+                    if addon_path:
+                        addon_paths[addon_name] = addon_path
+                    else:
+                        log_lines.append(f"⚠ Addon not found, files not hashed: {addon_name}")
+
+                file_hashes = hash_addons(addon_paths)
+                log_lines.append(f"✓ File hashes: {len(file_hashes)} files of {len(addon_paths)} addons")
+
+            # Create license data
+            license_data = LicenseData(
+                customer_name=self.customer_name,
+                po_number=self.po_number or '',
+                contract_number=self.contract_number or '',
+                contact_email=self.contact_email or '',
+                contact_phone=self.contact_phone or '',
+                licensed_addons=addons,
+                max_instances=self.max_instances,
+                concurrent_users=self.concurrent_users,
+                registered_instances=registered_instances,
+                issue_date=self.issue_date.strftime('%Y-%m-%d'),
+                expiry_date=self.expiry_date.strftime('%Y-%m-%d'),
+                grace_period_days=self.grace_period_days,
+                maintenance_until=self.maintenance_until.strftime('%Y-%m-%d') if self.maintenance_until else '',
+                license_type='production',
+                license_version='1.0',
+                features={
+                    'hardware_binding': self.bind_hardware,
+                    'file_integrity_check': bool(file_hashes),
+                    'debug_detection': False,
+                },
+                file_hashes=file_hashes,
+            )
+
+            log_lines.append("")
+            log_lines.append("Encrypting license with hybrid RSA+AES...")
+
+            # Encrypt license
+            encrypted_data = encrypt_license_hybrid(license_data, private_key=private_key)
+
+            log_lines.append(f"✓ License encrypted: {len(encrypted_data)} bytes")
+            log_lines.append(f"  - Encryption: Hybrid (RSA-4096 + AES-256-GCM)")
+            log_lines.append(f"  - File format: ODLI v1.0")
+
+            # Save to model
+            filename = f"{self.customer_name.replace(' ', '_')}_license.lic"
+            self.write({
+                'license_generated': True,
+                'license_file': base64.b64encode(encrypted_data),
+                'license_filename': filename,
+                'generation_log': '\n'.join(log_lines) + '\n\n✓ License generation completed successfully!'
+            })
+
+            log_lines.append("")
+            log_lines.append("=== Generation Successful ===")
+
+            # Create permanent record
+            self.env['itxss.license.generated'].create({
+                'customer_name': self.customer_name,
+                'po_number': self.po_number,
+                'contract_number': self.contract_number,
+                'licensed_addons': ', '.join(addons),
+                'max_instances': self.max_instances,
+                'hardware_fingerprint': hw_info.get('fingerprint', '') if self.bind_hardware else '',
+                'issue_date': self.issue_date,
+                'expiry_date': self.expiry_date,
+                'license_file': base64.b64encode(encrypted_data),
+                'license_filename': filename,
+                'file_size': len(encrypted_data),
+            })
+
+            _logger.info(f"License generated successfully for {self.customer_name}")
+
+            # Return to same form to show result
+            return {
+                'type': 'ir.actions.act_window',
+                'res_model': 'itxss.license.generator',
+                'res_id': self.id,
+                'view_mode': 'form',
+                'target': 'new',
+            }
 
-                log_lines.append("")
-                log_lines.append("=== Generation Successful ===")
-
-                # Create permanent record
-                self.env['itxss.license.generated'].create({
-                    'customer_name': self.customer_name,
-                    'po_number': self.po_number,
-                    'contract_number': self.contract_number,
-                    'licensed_addons': ', '.join(addons),
-                    'max_instances': self.max_instances,
-                    'hardware_fingerprint': hw_info.get('fingerprint', '') if self.bind_hardware else '',
-                    'issue_date': self.issue_date,
-                    'expiry_date': self.expiry_date,
-                    'license_file': base64.b64encode(encrypted_data),
-                    'license_filename': filename,
-                    'file_size': len(encrypted_data),
-                })
-
-                _logger.info(f"License generated successfully for {self.customer_name}")
-
-                # Return to same form to show result
-                return {
-                    'type': 'ir.actions.act_window',
-                    'res_model': 'itxss.license.generator',
-                    'res_id': self.id,
-                    'view_mode': 'form',
-                    'target': 'new',
-                }
-
-            finally:
-                # Clean up temp file
-                try:
-                    os.unlink(private_key_path)
-                except:
-                    pass
 
         except Exception as e:
             _logger.error(f"License generation failed: {e}", exc_info=True)
@@ -5,13 +5,106 @@ Tracks all license validation events, violations, and warnings
 """
 
 import logging
+import threading
+from collections import deque
 from datetime import datetime
+from functools import partial
 
-from odoo import models, fields, api
+from odoo import models, fields, api, SUPERUSER_ID
 from odoo.exceptions import ValidationError
 
 _logger = logging.getLogger(__name__)
 
+# Events waiting to be written, per transaction (excess events are dropped and counted)
+MAX_PENDING_EVENTS = 10000
+
+# Events written per create()
+FLUSH_BATCH_SIZE = 500
+
+
+class LicenseLogBuffer:
+    """
+    Bounded in-memory queue of the license.log values of one transaction.
+
+    log_event() queues its values in the buffer of the current cursor
+    (cr.postcommit.data / cr.postrollback.data); they are written in batches,
+    with a separate cursor, once that transaction ends (committed or rolled
+    back), so checks do not pay one INSERT per event and the violations of a
+    failed check are not lost with its transaction. Each transaction only
+    writes its own events.
+    """
+
+    # Events dropped (queue full or failed write) per database, reported by the next flush
+    _dropped = {}
+    _dropped_lock = threading.Lock()
+
+    def __init__(self, dbname, max_events=MAX_PENDING_EVENTS):
+        self.dbname = dbname
+        self.max_events = max_events
+        self._events = deque()
+
+    def push(self, values):
+        """
+        Queue the values of an event.
+
+        Returns:
+            bool: False if the queue is full (event dropped and counted)
+        """
+        if len(self._events) >= self.max_events:
+            self.count_dropped(1)
+            return False
+        self._events.append(values)
+        return True
+
+    def pop(self, limit):
+        """
+        Take the oldest pending events.
+
+        Returns:
+            list: values of at most limit events
+        """
+        return [self._events.popleft() for _ in range(min(limit, len(self._events)))]
+
+    def count_dropped(self, count):
+        """Count events of this database that will never be written"""
+        with self._dropped_lock:
+            self._dropped[self.dbname] = self._dropped.get(self.dbname, 0) + count
+
+    def pop_dropped(self):
+        """Number of events of this database dropped since the last report"""
+        with self._dropped_lock:
+            return self._dropped.pop(self.dbname, 0)
+
+    def __len__(self):
+        return len(self._events)
+
+
+def _flush_license_log(registry, buffer):
+    """Write the pending events of a transaction, batch by batch, with a new cursor"""
+    while True:
+        batch = buffer.pop(FLUSH_BATCH_SIZE)
+        dropped = buffer.pop_dropped()
+        if not batch and not dropped:
+            return
+
+        vals_list = list(batch)
+        if dropped:
+            vals_list.append({
+                'event_type': 'system_error',
+                'severity': 'warning',
+                'message': f"{dropped} license log events dropped (log queue full or write failure)",
+            })
+
+        try:
+            with registry.cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                env['license.log']._create_buffered(vals_list)
+        except Exception:
+            _logger.exception(f"❌ Failed to write {len(vals_list)} license log events")
+            # This batch and the events left are lost: reported by the next flush
+            buffer.count_dropped(dropped + len(batch) + len(buffer))
+            return
+
 
 class LicenseLog(models.Model):
     """
@@ -142,19 +235,24 @@ class LicenseLog(models.Model):
     # ========================================================================
 
     @api.model
-    def log_event(self, event_type, message, severity='info', details=None, **kwargs):
+    def log_event(self, event_type, message, severity='info', details=None, sync=False, **kwargs):
         """
         Create a log entry
 
+        The entry is queued and written in a batch with a separate cursor
+        when the current transaction ends (see LicenseLogBuffer), unless
+        sync is set.
+
         Args:
             event_type (str): Event type (must match selection values)
             message (str): Human-readable message
             severity (str): Severity level ('info', 'warning', 'error', 'critical')
             details (str, optional): Technical details
+            sync (bool): Create the record now, in the current transaction
             **kwargs: Additional field values (license_check_id, hardware_fingerprint, etc.)
 
         Returns:
-            license.log: Created log record
+            license.log: Created log record (empty recordset when queued)
 
         Example:
             self.env['license.log'].log_event(
@@ -172,6 +270,7 @@ class LicenseLog(models.Model):
             'message': message,
             'severity': severity,
             'details': details,
+            'user_id': self.env.uid,
         }
 
         # Add any additional fields from kwargs
@@ -179,8 +278,12 @@ class LicenseLog(models.Model):
             if key in self._fields:
                 values[key] = value
 
-        # Create log record
-        log_record = self.create(values)
+        # Create log record, or queue it
+        if sync:
+            log_record = self.create(values)
+        else:
+            log_record = self.browse()
+            self._get_log_buffer().push(values)
 
         # Also log to Python logger
         logger_method = getattr(_logger, severity, _logger.info)
@@ -191,6 +294,41 @@ class LicenseLog(models.Model):
 
         return log_record
 
+    @api.model
+    def _get_log_buffer(self):
+        """
+        Event buffer of the current transaction, flushed once it ends
+
+        The same buffer is registered for commit and rollback: only the
+        callbacks of the outcome run, the others are discarded by the cursor.
+        """
+        cr = self.env.cr
+        buffer = cr.postcommit.data.get('license_log_buffer')
+        if buffer is None:
+            buffer = LicenseLogBuffer(cr.dbname)
+            flush = partial(_flush_license_log, self.env.registry, buffer)
+            for callbacks in (cr.postcommit, cr.postrollback):
+                callbacks.data['license_log_buffer'] = buffer
+                callbacks.add(flush)
+        return buffer
+
+    @api.model
+    def _create_buffered(self, vals_list):
+        """
+        Create queued events in one batch
+
+        Events of a rolled back transaction may reference a license check
+        that was never committed: the reference is cleared, the event kept.
+        """
+        check_ids = {values['license_check_id'] for values in vals_list if values.get('license_check_id')}
+        if check_ids:
+            existing = set(self.env['license.check'].browse(check_ids).exists().ids)
+            for values in vals_list:
+                if values.get('license_check_id') and values['license_check_id'] not in existing:
+                    values['license_check_id'] = False
+
+        return self.create(vals_list)
+
     @api.model
     def log_check_success(self, check_id, message="License validation successful"):
         """Log successful validation"""
@@ -356,32 +494,21 @@ class LicenseLog(models.Model):
         """
         Get summary of violations in last N days
 
+        Counts come from the daily statistics rollups (see license.stat.daily):
+        the last N UTC days, today included.
+
         Args:
             days (int): Number of days to look back
 
         Returns:
             dict: Summary with counts by violation type
         """
-        from datetime import timedelta
-
-        cutoff_date = datetime.now() - timedelta(days=days)
-
-        violations = self.search([
-            ('create_date', '>=', cutoff_date),
-            ('severity', 'in', ['error', 'critical']),
-        ])
-
-        summary = {}
-        for violation in violations:
-            event_type = violation.event_type
-            if event_type not in summary:
-                summary[event_type] = 0
-            summary[event_type] += 1
+        statistics = self.env['license.stat.daily'].get_statistics(days=days)
 
         return {
             'period_days': days,
-            'total_violations': len(violations),
-            'by_type': summary,
+            'total_violations': statistics['total_violations'],
+            'by_type': statistics['by_type'],
         }
 
     @api.model
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+ITX Security Shield - License Statistics
+Daily rollups of license checks and log events, maintained incrementally by cron
+"""
+
+import logging
+from datetime import datetime, time, timedelta
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Last day (UTC) whose rollup rows are final
+ROLLUP_WATERMARK_PARAM = 'itx_security_shield.stats_rollup_day'
+
+# Closed days rolled up again by the cron (rows committed late by long transactions)
+ROLLUP_MARGIN_DAYS = 1
+
+VIOLATION_SEVERITIES = ('error', 'critical')
+
+
+def _to_date(value):
+    """Day of a _read_group date/datetime group value"""
+    return value.date() if isinstance(value, datetime) else value
+
+
+class LicenseStatDaily(models.Model):
+    """
+    Daily License Statistics
+
+    One row per (UTC day, kind, status or event type, severity) with the
+    number of license checks or log events. Rows of closed days are written
+    by the rollup cron; the days after its watermark are aggregated live, so
+    a statistics window costs the same whatever the number of checks and
+    logs behind it.
+    """
+
+    _name = 'license.stat.daily'
+    _description = 'ITX License Daily Statistics'
+    _order = 'day desc'
+
+    # ========================================================================
+    # FIELDS
+    # ========================================================================
+
+    day = fields.Date(
+        string='Day',
+        required=True,
+        index=True,
+        help='UTC day',
+    )
+
+    kind = fields.Selection(
+        [
+            ('check', 'License Check'),
+            ('event', 'Log Event'),
+        ],
+        string='Kind',
+        required=True,
+    )
+
+    code = fields.Char(
+        string='Status / Event Type',
+        required=True,
+        help='license.check status or license.log event type',
+    )
+
+    severity = fields.Selection(
+        [
+            ('info', 'Info'),
+            ('warning', 'Warning'),
+            ('error', 'Error'),
+            ('critical', 'Critical'),
+        ],
+        string='Severity',
+        help='Log event severity (log events only)',
+    )
+
+    count = fields.Integer(
+        string='Count',
+    )
+
+    # ========================================================================
+    # AGGREGATION
+    # ========================================================================
+
+    @api.model
+    def _aggregate_days(self, date_from=None, date_to=None):
+        """
+        Count checks and log events per UTC day with grouped SQL queries
+
+        Args:
+            date_from (date, optional): First day (default: from the oldest row)
+            date_to (date, optional): Last day (default: up to now)
+
+        Returns:
+            list: Row values (day, kind, code, severity, count)
+        """
+        def day_domain(field_name):
+            domain = []
+            if date_from:
+                domain.append((field_name, '>=', datetime.combine(date_from, time.min)))
+            if date_to:
+                domain.append((field_name, '<', datetime.combine(date_to + timedelta(days=1), time.min)))
+            return domain
+
+        rows = []
+
+        checks = self.env['license.check'].with_context(tz='UTC')._read_group(
+            day_domain('check_date'), ['check_date:day', 'status'], ['__count'],
+        )
+        for day, status, count in checks:
+            rows.append({'day': _to_date(day), 'kind': 'check', 'code': status, 'severity': False, 'count': count})
+
+        events = self.env['license.log'].with_context(tz='UTC')._read_group(
+            day_domain('create_date'), ['create_date:day', 'event_type', 'severity'], ['__count'],
+        )
+        for day, event_type, severity, count in events:
+            rows.append({'day': _to_date(day), 'kind': 'event', 'code': event_type, 'severity': severity, 'count': count})
+
+        return rows
+
+    @api.model
+    def _get_watermark(self):
+        """Last rolled up day, or None before the first rollup"""
+        watermark = self.env['ir.config_parameter'].sudo().get_param(ROLLUP_WATERMARK_PARAM)
+        return fields.Date.to_date(watermark) if watermark else None
+
+    @api.model
+    def _cron_rollup(self):
+        """
+        Roll up the closed days since the watermark (incremental)
+
+        The current day stays open: it is aggregated live until it ends.
+        """
+        yesterday = fields.Datetime.now().date() - timedelta(days=1)
+        watermark = self._get_watermark()
+
+        date_from = watermark - timedelta(days=ROLLUP_MARGIN_DAYS - 1) if watermark else None
+        if date_from and date_from > yesterday:
+            return
+
+        rows = self._aggregate_days(date_from, yesterday)
+
+        domain = [('day', '<=', yesterday)]
+        if date_from:
+            domain.append(('day', '>=', date_from))
+        self.search(domain).unlink()
+        self.create(rows)
+
+        self.env['ir.config_parameter'].sudo().set_param(ROLLUP_WATERMARK_PARAM, fields.Date.to_string(yesterday))
+        _logger.info(f"📊 License statistics rolled up until {yesterday}: {len(rows)} rows")
+
+    # ========================================================================
+    # STATISTICS
+    # ========================================================================
+
+    @api.model
+    def get_statistics(self, days=30):
+        """
+        License statistics of the last N days (today included, UTC days)
+
+        Closed days are read from the rollup rows, the days after the
+        watermark are aggregated live.
+
+        Args:
+            days (int): Number of days
+
+        Returns:
+            dict: {
+                'period_days', 'date_from',
+                'total_checks', 'checks_by_status': {status: count},
+                'total_violations', 'by_type': {event_type: count},
+                'series': [{'day', 'checks', 'violations', 'by_type'}, ...] (one entry per day)
+            }
+        """
+        days = max(int(days), 1)
+        today = fields.Datetime.now().date()
+        date_from = today - timedelta(days=days - 1)
+        watermark = self._get_watermark()
+
+        rows = []
+        live_from = date_from
+        if watermark and watermark >= date_from:
+            rolled_up = self._read_group(
+                [('day', '>=', date_from), ('day', '<=', watermark)],
+                ['day:day', 'kind', 'code', 'severity'],
+                ['count:sum'],
+            )
+            rows += [
+                {'day': _to_date(day), 'kind': kind, 'code': code, 'severity': severity, 'count': count}
+                for day, kind, code, severity, count in rolled_up
+            ]
+            live_from = watermark + timedelta(days=1)
+        rows += self._aggregate_days(live_from)
+
+        series = {
+            date_from + timedelta(days=offset): {'checks': 0, 'violations': 0, 'by_type': {}}
+            for offset in range(days)
+        }
+        checks_by_status = {}
+        by_type = {}
+
+        for row in rows:
+            point = series.get(row['day'])
+            if point is None:
+                continue
+            if row['kind'] == 'check':
+                point['checks'] += row['count']
+                checks_by_status[row['code']] = checks_by_status.get(row['code'], 0) + row['count']
+            elif row['severity'] in VIOLATION_SEVERITIES:
+                point['violations'] += row['count']
+                point['by_type'][row['code']] = point['by_type'].get(row['code'], 0) + row['count']
+                by_type[row['code']] = by_type.get(row['code'], 0) + row['count']
+
+        return {
+            'period_days': days,
+            'date_from': fields.Date.to_string(date_from),
+            'total_checks': sum(checks_by_status.values()),
+            'checks_by_status': checks_by_status,
+            'total_violations': sum(by_type.values()),
+            'by_type': by_type,
+            'series': [
+                dict(series[day], day=fields.Date.to_string(day))
+                for day in sorted(series)
+            ],
+        }
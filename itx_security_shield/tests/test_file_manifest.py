@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Merkle file manifest (tools/file_manifest.py).
+
+Run without Odoo: python itx_security_shield/tests/test_file_manifest.py
+"""
+
+import hashlib
+import os
+import struct
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.file_manifest import MerkleManifest, DIGEST_SIZE
+
+
+def _sha(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+FILE_HASHES = {
+    'itx_helloworld/__init__.py': _sha(b'init'),
+    'itx_helloworld/__manifest__.py': _sha(b'manifest'),
+    'itx_helloworld/models/hello.py': _sha(b'hello'),
+    'itx_helloworld/views/hello.xml': _sha(b'view'),
+    'itx_other/__init__.py': _sha(b'other'),
+}
+
+
+class TestMerkleManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.manifest = MerkleManifest.from_file_hashes(FILE_HASHES)
+        self.encoded = self.manifest.encode()
+
+    def test_round_trip(self):
+        decoded = MerkleManifest.decode(self.encoded)
+
+        self.assertEqual(decoded.root_hash, self.manifest.root_hash)
+        self.assertEqual(decoded.to_file_hashes(), FILE_HASHES)
+        self.assertEqual(decoded.addons, ['itx_helloworld', 'itx_other'])
+        self.assertEqual(len(decoded), len(FILE_HASHES))
+
+    def test_root_hash_is_order_independent(self):
+        reordered = dict(reversed(list(FILE_HASHES.items())))
+        self.assertEqual(MerkleManifest.from_file_hashes(reordered).root_hash, self.manifest.root_hash)
+
+    def test_diff(self):
+        current = dict(FILE_HASHES)
+        current['itx_helloworld/models/hello.py'] = _sha(b'tampered')
+        del current['itx_other/__init__.py']
+        current['itx_helloworld/models/extra.py'] = _sha(b'extra')
+
+        diff = dict(self.manifest.diff(MerkleManifest.from_file_hashes(current)))
+        self.assertEqual(diff, {
+            'itx_helloworld/models/hello.py': 'mismatch',
+            'itx_other/__init__.py': 'missing',
+            'itx_helloworld/models/extra.py': 'added',
+        })
+        self.assertEqual(self.manifest.diff(MerkleManifest.decode(self.encoded)), [])
+
+    def test_decode_rejects_flipped_file_hash(self):
+        # The last node is a file: its digest is the last DIGEST_SIZE bytes
+        corrupted = bytearray(self.encoded)
+        corrupted[-1] ^= 0xFF
+        with self.assertRaisesRegex(ValueError, 'hash mismatch'):
+            MerkleManifest.decode(bytes(corrupted))
+
+    def test_decode_rejects_flipped_root_hash(self):
+        # Root: type (1) + empty name length (2), then its digest
+        corrupted = bytearray(self.encoded)
+        corrupted[3] ^= 0xFF
+        with self.assertRaisesRegex(ValueError, 'hash mismatch'):
+            MerkleManifest.decode(bytes(corrupted))
+
+    def test_decode_rejects_truncated_data(self):
+        for length in (0, 2, 3 + DIGEST_SIZE - 1, 3 + DIGEST_SIZE + 2, len(self.encoded) - 1):
+            with self.subTest(length=length):
+                with self.assertRaises(ValueError):
+                    MerkleManifest.decode(self.encoded[:length])
+
+    def test_decode_rejects_trailing_data(self):
+        with self.assertRaisesRegex(ValueError, 'trailing data'):
+            MerkleManifest.decode(self.encoded + b'\x00')
+
+    def test_decode_rejects_unknown_node_type(self):
+        with self.assertRaisesRegex(ValueError, 'unknown node type'):
+            MerkleManifest.decode(b'X' + self.encoded[1:])
+
+    def test_decode_rejects_huge_child_count(self):
+        corrupted = bytearray(self.encoded)
+        struct.pack_into('>I', corrupted, 3 + DIGEST_SIZE, 0xFFFFFFFF)
+        with self.assertRaises(ValueError):
+            MerkleManifest.decode(bytes(corrupted))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the .lic container (tools/license_crypto.py).
+
+Run without Odoo: python itx_security_shield/tests/test_license_file.py
+"""
+
+import contextlib
+import hashlib
+import io
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from tools.license_format import (
+    LicenseData,
+    LICENSE_VERSION,
+    LICENSE_VERSION_MANIFEST,
+    HEADER_SIZE,
+    FOOTER_SIZE,
+    IV_SIZE,
+    FLAGS_OFFSET,
+    FLAG_FILE_MANIFEST,
+)
+from tools.license_crypto import (
+    encrypt_license,
+    decrypt_license,
+    encrypt_license_hybrid,
+    decrypt_license_hybrid,
+    save_license_file,
+    load_license_file,
+    validate_license_file,
+    write_file_atomic,
+    _read_file,
+)
+
+FILE_HASHES = {
+    'itx_helloworld/__init__.py': hashlib.sha256(b'init').hexdigest(),
+    'itx_helloworld/models/hello.py': hashlib.sha256(b'hello').hexdigest(),
+}
+
+
+def _license(**values):
+    return LicenseData(
+        customer_name='Test Customer',
+        po_number='PO-TEST-001',
+        licensed_addons=['itx_helloworld'],
+        issue_date='2024-12-02',
+        expiry_date='2099-12-31',
+        **values
+    )
+
+
+def _resign(data):
+    """Recompute the footer checksum of an edited license file."""
+    data = bytearray(data)
+    data[-FOOTER_SIZE:] = hashlib.sha256(data[:-FOOTER_SIZE]).digest()
+    return bytes(data)
+
+
+def _flip(data, offset):
+    data = bytearray(data)
+    data[offset] ^= 0xFF
+    return bytes(data)
+
+
+class TestLicenseFile(unittest.TestCase):
+
+    def test_round_trip_without_manifest(self):
+        license_data = _license()
+        encrypted = encrypt_license(license_data)
+
+        self.assertEqual(encrypted[4:8], LICENSE_VERSION)
+        self.assertFalse(encrypted[FLAGS_OFFSET] & FLAG_FILE_MANIFEST)
+
+        decrypted = decrypt_license(encrypted)
+        self.assertEqual(decrypted.to_json(), license_data.to_json())
+        self.assertIsNone(decrypted.file_manifest)
+
+    def test_round_trip_with_manifest(self):
+        encrypted = encrypt_license(_license(file_hashes=FILE_HASHES))
+
+        self.assertEqual(encrypted[4:8], LICENSE_VERSION_MANIFEST)
+        self.assertTrue(encrypted[FLAGS_OFFSET] & FLAG_FILE_MANIFEST)
+
+        decrypted = decrypt_license(encrypted)
+        # The file hashes are only carried by the manifest section
+        self.assertEqual(decrypted.file_hashes, {})
+        self.assertEqual(decrypted.file_manifest.to_file_hashes(), FILE_HASHES)
+        self.assertEqual(decrypted.file_manifest_root, decrypted.file_manifest.root_hash)
+        self.assertEqual(decrypted.customer_name, 'Test Customer')
+
+    def test_hybrid_round_trip_with_manifest(self):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        with tempfile.TemporaryDirectory() as directory:
+            public_key_path = os.path.join(directory, 'public.pem')
+            with open(public_key_path, 'wb') as f:
+                f.write(private_key.public_key().public_bytes(
+                    serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+                ))
+
+            encrypted = encrypt_license_hybrid(_license(file_hashes=FILE_HASHES), private_key=private_key)
+            decrypted = decrypt_license_hybrid(encrypted, public_key_path)
+
+            self.assertEqual(decrypted.file_manifest.to_file_hashes(), FILE_HASHES)
+            self.assertEqual(decrypted.licensed_addons, ['itx_helloworld'])
+
+            with self.assertRaises(ValueError):
+                decrypt_license_hybrid(_resign(_flip(encrypted, -FOOTER_SIZE - 1)), public_key_path)
+
+    def test_tampered_file_fails_checksum(self):
+        encrypted = encrypt_license(_license(file_hashes=FILE_HASHES))
+
+        with self.assertRaisesRegex(ValueError, 'checksum mismatch'):
+            decrypt_license(_flip(encrypted, HEADER_SIZE + 10))
+
+    def test_tampered_payload_fails_decryption(self):
+        encrypted = encrypt_license(_license())
+
+        with self.assertRaisesRegex(ValueError, 'Decryption failed'):
+            decrypt_license(_resign(_flip(encrypted, -FOOTER_SIZE - 1)))
+
+    def test_tampered_manifest_fails_decryption(self):
+        encrypted = encrypt_license(_license(file_hashes=FILE_HASHES))
+        manifest_ciphertext = HEADER_SIZE + 4 + IV_SIZE
+
+        with self.assertRaisesRegex(ValueError, 'File manifest decryption failed'):
+            decrypt_license(_resign(_flip(encrypted, manifest_ciphertext)))
+
+    def test_cleared_manifest_flag_fails_decryption(self):
+        encrypted = bytearray(encrypt_license(_license(file_hashes=FILE_HASHES)))
+        encrypted[FLAGS_OFFSET] &= ~FLAG_FILE_MANIFEST
+
+        with self.assertRaises(ValueError):
+            decrypt_license(_resign(encrypted))
+
+    def test_wrong_passphrase(self):
+        encrypted = encrypt_license(_license())
+
+        with self.assertRaisesRegex(ValueError, 'Decryption failed'):
+            decrypt_license(encrypted, passphrase=b'wrong passphrase')
+
+    def test_save_load_and_validate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            license_path = os.path.join(directory, 'production.lic')
+            with contextlib.redirect_stdout(io.StringIO()):
+                save_license_file(_license(file_hashes=FILE_HASHES), license_path)
+
+            self.assertEqual(validate_license_file(license_path), (True, 'File structure valid'))
+            self.assertEqual(load_license_file(license_path).file_manifest.to_file_hashes(), FILE_HASHES)
+
+            with open(license_path, 'r+b') as f:
+                f.seek(HEADER_SIZE + 10)
+                byte = f.read(1)
+                f.seek(HEADER_SIZE + 10)
+                f.write(bytes([byte[0] ^ 0xFF]))
+
+            valid, message = validate_license_file(license_path)
+            self.assertFalse(valid)
+            self.assertIn('Checksum mismatch', message)
+            with self.assertRaises(ValueError):
+                load_license_file(license_path)
+
+
+class TestLicenseParser(unittest.TestCase):
+    """In-place parsing of the container (sections are views into one buffer)."""
+
+    def test_decrypt_from_buffer_views(self):
+        encrypted = encrypt_license(_license(file_hashes=FILE_HASHES))
+
+        for data in (bytearray(encrypted), memoryview(encrypted)):
+            with self.subTest(type=type(data).__name__):
+                decrypted = decrypt_license(data)
+                self.assertEqual(decrypted.file_manifest.to_file_hashes(), FILE_HASHES)
+
+    def test_section_overrunning_footer(self):
+        encrypted = bytearray(encrypt_license(_license(file_hashes=FILE_HASHES)))
+        struct.pack_into('<I', encrypted, HEADER_SIZE, len(encrypted))
+
+        with self.assertRaisesRegex(ValueError, 'truncated section'):
+            decrypt_license(_resign(encrypted))
+
+    def test_too_small(self):
+        encrypted = encrypt_license(_license())
+
+        with self.assertRaisesRegex(ValueError, 'too small'):
+            decrypt_license(encrypted[:HEADER_SIZE + FOOTER_SIZE])
+
+    def test_read_file(self):
+        content = os.urandom(200 * 1024)
+        with tempfile.TemporaryFile() as f:
+            f.write(content)
+            f.seek(0)
+            data = _read_file(f)
+
+        self.assertIsInstance(data, bytearray)
+        self.assertEqual(bytes(data), content)
+
+    def test_write_file_atomic(self):
+        with tempfile.TemporaryDirectory() as directory:
+            license_path = os.path.join(directory, 'production.lic')
+            write_file_atomic(license_path, b'old')
+            write_file_atomic(license_path, b'new')
+
+            with open(license_path, 'rb') as f:
+                self.assertEqual(f.read(), b'new')
+            self.assertEqual(os.listdir(directory), ['production.lic'])
+
+
+if __name__ == '__main__':
+    unittest.main()
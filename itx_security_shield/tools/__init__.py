@@ -6,6 +6,9 @@ from .license_crypto import (
     decrypt_license,
     save_license_file,
     load_license_file,
+    load_license_file_cached,
+    clear_license_cache,
+    clear_key_cache,
     validate_license_file,
 )
 
@@ -16,5 +19,8 @@ __all__ = [
     'decrypt_license',
     'save_license_file',
     'load_license_file',
+    'load_license_file_cached',
+    'clear_license_cache',
+    'clear_key_cache',
     'validate_license_file',
 ]
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+ITX Security Shield - Incremental File Integrity Index
+
+Keeps the SHA-256 of every addon file together with the stat tuple it was
+computed from, so periodic integrity checks only rehash files that changed,
+and hashes whole addon trees in parallel for license generation and checks.
+"""
+
+import os
+import mmap
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+# Addon files covered by license file hashes
+ADDON_FILE_EXTENSIONS = ('.py', '.xml', '.js', '.css')
+
+# Addon directories never hashed
+ADDON_EXCLUDE_DIRS = frozenset({'__pycache__', '.git', 'tests', 'native'})
+
+# Bytes of files being hashed at the same time (bounds the mapped memory)
+MAX_INFLIGHT_BYTES = 64 * 1024 * 1024
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Calculate SHA-256 hash of a file through a read-only memory map.
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Hex-encoded SHA-256 hash
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            # Empty files cannot be mapped
+            return hashlib.sha256().hexdigest()
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+
+def stat_key(stat: os.stat_result) -> Tuple[int, int, int, int, int]:
+    """
+    Stat tuple identifying a file version.
+
+    The change time is part of the key: unlike the modification time it
+    cannot be set back by the file owner, so restoring the mtime of an
+    edited file does not hide the edit.
+    """
+    return stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_ino, stat.st_dev
+
+
+class FileIntegrityIndex:
+    """
+    In-memory index {path: (stat tuple, sha256)}.
+
+    Files whose stat tuple did not change since they were last hashed are
+    verified by stat() alone. The index is deliberately kept in process
+    memory only: a persisted index could be edited to match tampered files.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[tuple, str]] = {}
+        self._lock = threading.Lock()
+        self.files_hashed = 0
+        self.files_cached = 0
+
+    def get_hash(self, file_path: str) -> str:
+        """
+        Get SHA-256 of a file, rehashing it only if its stat tuple changed.
+
+        Args:
+            file_path: Path to file
+
+        Returns:
+            Hex-encoded SHA-256 hash
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        file_path = str(file_path)
+        key = stat_key(os.stat(file_path))
+
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry and entry[0] == key:
+                self.files_cached += 1
+                return entry[1]
+
+        digest = hash_file(file_path)
+
+        # Only trust the hash if the file did not change while being read
+        unchanged = stat_key(os.stat(file_path)) == key
+        with self._lock:
+            if unchanged:
+                self._entries[file_path] = (key, digest)
+            self.files_hashed += 1
+        return digest
+
+    def reset_counters(self):
+        """Reset the hashed/cached counters (per scan statistics)."""
+        with self._lock:
+            self.files_hashed = 0
+            self.files_cached = 0
+
+    def prune(self, file_paths):
+        """
+        Forget the files not in file_paths (deleted or no longer scanned).
+
+        Args:
+            file_paths: Paths still part of the scanned tree
+        """
+        keep = {str(path) for path in file_paths}
+        with self._lock:
+            for file_path in [path for path in self._entries if path not in keep]:
+                del self._entries[file_path]
+
+    def clear(self):
+        """Forget every indexed file."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Process-wide index shared by every integrity check of this worker
+_integrity_index = FileIntegrityIndex()
+
+
+def get_integrity_index() -> FileIntegrityIndex:
+    """Get the process-wide file integrity index."""
+    return _integrity_index
+
+
+# ============================================================================
+# Parallel Hashing Engine
+# ============================================================================
+
+def list_addon_files(addon_path, extensions: Tuple[str, ...] = ADDON_FILE_EXTENSIONS,
+                     exclude_dirs=ADDON_EXCLUDE_DIRS) -> List[Path]:
+    """
+    List the addon files covered by file hashes.
+
+    Args:
+        addon_path: Root path of addon
+        extensions: File extensions to include
+        exclude_dirs: Directory names never walked into
+
+    Returns:
+        List of file paths, sorted
+    """
+    addon_files = []
+
+    for dir_path, dir_names, file_names in os.walk(addon_path):
+        dir_names[:] = [name for name in dir_names if name not in exclude_dirs]
+        addon_files.extend(Path(dir_path, name) for name in file_names if name.endswith(extensions))
+
+    return sorted(addon_files)
+
+
+def hash_files(file_paths: Iterable, max_workers: int = None,
+               max_inflight_bytes: int = MAX_INFLIGHT_BYTES,
+               index: FileIntegrityIndex = None) -> Dict[str, str]:
+    """
+    Hash files on a thread pool (hashlib releases the GIL while hashing).
+
+    Files are submitted while the total size of the files being hashed stays
+    under max_inflight_bytes (a single larger file is still hashed alone).
+    Hashes go through the integrity index, so unchanged files cost a stat().
+
+    Args:
+        file_paths: Paths of the files to hash
+        max_workers: Hashing threads (default: CPU count)
+        max_inflight_bytes: Bound of the bytes being hashed at the same time
+        index: Integrity index to use (default: the process-wide index)
+
+    Returns:
+        Dict mapping each readable file path (str) to its SHA-256 hash;
+        files that cannot be read are left out
+    """
+    index = index or get_integrity_index()
+    results = {}
+    pending = {}  # future -> (path, size)
+    inflight = 0
+
+    def collect(futures):
+        nonlocal inflight
+        for future in futures:
+            path, size = pending.pop(future)
+            inflight -= size
+            if future.exception() is None:
+                results[path] = future.result()
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+        for file_path in file_paths:
+            file_path = str(file_path)
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                continue
+
+            while pending and inflight + size > max_inflight_bytes:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+
+            pending[executor.submit(index.get_hash, file_path)] = (file_path, size)
+            inflight += size
+
+        if pending:
+            done, _ = wait(pending)
+            collect(done)
+
+    return results
+
+
+def hash_addon_tree(addon_path, prefix: str = '', **kwargs) -> Dict[str, str]:
+    """
+    Hash every covered file of an addon tree.
+
+    Args:
+        addon_path: Root path of addon
+        prefix: Key prefix, usually the addon name (keys become "prefix/relative/path")
+        **kwargs: Passed to hash_files
+
+    Returns:
+        Dict mapping POSIX relative paths to SHA-256 hashes
+    """
+    addon_path = Path(addon_path)
+    files = {path: path.relative_to(addon_path).as_posix() for path in list_addon_files(addon_path)}
+    hashes = hash_files(files, **kwargs)
+
+    return {
+        f"{prefix}/{relative}" if prefix else relative: hashes[str(path)]
+        for path, relative in files.items()
+        if str(path) in hashes
+    }
+
+
+def hash_addons(addon_paths: Dict[str, str], **kwargs) -> Dict[str, str]:
+    """
+    Build license file hashes for several addons.
+
+    Args:
+        addon_paths: Mapping of addon names to their root paths
+        **kwargs: Passed to hash_files
+
+    Returns:
+        Dict mapping "addon/relative/path" keys to SHA-256 hashes
+        (the LicenseData.file_hashes format consumed by license.check)
+    """
+    file_hashes = {}
+    for addon_name, addon_path in sorted(addon_paths.items()):
+        file_hashes.update(hash_addon_tree(addon_path, prefix=addon_name, **kwargs))
+    return file_hashes
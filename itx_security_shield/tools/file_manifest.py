@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+ITX Security Shield - Merkle File Manifest
+
+Compact binary Merkle tree of the licensed addon files. Every directory
+node holds the hash of its children, so a verifier compares the root hash
+first and only descends into the subtrees whose hash differs.
+
+Binary encoding (pre-order, big-endian):
+    Node:
+        - Type: b'D' (directory) or b'F' (file) (1 byte)
+        - Name length (2 bytes) + UTF-8 name (the root directory has no name)
+        - SHA-256 digest (32 bytes): file content hash, or directory hash
+        - Directory only: child count (4 bytes), then the children sorted by name
+
+Directory hash = SHA-256 of the concatenated (type, name length, name, digest)
+of its children, sorted by name.
+"""
+
+import hashlib
+import struct
+from typing import Dict, List, Optional, Tuple
+
+NODE_DIR = b'D'
+NODE_FILE = b'F'
+DIGEST_SIZE = 32
+
+# A node is (digest, children); children is None for files
+Node = Tuple[bytes, Optional[Dict[str, 'Node']]]
+
+
+def _child_record(name: str, node: Node) -> bytes:
+    """Type, name and digest of a node, as hashed into its parent."""
+    encoded_name = name.encode('utf-8')
+    node_type = NODE_FILE if node[1] is None else NODE_DIR
+    return node_type + struct.pack('>H', len(encoded_name)) + encoded_name + node[0]
+
+
+def _dir_node(children: Dict[str, Node]) -> Node:
+    """Directory node, its digest computed from its children."""
+    digest = hashlib.sha256(b''.join(
+        _child_record(name, children[name]) for name in sorted(children)
+    )).digest()
+    return digest, children
+
+
+class MerkleManifest:
+    """
+    Merkle tree of "addon/relative/path" -> SHA-256 file hashes.
+    """
+
+    def __init__(self, root: Node):
+        self.root = root
+
+    # ========================================================================
+    # Construction
+    # ========================================================================
+
+    @classmethod
+    def from_file_hashes(cls, file_hashes: Dict[str, str]) -> 'MerkleManifest':
+        """
+        Build the manifest of flat file hashes.
+
+        Args:
+            file_hashes: Mapping of "addon/relative/path" to hex SHA-256
+
+        Returns:
+            MerkleManifest
+        """
+        tree = {}
+        for path, file_hash in file_hashes.items():
+            *dir_names, file_name = path.split('/')
+            directory = tree
+            for dir_name in dir_names:
+                directory = directory.setdefault(dir_name, {})
+            directory[file_name] = bytes.fromhex(file_hash)
+
+        def build(directory) -> Node:
+            return _dir_node({
+                name: (value, None) if isinstance(value, bytes) else build(value)
+                for name, value in directory.items()
+            })
+
+        return cls(build(tree))
+
+    @classmethod
+    def decode(cls, data) -> 'MerkleManifest':
+        """
+        Decode a binary manifest.
+
+        Args:
+            data: Encoded manifest (bytes-like)
+
+        Returns:
+            MerkleManifest
+
+        Raises:
+            ValueError: If the manifest is malformed or its hashes are inconsistent
+        """
+        data = memoryview(data)
+
+        def read(offset) -> Tuple[str, Node, int]:
+            node_type = bytes(data[offset:offset + 1])
+            name_length, = struct.unpack_from('>H', data, offset + 1)
+            offset += 3
+            name = bytes(data[offset:offset + name_length]).decode('utf-8')
+            offset += name_length
+            digest = bytes(data[offset:offset + DIGEST_SIZE])
+            offset += DIGEST_SIZE
+            if len(digest) != DIGEST_SIZE:
+                raise ValueError("Invalid file manifest: truncated node")
+
+            if node_type == NODE_FILE:
+                return name, (digest, None), offset
+            if node_type != NODE_DIR:
+                raise ValueError(f"Invalid file manifest: unknown node type {node_type!r}")
+
+            child_count, = struct.unpack_from('>I', data, offset)
+            offset += 4
+            children = {}
+            for _ in range(child_count):
+                child_name, child, offset = read(offset)
+                children[child_name] = child
+
+            node = _dir_node(children)
+            if node[0] != digest:
+                raise ValueError(f"Invalid file manifest: hash mismatch in directory {name!r}")
+            return name, node, offset
+
+        try:
+            _, root, offset = read(0)
+        except (struct.error, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid file manifest: {e}") from e
+
+        if offset != len(data):
+            raise ValueError("Invalid file manifest: trailing data")
+        return cls(root)
+
+    def encode(self) -> bytes:
+        """
+        Encode the manifest to its binary form.
+
+        Returns:
+            Encoded manifest
+        """
+        chunks = []
+
+        def write(name: str, node: Node):
+            chunks.append(_child_record(name, node))
+            if node[1] is not None:
+                chunks.append(struct.pack('>I', len(node[1])))
+                for child_name in sorted(node[1]):
+                    write(child_name, node[1][child_name])
+
+        write('', self.root)
+        return b''.join(chunks)
+
+    # ========================================================================
+    # Access
+    # ========================================================================
+
+    @property
+    def root_hash(self) -> str:
+        """Hex root hash."""
+        return self.root[0].hex()
+
+    @property
+    def addons(self) -> List[str]:
+        """Names of the addons covered by the manifest (top level directories)."""
+        return sorted(name for name, node in self.root[1].items() if node[1] is not None)
+
+    def to_file_hashes(self) -> Dict[str, str]:
+        """Flatten back to "addon/relative/path" -> hex SHA-256."""
+        file_hashes = {}
+
+        def walk(prefix: str, node: Node):
+            for name, child in node[1].items():
+                path = f"{prefix}{name}"
+                if child[1] is None:
+                    file_hashes[path] = child[0].hex()
+                else:
+                    walk(f"{path}/", child)
+
+        walk('', self.root)
+        return file_hashes
+
+    def __len__(self):
+        return len(self.to_file_hashes())
+
+    # ========================================================================
+    # Verification
+    # ========================================================================
+
+    def diff(self, current: 'MerkleManifest') -> List[Tuple[str, str]]:
+        """
+        Compare the current files against this (licensed) manifest.
+
+        The root hashes are compared first, then only the subtrees whose
+        hash differs are descended into.
+
+        Args:
+            current: Manifest of the files currently on disk
+
+        Returns:
+            Sorted list of (path, status), status being 'mismatch' (content
+            changed), 'missing' (licensed file not on disk) or 'added' (file
+            not in license); empty if every file matches
+        """
+        differences = []
+
+        def leaves(prefix: str, node: Node):
+            if node[1] is None:
+                yield prefix
+                return
+            for name, child in node[1].items():
+                yield from leaves(f"{prefix}/{name}" if prefix else name, child)
+
+        def compare(prefix: str, expected: Node, actual: Node):
+            if expected[0] == actual[0] and (expected[1] is None) == (actual[1] is None):
+                return
+
+            if expected[1] is None and actual[1] is None:
+                differences.append((prefix, 'mismatch'))
+                return
+
+            if expected[1] is None or actual[1] is None:
+                # A file replaced by a directory (or the opposite)
+                differences.extend((path, 'missing') for path in leaves(prefix, expected))
+                differences.extend((path, 'added') for path in leaves(prefix, actual))
+                return
+
+            for name in expected[1].keys() | actual[1].keys():
+                path = f"{prefix}/{name}" if prefix else name
+                if name not in actual[1]:
+                    differences.extend((leaf, 'missing') for leaf in leaves(path, expected[1][name]))
+                elif name not in expected[1]:
+                    differences.extend((leaf, 'added') for leaf in leaves(path, actual[1][name]))
+                else:
+                    compare(path, expected[1][name], actual[1][name])
+
+        compare('', self.root, current.root)
+        return sorted(differences)
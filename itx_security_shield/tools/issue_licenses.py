@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+ITX Security Shield - Bulk License Issuance
+
+Issue license files for many customers at once from a CSV or JSON batch
+file (see license_batch.py for the batch columns).
+
+Usage:
+    python3 issue_licenses.py renewals.csv \\
+        --private-key private.pem \\
+        --output-dir licenses/
+"""
+
+import sys
+import os
+import argparse
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.license_batch import (
+    read_batch_file,
+    parse_date,
+    build_license_data,
+    collect_file_hashes,
+    issue_licenses,
+    license_filename,
+)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Issue license files for many customers from a CSV or JSON batch file',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Renew every customer of a CSV file
+  python3 issue_licenses.py renewals.csv \\
+    --private-key private.pem \\
+    --output-dir licenses/
+
+  # JSON batch with file hashes, 8 worker processes
+  python3 issue_licenses.py customers.json \\
+    --private-key private.pem \\
+    --hash-addons-path /opt/odoo19/addons \\
+    --workers 8
+        """
+    )
+
+    parser.add_argument('batch_file', help='CSV or JSON batch file')
+    parser.add_argument('--private-key', required=True, help='RSA private key (PEM)')
+    parser.add_argument('--passphrase', default=os.environ.get('ITX_PRIVATE_KEY_PASSPHRASE'),
+                        help='Private key passphrase (default: $ITX_PRIVATE_KEY_PASSPHRASE)')
+    parser.add_argument('--output-dir', default='licenses', help='Output directory (default: licenses)')
+    parser.add_argument('--issue-date', help='Issue date YYYY-MM-DD (default: today)')
+    parser.add_argument('--workers', type=int, default=0, help='Worker processes (0 = CPU count)')
+    parser.add_argument('--hash-addons-path',
+                        help='Addons directory: store the file hashes of the licensed addons found there')
+
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("ITX Security Shield - Bulk License Issuance")
+    print("=" * 70)
+    print()
+
+    try:
+        entries = read_batch_file(args.batch_file)
+        issue_date = parse_date(args.issue_date, 'issue date') if args.issue_date else None
+
+        file_hashes = None
+        if args.hash_addons_path:
+            print("🔒 Hashing addon files...")
+            file_hashes = collect_file_hashes(args.hash_addons_path, entries)
+            print(f"  ✓ {len(file_hashes)} files hashed")
+
+        licenses = [build_license_data(entry, issue_date, file_hashes) for entry in entries]
+    except (OSError, ValueError) as e:
+        print(f"✗ Error reading batch file: {e}")
+        return 1
+
+    print(f"🔧 Encrypting {len(licenses)} licenses...")
+    try:
+        with open(args.private_key, 'rb') as f:
+            key_data = f.read()
+        passphrase = args.passphrase.encode('utf-8') if args.passphrase else None
+        encrypted = issue_licenses(licenses, key_data, passphrase, max_workers=args.workers or None)
+    except (OSError, ValueError) as e:
+        print(f"✗ Error encrypting licenses: {e}")
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    used_names = set()
+    for license_data, encrypted_data in zip(licenses, encrypted):
+        filename = license_filename(license_data)
+        stem, counter = filename[:-len('.lic')], 2
+        while filename in used_names:
+            filename, counter = f"{stem}_{counter}.lic", counter + 1
+        used_names.add(filename)
+
+        with open(os.path.join(args.output_dir, filename), 'wb') as f:
+            f.write(encrypted_data)
+        print(f"  ✓ {filename} ({len(encrypted_data)} bytes)")
+
+    print()
+    print(f"✅ {len(licenses)} licenses written to {args.output_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
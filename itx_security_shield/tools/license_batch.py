@@ -0,0 +1,301 @@
+"""
+ITX Security Shield - Bulk License Issuance
+
+Issue licenses for many customers at once (renewals, new contracts) from a
+CSV or JSON batch file.
+
+Batch entries (CSV columns / JSON keys):
+    - customer_name, expiry_date (YYYY-MM-DD): required
+    - po_number, contract_number, contact_email, contact_phone
+    - licensed_addons: comma-separated (CSV) or list (JSON)
+    - max_instances, concurrent_users, grace_period_days, maintenance_until
+    - license_type, license_tier, support_level
+    - Instances: hardware_fingerprint, machine_id, hostname columns (CSV
+      rows of the same customer, PO and contract are merged into a single
+      license with one instance per row), or an "instances" list (JSON)
+
+The signing key is read once and parsed once per worker process; licenses
+are encrypted in parallel worker processes by the command line
+(issue_licenses.py), and in process or in a bounded thread pool by the Odoo
+wizard, which must never fork an HTTP worker.
+"""
+
+import os
+import csv
+import io
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from .license_format import LicenseData, InstanceInfo
+from .license_crypto import encrypt_license_hybrid, load_private_key_pem
+from .file_integrity import hash_addons
+
+# Columns identifying the license a CSV row (instance) belongs to
+LICENSE_KEY_FIELDS = ('customer_name', 'po_number', 'contract_number')
+
+INSTANCE_FIELDS = ('hardware_fingerprint', 'machine_id', 'hostname')
+
+INTEGER_FIELDS = ('max_instances', 'concurrent_users', 'grace_period_days')
+
+# Threads encrypting licenses when worker processes are not allowed (Odoo)
+MAX_THREAD_WORKERS = 4
+
+
+# ============================================================================
+# Batch File Parsing
+# ============================================================================
+
+def parse_batch(data: bytes, filename: str) -> List[Dict]:
+    """
+    Parse a CSV or JSON batch file into license entries.
+
+    Args:
+        data: File content
+        filename: File name (its extension selects the format)
+
+    Returns:
+        List of license entries (dicts), instances grouped under "instances"
+
+    Raises:
+        ValueError: If the format is unknown or the file is malformed
+    """
+    text = data.decode('utf-8-sig')
+    extension = os.path.splitext(filename)[1].lower()
+
+    if extension == '.json':
+        try:
+            entries = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON batch file: {e}") from e
+        if isinstance(entries, dict):
+            entries = entries.get('licenses', [])
+        if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+            raise ValueError("Invalid JSON batch file: expected a list of licenses")
+        return entries
+
+    if extension == '.csv':
+        return _group_csv_rows(csv.DictReader(io.StringIO(text)))
+
+    raise ValueError(f"Unsupported batch file format: {filename} (expected .csv or .json)")
+
+
+def read_batch_file(batch_path: str) -> List[Dict]:
+    """Read and parse a CSV or JSON batch file."""
+    with open(batch_path, 'rb') as f:
+        return parse_batch(f.read(), batch_path)
+
+
+def _group_csv_rows(rows) -> List[Dict]:
+    """Merge the CSV rows of the same license, one instance per row."""
+    entries = {}
+
+    for row in rows:
+        row = {key.strip(): (value or '').strip() for key, value in row.items() if key}
+        key = tuple(row.get(field, '') for field in LICENSE_KEY_FIELDS)
+        entry = entries.setdefault(key, dict(
+            {field: value for field, value in row.items() if field not in INSTANCE_FIELDS},
+            instances=[],
+        ))
+        if row.get('hardware_fingerprint'):
+            entry['instances'].append({field: row.get(field, '') for field in INSTANCE_FIELDS})
+
+    return list(entries.values())
+
+
+def parse_date(value, field_name: str) -> str:
+    """Validate a YYYY-MM-DD date."""
+    try:
+        return datetime.strptime(str(value), '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"Invalid {field_name}: {value} (expected YYYY-MM-DD)")
+
+
+def build_license_data(entry: Dict, issue_date: str = None,
+                       file_hashes: Optional[Dict[str, str]] = None) -> LicenseData:
+    """
+    Build the LicenseData of a batch entry.
+
+    Args:
+        entry: License entry from parse_batch
+        issue_date: Issue date YYYY-MM-DD (default: today)
+        file_hashes: Hashes of the addon files, filtered to the licensed addons
+
+    Returns:
+        LicenseData object
+
+    Raises:
+        ValueError: If a required field is missing or a value is invalid
+    """
+    customer_name = entry.get('customer_name')
+    if not customer_name:
+        raise ValueError("customer_name is required")
+    if not entry.get('expiry_date'):
+        raise ValueError(f"{customer_name}: expiry_date is required")
+
+    try:
+        addons = entry.get('licensed_addons') or []
+        if isinstance(addons, str):
+            addons = [addon.strip() for addon in addons.split(',') if addon.strip()]
+
+        integers = {
+            field: int(entry[field]) for field in INTEGER_FIELDS
+            if entry.get(field) not in (None, '')
+        }
+
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        registered_instances = [
+            InstanceInfo(
+                instance_id=index,
+                hardware_fingerprint=instance.get('hardware_fingerprint', ''),
+                machine_id=instance.get('machine_id', ''),
+                hostname=instance.get('hostname', ''),
+                registered_date=now,
+                last_seen=now,
+                status='active',
+            ).to_dict()
+            for index, instance in enumerate(entry.get('instances') or [], start=1)
+        ]
+
+        expiry_date = parse_date(entry['expiry_date'], 'expiry_date')
+        maintenance_until = entry.get('maintenance_until')
+
+        if file_hashes:
+            licensed = set(addons) | {'itx_security_shield'}
+            file_hashes = {path: file_hash for path, file_hash in file_hashes.items()
+                           if path.split('/', 1)[0] in licensed}
+
+        return LicenseData(
+            customer_name=customer_name,
+            po_number=entry.get('po_number') or '',
+            contract_number=entry.get('contract_number') or '',
+            contact_email=entry.get('contact_email') or '',
+            contact_phone=entry.get('contact_phone') or '',
+            licensed_addons=addons,
+            max_instances=integers.get('max_instances', max(len(registered_instances), 1)),
+            concurrent_users=integers.get('concurrent_users', 0),
+            registered_instances=registered_instances,
+            issue_date=issue_date or date.today().strftime('%Y-%m-%d'),
+            expiry_date=expiry_date,
+            grace_period_days=integers.get('grace_period_days', 30),
+            maintenance_until=parse_date(maintenance_until, 'maintenance_until') if maintenance_until else expiry_date,
+            license_type=entry.get('license_type') or 'production',
+            license_tier=entry.get('license_tier') or 'standard',
+            support_level=entry.get('support_level') or 'standard',
+            features={
+                'hardware_binding': bool(registered_instances),
+                'file_integrity_check': bool(file_hashes),
+                'debug_detection': False,
+            },
+            file_hashes=file_hashes or {},
+        )
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{customer_name}: {e}") from e
+
+
+def license_filename(license_data: LicenseData) -> str:
+    """File name of an issued license."""
+    parts = [license_data.customer_name, license_data.contract_number or license_data.po_number]
+    return '_'.join(part.replace(' ', '_').replace('/', '-') for part in parts if part) + '_license.lic'
+
+
+# ============================================================================
+# Parallel Encryption
+# ============================================================================
+
+# Signing key of a worker process, parsed once by _init_worker
+_worker_private_key = None
+
+
+def _init_worker(key_data: bytes, passphrase: Optional[bytes]):
+    """Parse the signing key once per worker process."""
+    global _worker_private_key
+    _worker_private_key = load_private_key_pem(key_data, passphrase)
+
+
+def _encrypt_worker(license_data: LicenseData) -> bytes:
+    """Encrypt one license with the worker signing key."""
+    return encrypt_license_hybrid(license_data, private_key=_worker_private_key)
+
+
+def issue_licenses(licenses: List[LicenseData], key_data: bytes, passphrase: bytes = None,
+                   max_workers: int = None, use_processes: bool = True) -> List[bytes]:
+    """
+    Encrypt licenses in parallel.
+
+    Args:
+        licenses: LicenseData objects to encrypt
+        key_data: PEM encoded RSA private key (read once by the caller)
+        passphrase: Passphrase for encrypted private key (optional)
+        max_workers: Workers (default: CPU count for processes, 1 for threads;
+            1 = in process)
+        use_processes: Encrypt in forked worker processes (command line only).
+            When False, licenses are encrypted in a thread pool of at most
+            MAX_THREAD_WORKERS threads of the current process.
+
+    Returns:
+        Encrypted licenses, in the order of licenses
+
+    Raises:
+        ValueError: If the key cannot be loaded or encryption fails
+    """
+    # Fail fast on a bad key, before starting any worker
+    private_key = load_private_key_pem(key_data, passphrase)
+
+    def encrypt(license_data):
+        return encrypt_license_hybrid(license_data, private_key=private_key)
+
+    if not use_processes:
+        max_workers = min(max_workers or 1, MAX_THREAD_WORKERS, len(licenses))
+        if max_workers <= 1:
+            return [encrypt(license_data) for license_data in licenses]
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='itxss_license_batch') as executor:
+            return list(executor.map(encrypt, licenses))
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(licenses))
+    if max_workers <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        return [encrypt(license_data) for license_data in licenses]
+
+    # Forked workers inherit the loaded modules (no re-import of the addon)
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('fork'),
+        initializer=_init_worker,
+        initargs=(key_data, passphrase),
+    ) as executor:
+        return list(executor.map(
+            _encrypt_worker, licenses,
+            chunksize=max(1, len(licenses) // (max_workers * 4)),
+        ))
+
+
+def licensed_addon_names(entries: List[Dict]) -> set:
+    """Addons licensed by any entry, plus itx_security_shield (hashed once per batch)."""
+    addon_names = {'itx_security_shield'}
+    for entry in entries:
+        addons = entry.get('licensed_addons') or []
+        if isinstance(addons, str):
+            addons = addons.split(',')
+        addon_names.update(addon.strip() for addon in addons if addon.strip())
+    return addon_names
+
+
+def collect_file_hashes(addons_path: str, entries: List[Dict]) -> Dict[str, str]:
+    """
+    Hash once the addons licensed by any entry (and itx_security_shield).
+
+    Args:
+        addons_path: Addons directory
+        entries: License entries from parse_batch
+
+    Returns:
+        Dict mapping "addon/relative/path" keys to SHA-256 hashes
+    """
+    addon_paths = {
+        name: os.path.join(addons_path, name) for name in licensed_addon_names(entries)
+        if os.path.isdir(os.path.join(addons_path, name))
+    }
+    return hash_addons(addon_paths)
@@ -7,11 +7,16 @@ Handles AES-256-GCM encryption for production.lic files.
 
 import os
 import json
+import dataclasses
 import zlib
 import hashlib
 import struct
+import tempfile
+import threading
+from functools import lru_cache
 from typing import Tuple, Optional
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
@@ -26,7 +31,12 @@ from .license_format import (
     FOOTER_SIZE,
     IV_SIZE,
     AUTH_TAG_SIZE,
+    FLAGS_OFFSET,
+    FLAG_FILE_MANIFEST,
+    LICENSE_VERSION_MANIFEST,
+    MANIFEST_AAD,
 )
+from .file_manifest import MerkleManifest
 
 
 # ============================================================================
@@ -51,6 +61,7 @@ DEFAULT_PUBLIC_KEY_PATH = os.path.join(
 )
 
 
+@lru_cache(maxsize=8)
 def derive_key(passphrase: bytes = MASTER_PASSPHRASE, salt: bytes = SALT) -> bytes:
     """
     Derive 256-bit encryption key from passphrase using PBKDF2.
@@ -58,6 +69,9 @@ def derive_key(passphrase: bytes = MASTER_PASSPHRASE, salt: bytes = SALT) -> byt
     NOTE: This is kept for backward compatibility with old license files.
     New licenses use hybrid encryption (RSA + AES).
 
+    The result is memoized per (passphrase, salt): PBKDF2 with 100,000
+    iterations is only paid once per process.
+
     Args:
         passphrase: Master passphrase
         salt: Salt for key derivation
@@ -74,9 +88,88 @@ def derive_key(passphrase: bytes = MASTER_PASSPHRASE, salt: bytes = SALT) -> byt
     return kdf.derive(passphrase)
 
 
+# ============================================================================
+# Key Store
+# ============================================================================
+
+# Parsed public (verification) keys: {real path: ((mtime_ns, size), key)}
+# Private keys are never cached: neither they nor their passphrases stay in
+# the worker memory once the license is issued.
+_key_cache = {}
+_key_cache_lock = threading.Lock()
+
+
+def _load_public_key(key_path: str):
+    """
+    Load a PEM public key file through the key cache.
+
+    The parsed key object is kept per (path, mtime, size): replacing a key
+    file is picked up on the next call, while repeated loads cost a stat().
+
+    Args:
+        key_path: Path to PEM file
+
+    Raises:
+        FileNotFoundError: If key file not found
+        ValueError: If key cannot be loaded
+    """
+    try:
+        stat = os.stat(key_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Public key not found: {key_path}")
+
+    cache_key = os.path.realpath(key_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _key_cache_lock:
+        cached = _key_cache.get(cache_key)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    try:
+        with open(key_path, 'rb') as f:
+            key = serialization.load_pem_public_key(f.read(), backend=default_backend())
+    except Exception as e:
+        raise ValueError(f"Failed to load public key: {e}") from e
+
+    with _key_cache_lock:
+        _key_cache[cache_key] = (signature, key)
+
+    return key
+
+
+def load_private_key_pem(key_data: bytes, passphrase: bytes = None):
+    """
+    Load RSA private key from PEM data (e.g. an uploaded key file).
+
+    The key is parsed on every call and never cached: callers issuing
+    several licenses load it once and reuse the returned object.
+
+    Args:
+        key_data: PEM encoded private key
+        passphrase: Passphrase for encrypted private key (optional)
+
+    Returns:
+        RSA private key object
+
+    Raises:
+        ValueError: If key cannot be loaded
+    """
+    try:
+        return serialization.load_pem_private_key(bytes(key_data), password=passphrase, backend=default_backend())
+    except Exception as e:
+        raise ValueError(f"Failed to load private key: {e}") from e
+
+
+def clear_key_cache() -> None:
+    """Drop every cached public key (e.g. after a key rotation in place)."""
+    with _key_cache_lock:
+        _key_cache.clear()
+
+
 def load_private_key(key_path: str = None, passphrase: bytes = None):
     """
-    Load RSA private key from PEM file.
+    Load RSA private key from PEM file (not cached).
 
     Args:
         key_path: Path to private key file (default: native/keys/private_dev.pem)
@@ -95,23 +188,13 @@ def load_private_key(key_path: str = None, passphrase: bytes = None):
     if not os.path.exists(key_path):
         raise FileNotFoundError(f"Private key not found: {key_path}")
 
-    try:
-        with open(key_path, 'rb') as f:
-            key_data = f.read()
-
-        private_key = serialization.load_pem_private_key(
-            key_data,
-            password=passphrase,
-            backend=default_backend()
-        )
-        return private_key
-    except Exception as e:
-        raise ValueError(f"Failed to load private key: {e}") from e
+    with open(key_path, 'rb') as f:
+        return load_private_key_pem(f.read(), passphrase)
 
 
 def load_public_key(key_path: str = None):
     """
-    Load RSA public key from PEM file.
+    Load RSA public key from PEM file (cached per path and mtime).
 
     Args:
         key_path: Path to public key file (default: native/keys/public_dev.pem)
@@ -126,20 +209,206 @@ def load_public_key(key_path: str = None):
     if key_path is None:
         key_path = DEFAULT_PUBLIC_KEY_PATH
 
-    if not os.path.exists(key_path):
-        raise FileNotFoundError(f"Public key not found: {key_path}")
+    return _load_public_key(key_path)
 
-    try:
-        with open(key_path, 'rb') as f:
-            key_data = f.read()
 
-        public_key = serialization.load_pem_public_key(
-            key_data,
-            backend=default_backend()
+class SignatureContext:
+    """
+    RSA-PSS (SHA-256, MGF1, max salt) parameters of the license signature.
+
+    The padding and hash objects are built once and shared by every sign
+    and verify call.
+    """
+
+    def __init__(self):
+        self.algorithm = hashes.SHA256()
+        self.padding = padding.PSS(
+            mgf=padding.MGF1(self.algorithm),
+            salt_length=padding.PSS.MAX_LENGTH
         )
-        return public_key
+
+    def sign(self, private_key, data) -> bytes:
+        """Sign data with the RSA private key."""
+        return private_key.sign(data, self.padding, self.algorithm)
+
+    def verify(self, public_key, signature, data) -> None:
+        """
+        Verify a signature with the RSA public key.
+
+        Raises:
+            cryptography.exceptions.InvalidSignature: If the signature is invalid
+        """
+        public_key.verify(signature, data, self.padding, self.algorithm)
+
+
+SIGNATURE_CONTEXT = SignatureContext()
+
+
+# ============================================================================
+# Container Parsing
+# ============================================================================
+
+# Ciphertext bytes decrypted and inflated per step
+DECRYPT_CHUNK_SIZE = 64 * 1024
+
+
+def _read_section(data: memoryview, offset: int):
+    """
+    Extract the length-prefixed section starting at offset.
+
+    Args:
+        data: Whole license file (memoryview, sections are views into it)
+        offset: Offset of the 4-byte section length
+
+    Returns:
+        Tuple of (section view, offset after the section)
+
+    Raises:
+        ValueError: If the section overruns the footer
+    """
+    end = len(data) - FOOTER_SIZE
+    if offset + 4 > end:
+        raise ValueError("Invalid license file: truncated section")
+
+    section_length = struct.unpack_from('<I', data, offset)[0]
+    offset += 4
+    if offset + section_length > end:
+        raise ValueError("Invalid license file: truncated section")
+
+    return data[offset:offset+section_length], offset + section_length
+
+
+def _checksum_valid(data: memoryview) -> bool:
+    """Check the SHA-256 footer against everything before it (hashed in place)."""
+    return hashlib.sha256(data[:-FOOTER_SIZE]).digest() == data[-FOOTER_SIZE:]
+
+
+def _decrypt_section(key: bytes, section: memoryview, associated_data: bytes = None) -> bytes:
+    """
+    Decrypt and decompress an IV + ciphertext + tag section.
+
+    The ciphertext is decrypted chunk by chunk straight from the section
+    view and every chunk is inflated as it comes out, so neither the
+    ciphertext nor the compressed plaintext is copied whole. Nothing is
+    returned before the GCM tag is verified.
+
+    Args:
+        key: AES-256 key
+        section: IV (12 bytes) + ciphertext + tag (16 bytes)
+        associated_data: GCM associated data
+
+    Returns:
+        Decompressed plaintext
+
+    Raises:
+        cryptography.exceptions.InvalidTag: If authentication fails
+        zlib.error: If the authenticated plaintext does not decompress
+    """
+    if len(section) < IV_SIZE + AUTH_TAG_SIZE:
+        raise ValueError("Invalid license file: encrypted section too small")
+
+    decryptor = Cipher(
+        algorithms.AES(bytes(key)),
+        modes.GCM(bytes(section[:IV_SIZE]), bytes(section[-AUTH_TAG_SIZE:])),
+    ).decryptor()
+    if associated_data:
+        decryptor.authenticate_additional_data(associated_data)
+
+    ciphertext = section[IV_SIZE:-AUTH_TAG_SIZE]
+    inflater = zlib.decompressobj()
+    chunks = []
+    inflate_error = None
+
+    for start in range(0, len(ciphertext), DECRYPT_CHUNK_SIZE):
+        compressed = decryptor.update(ciphertext[start:start+DECRYPT_CHUNK_SIZE])
+        if inflate_error is None:
+            try:
+                chunks.append(inflater.decompress(compressed))
+            except zlib.error as e:
+                # Keep decrypting: a tag failure takes precedence
+                inflate_error = e
+
+    decryptor.finalize()
+
+    if inflate_error is not None:
+        raise inflate_error
+    chunks.append(inflater.flush())
+    if not inflater.eof:
+        raise zlib.error("incomplete or truncated stream")
+
+    return b''.join(chunks)
+
+
+# ============================================================================
+# File Manifest Section
+# ============================================================================
+
+def _split_file_manifest(license_data: LicenseData):
+    """
+    Move the file hashes out of the JSON payload into a Merkle manifest.
+
+    Args:
+        license_data: LicenseData object
+
+    Returns:
+        Tuple of (payload LicenseData, encoded manifest or None)
+    """
+    if not license_data.file_hashes:
+        return license_data, None
+
+    manifest = MerkleManifest.from_file_hashes(license_data.file_hashes)
+    payload = dataclasses.replace(license_data, file_hashes={}, file_manifest_root=manifest.root_hash)
+    return payload, manifest.encode()
+
+
+def _set_manifest_header(header: bytearray, manifest_data: Optional[bytes]) -> None:
+    """Flag a header whose file carries a file manifest section (format 1.1)."""
+    if manifest_data is not None:
+        header[4:8] = LICENSE_VERSION_MANIFEST
+        header[FLAGS_OFFSET] |= FLAG_FILE_MANIFEST
+
+
+def _encrypt_manifest_section(key: bytes, manifest_data: Optional[bytes]) -> bytes:
+    """
+    Encrypt the manifest with the license AES key.
+
+    Section: Length (4 bytes) + IV (12 bytes) + compressed ciphertext with tag
+    """
+    if manifest_data is None:
+        return b''
+
+    iv = os.urandom(IV_SIZE)
+    ciphertext = AESGCM(key).encrypt(iv, zlib.compress(manifest_data, level=9), MANIFEST_AAD)
+    return struct.pack('<I', IV_SIZE + len(ciphertext)) + iv + ciphertext
+
+
+def _read_manifest_section(data: memoryview, offset: int):
+    """
+    Extract the manifest section starting at offset, if the header flags one.
+
+    Returns:
+        Tuple of (manifest section view or None, offset after the section)
+    """
+    if not data[FLAGS_OFFSET] & FLAG_FILE_MANIFEST:
+        return None, offset
+
+    return _read_section(data, offset)
+
+
+def _decrypt_manifest_section(key: bytes, section: Optional[memoryview], license_data: LicenseData) -> None:
+    """Decrypt the manifest section and attach it to the license data."""
+    if section is None:
+        return
+
+    try:
+        manifest = MerkleManifest.decode(_decrypt_section(key, section, MANIFEST_AAD))
     except Exception as e:
-        raise ValueError(f"Failed to load public key: {e}") from e
+        raise ValueError(f"File manifest decryption failed: {e}") from e
+
+    if manifest.root_hash != license_data.file_manifest_root:
+        raise ValueError("Invalid license file: file manifest root mismatch")
+
+    license_data.file_manifest = manifest
 
 
 # ============================================================================
@@ -157,6 +426,11 @@ def encrypt_license(license_data: LicenseData, passphrase: bytes = MASTER_PASSPH
             - Encryption: "AES256GCM" (12 bytes)
             - Reserved (44 bytes)
 
+        File Manifest (only if the license has file hashes, version 1.1):
+            - Section Length (4 bytes, unsigned int)
+            - IV (12 bytes)
+            - Ciphertext of the compressed Merkle manifest (variable, with tag)
+
         Encrypted Data:
             - IV (12 bytes)
             - Ciphertext (variable)
@@ -175,6 +449,9 @@ def encrypt_license(license_data: LicenseData, passphrase: bytes = MASTER_PASSPH
     # Derive encryption key
     key = derive_key(passphrase)
 
+    # File hashes go to the binary manifest section
+    license_data, manifest_data = _split_file_manifest(license_data)
+
     # Convert license to JSON and compress
     json_data = license_data.to_json().encode('utf-8')
     compressed_data = zlib.compress(json_data, level=9)
@@ -191,20 +468,24 @@ def encrypt_license(license_data: LicenseData, passphrase: bytes = MASTER_PASSPH
     header[0:4] = MAGIC_BYTES
     header[4:8] = LICENSE_VERSION
     header[8:20] = ENCRYPTION_TYPE
+    _set_manifest_header(header, manifest_data)
+
+    # File manifest section
+    manifest_section = _encrypt_manifest_section(key, manifest_data)
 
     # Encrypted data section
     encrypted_section = iv + ciphertext
 
     # Calculate footer checksum (SHA-256 of header + encrypted data)
-    checksum_data = bytes(header) + encrypted_section
+    checksum_data = bytes(header) + manifest_section + encrypted_section
     footer = hashlib.sha256(checksum_data).digest()
 
     # Combine all sections
-    return bytes(header) + encrypted_section + footer
+    return bytes(header) + manifest_section + encrypted_section + footer
 
 
 def encrypt_license_hybrid(license_data: LicenseData, private_key_path: str = None,
-                          private_key_passphrase: bytes = None) -> bytes:
+                          private_key_passphrase: bytes = None, private_key=None) -> bytes:
     """
     Encrypt license data using hybrid encryption (RSA + AES).
 
@@ -225,6 +506,11 @@ def encrypt_license_hybrid(license_data: LicenseData, private_key_path: str = No
             - Key Length (4 bytes, unsigned int)
             - Encrypted Key (variable, ~512 bytes for RSA-4096)
 
+        File Manifest (only if the license has file hashes, version 1.1):
+            - Section Length (4 bytes, unsigned int)
+            - IV (12 bytes)
+            - Ciphertext of the compressed Merkle manifest (variable, with tag)
+
         Encrypted Data:
             - IV (12 bytes)
             - Ciphertext (variable)
@@ -237,6 +523,7 @@ def encrypt_license_hybrid(license_data: LicenseData, private_key_path: str = No
         license_data: LicenseData object
         private_key_path: Path to RSA private key (for signing/encryption)
         private_key_passphrase: Passphrase for private key (if encrypted)
+        private_key: Already loaded RSA private key (skips private_key_path)
 
     Returns:
         Encrypted binary data
@@ -246,11 +533,15 @@ def encrypt_license_hybrid(license_data: LicenseData, private_key_path: str = No
         ValueError: If encryption fails
     """
     # Load RSA private key
-    private_key = load_private_key(private_key_path, private_key_passphrase)
+    if private_key is None:
+        private_key = load_private_key(private_key_path, private_key_passphrase)
 
     # Generate random AES-256 key (32 bytes)
     aes_key = os.urandom(32)
 
+    # File hashes go to the binary manifest section
+    license_data, manifest_data = _split_file_manifest(license_data)
+
     # Convert license to JSON and compress
     json_data = license_data.to_json().encode('utf-8')
     compressed_data = zlib.compress(json_data, level=9)
@@ -263,20 +554,14 @@ def encrypt_license_hybrid(license_data: LicenseData, private_key_path: str = No
     ciphertext = aesgcm.encrypt(iv, compressed_data, None)
 
     # Sign AES key with RSA private key (digital signature)
-    signature = private_key.sign(
-        aes_key,
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.MAX_LENGTH
-        ),
-        hashes.SHA256()
-    )
+    signature = SIGNATURE_CONTEXT.sign(private_key, aes_key)
 
     # Build file structure
     header = bytearray(HEADER_SIZE)
     header[0:4] = MAGIC_BYTES
     header[4:8] = LICENSE_VERSION
     header[8:20] = b'RSA_AES256\x00\x00'  # Indicates signed encryption
+    _set_manifest_header(header, manifest_data)
 
     # Signature section (length + signature)
     sig_length = struct.pack('<I', len(signature))
@@ -286,23 +571,29 @@ def encrypt_license_hybrid(license_data: LicenseData, private_key_path: str = No
     key_length = struct.pack('<I', len(aes_key))
     key_section = key_length + aes_key
 
+    # File manifest section
+    manifest_section = _encrypt_manifest_section(aes_key, manifest_data)
+
     # Encrypted data section
     encrypted_section = iv + ciphertext
 
     # Calculate footer checksum
-    checksum_data = bytes(header) + sig_section + key_section + encrypted_section
+    checksum_data = bytes(header) + sig_section + key_section + manifest_section + encrypted_section
     footer = hashlib.sha256(checksum_data).digest()
 
     # Combine all sections
-    return bytes(header) + sig_section + key_section + encrypted_section + footer
+    return bytes(header) + sig_section + key_section + manifest_section + encrypted_section + footer
 
 
-def decrypt_license_hybrid(encrypted_data: bytes, public_key_path: str = None) -> LicenseData:
+def decrypt_license_hybrid(encrypted_data, public_key_path: str = None) -> LicenseData:
     """
     Decrypt license data from hybrid encryption (RSA + AES).
 
+    The sections are parsed as views into encrypted_data (no copies), so a
+    license file read into one buffer is decrypted in place.
+
     Args:
-        encrypted_data: Encrypted binary data
+        encrypted_data: Encrypted binary data (bytes-like, e.g. bytes or bytearray)
         public_key_path: Path to RSA public key (for decryption)
 
     Returns:
@@ -311,92 +602,70 @@ def decrypt_license_hybrid(encrypted_data: bytes, public_key_path: str = None) -
     Raises:
         ValueError: If file format is invalid or decryption fails
     """
+    data = memoryview(encrypted_data)
+
     # Validate minimum size
     min_size = HEADER_SIZE + 4 + 256 + IV_SIZE + 16 + FOOTER_SIZE  # header + key_len + min_key + IV + min_data + footer
-    if len(encrypted_data) < min_size:
+    if len(data) < min_size:
         raise ValueError(f"Invalid license file: too small (expected >= {min_size} bytes)")
 
-    # Extract header and footer
-    header = encrypted_data[:HEADER_SIZE]
-    footer = encrypted_data[-FOOTER_SIZE:]
-
     # Validate header
-    if header[0:4] != MAGIC_BYTES:
+    if data[0:4] != MAGIC_BYTES:
         raise ValueError("Invalid license file: wrong magic bytes")
 
     # Check encryption type
-    encryption_type = header[8:20]
+    encryption_type = bytes(data[8:20])
     if encryption_type != b'RSA_AES256\x00\x00':
         raise ValueError(f"Invalid encryption type: expected RSA_AES256, got {encryption_type}")
 
-    # Extract signature
-    offset = HEADER_SIZE
-    sig_length = struct.unpack('<I', encrypted_data[offset:offset+4])[0]
-    offset += 4
-    signature = encrypted_data[offset:offset+sig_length]
-    offset += sig_length
+    # Extract signature and AES key
+    signature, offset = _read_section(data, HEADER_SIZE)
+    aes_key, offset = _read_section(data, offset)
 
-    # Extract AES key
-    key_length = struct.unpack('<I', encrypted_data[offset:offset+4])[0]
-    offset += 4
-    aes_key = encrypted_data[offset:offset+key_length]
-    offset += key_length
+    # Extract file manifest section (version 1.1)
+    manifest_section, offset = _read_manifest_section(data, offset)
 
     # Extract encrypted data section
-    encrypted_section = encrypted_data[offset:-FOOTER_SIZE]
+    encrypted_section = data[offset:-FOOTER_SIZE]
 
     # Validate checksum
-    checksum_data = header + encrypted_data[HEADER_SIZE:-FOOTER_SIZE]
-    expected_checksum = hashlib.sha256(checksum_data).digest()
-    if footer != expected_checksum:
+    if not _checksum_valid(data):
         raise ValueError("Invalid license file: checksum mismatch (file may be corrupted or tampered)")
 
     # Verify signature with RSA public key
     try:
         public_key = load_public_key(public_key_path)
-        public_key.verify(
-            signature,
-            aes_key,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
+        SIGNATURE_CONTEXT.verify(public_key, signature, aes_key)
     except Exception as e:
         raise ValueError(f"Invalid signature: license may be counterfeit or tampered: {e}") from e
 
-    # Extract IV and ciphertext
-    iv = encrypted_section[:IV_SIZE]
-    ciphertext = encrypted_section[IV_SIZE:]
-
-    # Decrypt data with AES-256-GCM
+    # Decrypt data with AES-256-GCM and decompress
+    aes_key = bytes(aes_key)
     try:
-        aesgcm = AESGCM(aes_key)
-        compressed_data = aesgcm.decrypt(iv, ciphertext, None)
+        json_data = _decrypt_section(aes_key, encrypted_section)
+    except zlib.error as e:
+        raise ValueError(f"Decompression failed: {e}") from e
     except Exception as e:
         raise ValueError(f"AES decryption failed: {e}") from e
 
-    # Decompress
-    try:
-        json_data = zlib.decompress(compressed_data)
-    except Exception as e:
-        raise ValueError(f"Decompression failed: {e}") from e
-
     # Parse JSON
     try:
         license_dict = json.loads(json_data.decode('utf-8'))
-        return LicenseData.from_dict(license_dict)
+        license_data = LicenseData.from_dict(license_dict)
     except Exception as e:
         raise ValueError(f"JSON parsing failed: {e}") from e
 
+    # Attach the file manifest
+    _decrypt_manifest_section(aes_key, manifest_section, license_data)
+    return license_data
+
 
-def decrypt_license(encrypted_data: bytes, passphrase: bytes = MASTER_PASSPHRASE) -> LicenseData:
+def decrypt_license(encrypted_data, passphrase: bytes = MASTER_PASSPHRASE) -> LicenseData:
     """
     Decrypt license data from binary format.
 
     Args:
-        encrypted_data: Encrypted binary data
+        encrypted_data: Encrypted binary data (bytes-like, e.g. bytes or bytearray)
         passphrase: Decryption passphrase
 
     Returns:
@@ -407,55 +676,94 @@ def decrypt_license(encrypted_data: bytes, passphrase: bytes = MASTER_PASSPHRASE
     """
     # Validate minimum size
     # Note: AUTH_TAG_SIZE is included in ciphertext from aesgcm.encrypt()
+    data = memoryview(encrypted_data)
     min_size = HEADER_SIZE + IV_SIZE + 16 + FOOTER_SIZE  # IV + minimal ciphertext with tag + footer
-    if len(encrypted_data) < min_size:
+    if len(data) < min_size:
         raise ValueError(f"Invalid license file: too small (expected >= {min_size} bytes)")
 
-    # Extract sections
-    header = encrypted_data[:HEADER_SIZE]
-    footer = encrypted_data[-FOOTER_SIZE:]
-    encrypted_section = encrypted_data[HEADER_SIZE:-FOOTER_SIZE]
-
     # Validate header
-    if header[0:4] != MAGIC_BYTES:
+    if data[0:4] != MAGIC_BYTES:
         raise ValueError("Invalid license file: wrong magic bytes")
 
     # Validate checksum
-    checksum_data = header + encrypted_section
-    expected_checksum = hashlib.sha256(checksum_data).digest()
-    if footer != expected_checksum:
+    if not _checksum_valid(data):
         raise ValueError("Invalid license file: checksum mismatch (file may be corrupted or tampered)")
 
-    # Extract IV and ciphertext
-    iv = encrypted_section[:IV_SIZE]
-    ciphertext = encrypted_section[IV_SIZE:]
+    # Extract file manifest section (version 1.1) and encrypted data section
+    manifest_section, offset = _read_manifest_section(data, HEADER_SIZE)
+    encrypted_section = data[offset:-FOOTER_SIZE]
 
-    # Decrypt with AES-256-GCM
+    # Decrypt with AES-256-GCM and decompress
+    key = derive_key(passphrase)
     try:
-        key = derive_key(passphrase)
-        aesgcm = AESGCM(key)
-        compressed_data = aesgcm.decrypt(iv, ciphertext, None)
+        json_data = _decrypt_section(key, encrypted_section)
+    except zlib.error as e:
+        raise ValueError(f"Decompression failed: {e}") from e
     except Exception as e:
         raise ValueError(f"Decryption failed: {e}") from e
 
-    # Decompress
-    try:
-        json_data = zlib.decompress(compressed_data)
-    except Exception as e:
-        raise ValueError(f"Decompression failed: {e}") from e
-
     # Parse JSON
     try:
         license_dict = json.loads(json_data.decode('utf-8'))
-        return LicenseData.from_dict(license_dict)
+        license_data = LicenseData.from_dict(license_dict)
     except Exception as e:
         raise ValueError(f"JSON parsing failed: {e}") from e
 
+    # Attach the file manifest
+    _decrypt_manifest_section(key, manifest_section, license_data)
+    return license_data
+
 
 # ============================================================================
 # File I/O Functions
 # ============================================================================
 
+def write_file_atomic(output_path: str, data: bytes) -> None:
+    """
+    Write a license file atomically (temporary file, then rename).
+
+    Workers loading the license concurrently see either the old or the new
+    file, never a partially written one.
+
+    Args:
+        output_path: Path of the file to (re)write
+        data: File content
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)), prefix='.itx_lic_')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _read_file(f) -> bytearray:
+    """
+    Read a whole license file into a single buffer (readinto, no intermediate copies).
+
+    The file is not memory mapped: a license rewritten in place while a
+    worker has it mapped would kill that worker with SIGBUS.
+    """
+    buffer = bytearray(os.fstat(f.fileno()).st_size)
+    read = 0
+    with memoryview(buffer) as view:
+        while read < len(buffer):
+            count = f.readinto(view[read:])
+            if not count:
+                break
+            read += count
+    del buffer[read:]
+    return buffer
+
+
 def save_license_file(license_data: LicenseData, output_path: str, passphrase: bytes = MASTER_PASSPHRASE) -> None:
     """
     Encrypt and save license to file.
@@ -467,8 +775,7 @@ def save_license_file(license_data: LicenseData, output_path: str, passphrase: b
     """
     encrypted_data = encrypt_license(license_data, passphrase)
 
-    with open(output_path, 'wb') as f:
-        f.write(encrypted_data)
+    write_file_atomic(output_path, encrypted_data)
 
     print(f"✓ License file saved: {output_path}")
     print(f"  Size: {len(encrypted_data)} bytes")
@@ -495,19 +802,83 @@ def load_license_file(license_path: str, passphrase: bytes = MASTER_PASSPHRASE)
         raise FileNotFoundError(f"License file not found: {license_path}")
 
     with open(license_path, 'rb') as f:
-        encrypted_data = f.read()
+        if os.fstat(f.fileno()).st_size < HEADER_SIZE:
+            raise ValueError("Invalid license file: too small")
+
+        # Sections are then decrypted in place from this buffer
+        data = _read_file(f)
 
     # Check encryption type from header
-    if len(encrypted_data) >= HEADER_SIZE:
-        encryption_type = encrypted_data[8:20]
-        if encryption_type == b'RSA_AES256\x00\x00':
-            # Hybrid encryption
-            return decrypt_license_hybrid(encrypted_data)
-        else:
-            # Legacy encryption
-            return decrypt_license(encrypted_data, passphrase)
+    encryption_type = data[8:20]
+    if encryption_type == b'RSA_AES256\x00\x00':
+        # Hybrid encryption
+        return decrypt_license_hybrid(data)
     else:
-        raise ValueError("Invalid license file: too small")
+        # Legacy encryption
+        return decrypt_license(data, passphrase)
+
+
+# Parsed licenses: {(real path, passphrase): ((mtime_ns, size), LicenseData)}
+_license_cache = {}
+_license_cache_lock = threading.Lock()
+
+
+def load_license_file_cached(license_path: str, passphrase: bytes = MASTER_PASSPHRASE) -> LicenseData:
+    """
+    Load and decrypt license from file, reusing the last parsed result.
+
+    The parsed LicenseData is cached process-wide and keyed by the file
+    path, mtime and size, so replacing production.lic is picked up on the
+    next call while repeated loads cost a single stat(). The returned object
+    is shared: callers must not modify it.
+
+    Args:
+        license_path: Path to production.lic
+        passphrase: Decryption passphrase (for legacy files only)
+
+    Returns:
+        LicenseData object
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If decryption fails
+    """
+    try:
+        stat = os.stat(license_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"License file not found: {license_path}")
+
+    key = (os.path.realpath(license_path), passphrase)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _license_cache_lock:
+        cached = _license_cache.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    license_data = load_license_file(license_path, passphrase)
+
+    with _license_cache_lock:
+        _license_cache[key] = (signature, license_data)
+
+    return license_data
+
+
+def clear_license_cache(license_path: str = None) -> None:
+    """
+    Drop cached licenses loaded by load_license_file_cached.
+
+    Args:
+        license_path: Only drop this file (default: drop every cached license)
+    """
+    with _license_cache_lock:
+        if license_path is None:
+            _license_cache.clear()
+            return
+
+        real_path = os.path.realpath(license_path)
+        for key in [key for key in _license_cache if key[0] == real_path]:
+            del _license_cache[key]
 
 
 def save_license_file_hybrid(license_data: LicenseData, output_path: str,
@@ -524,8 +895,7 @@ def save_license_file_hybrid(license_data: LicenseData, output_path: str,
     """
     encrypted_data = encrypt_license_hybrid(license_data, private_key_path, private_key_passphrase)
 
-    with open(output_path, 'wb') as f:
-        f.write(encrypted_data)
+    write_file_atomic(output_path, encrypted_data)
 
     print(f"✓ License file saved (hybrid encryption): {output_path}")
     print(f"  Size: {len(encrypted_data)} bytes")
@@ -549,27 +919,22 @@ def validate_license_file(license_path: str) -> Tuple[bool, str]:
         if not os.path.exists(license_path):
             return False, f"File not found: {license_path}"
 
-        with open(license_path, 'rb') as f:
-            data = f.read()
-
         # Check minimum size
         min_size = HEADER_SIZE + IV_SIZE + AUTH_TAG_SIZE + FOOTER_SIZE
-        if len(data) < min_size:
+        if os.path.getsize(license_path) < min_size:
             return False, f"File too small (expected >= {min_size} bytes)"
 
+        with open(license_path, 'rb') as f:
+            data = _read_file(f)
+
         # Check magic bytes
         if data[0:4] != MAGIC_BYTES:
             return False, "Invalid magic bytes (not a valid license file)"
 
         # Check checksum
-        header = data[:HEADER_SIZE]
-        footer = data[-FOOTER_SIZE:]
-        encrypted_section = data[HEADER_SIZE:-FOOTER_SIZE]
-
-        checksum_data = header + encrypted_section
-        expected_checksum = hashlib.sha256(checksum_data).digest()
-
-        if footer != expected_checksum:
+        with memoryview(data) as view:
+            checksum_ok = _checksum_valid(view)
+        if not checksum_ok:
             return False, "Checksum mismatch (file corrupted or tampered)"
 
         return True, "File structure valid"
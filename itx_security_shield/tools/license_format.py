@@ -88,7 +88,11 @@ class LicenseData:
     # ========================================================================
     # File Integrity (Optional - for Phase 2)
     # ========================================================================
-    file_hashes: Dict[str, str] = field(default_factory=dict)
+    file_hashes: Dict[str, str] = field(default_factory=dict)  # {"addon/relative/path": sha256}
+    file_manifest_root: str = ""           # Root hash of the Merkle file manifest section
+
+    # Decoded Merkle file manifest (binary .lic section, never serialized to JSON)
+    file_manifest = None
 
     # ========================================================================
     # Digital Signature (for Phase 2)
@@ -229,6 +233,12 @@ FOOTER_SIZE = 32
 IV_SIZE = 12
 AUTH_TAG_SIZE = 16
 
+# Header flags (first reserved byte of the header)
+FLAGS_OFFSET = 20
+FLAG_FILE_MANIFEST = 0x01       # A Merkle file manifest section follows the key sections
+LICENSE_VERSION_MANIFEST = b'\x01\x01\x00\x00'  # Version 1.1 (file manifest section)
+MANIFEST_AAD = b'ODLI-file-manifest'
+
 
 # ============================================================================
 # Example Usage
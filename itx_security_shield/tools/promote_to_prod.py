@@ -27,6 +27,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from tools.license_format import LicenseData, InstanceInfo
 from tools.license_crypto import save_license_file
+from tools.file_integrity import hash_addons
 from lib import ITXSecurityVerifier
 
 
@@ -74,6 +75,25 @@ def parse_addon_list(addons_str: str) -> list:
     return [addon.strip() for addon in addons_str.split(',') if addon.strip()]
 
 
+def collect_file_hashes(addons_path: str, addon_names: list) -> dict:
+    """Hash the files of the licensed addons (and of itx_security_shield) found in addons_path."""
+    print("🔒 Hashing addon files...")
+
+    addon_paths = {}
+    for addon_name in set(addon_names) | {'itx_security_shield'}:
+        addon_path = os.path.join(addons_path, addon_name)
+        if os.path.isdir(addon_path):
+            addon_paths[addon_name] = addon_path
+        else:
+            print(f"  ⚠️  Addon not found, files not hashed: {addon_name}")
+
+    file_hashes = hash_addons(addon_paths)
+    print(f"  ✓ {len(file_hashes)} files hashed in {len(addon_paths)} addons")
+    print()
+
+    return file_hashes
+
+
 def validate_date(date_str: str) -> str:
     """Validate date format (YYYY-MM-DD)."""
     try:
@@ -113,6 +133,11 @@ def create_license(args) -> LicenseData:
     # Parse addon list
     licensed_addons = parse_addon_list(args.addons)
 
+    # Hash addon files if --hash-addons-path is given
+    file_hashes = {}
+    if args.hash_addons_path:
+        file_hashes = collect_file_hashes(args.hash_addons_path, licensed_addons)
+
     # Create license data
     license_data = LicenseData(
         # Customer Information
@@ -144,6 +169,9 @@ def create_license(args) -> LicenseData:
         # Support
         support_level=args.support_level,
         support_email=args.support_email,
+
+        # File Integrity
+        file_hashes=file_hashes,
     )
 
     return license_data
@@ -251,6 +279,10 @@ Examples:
     parser.add_argument('--bind-hardware', action='store_true',
                        help='Bind license to current hardware (register this machine as instance 1)')
 
+    # File integrity
+    parser.add_argument('--hash-addons-path',
+                       help='Addons directory: store the file hashes of the licensed addons found there')
+
     # Output
     parser.add_argument('--output', default='production.lic',
                        help='Output file path (default: production.lic)')
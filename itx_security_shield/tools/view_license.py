@@ -141,7 +141,13 @@ def print_license_details(license_data):
         print()
 
     # File Integrity
-    if license_data.file_hashes:
+    if license_data.file_manifest:
+        print("🔒 FILE INTEGRITY")
+        print("-" * 70)
+        print(f"Protected Files:  {len(license_data.file_manifest)} files (Merkle manifest)")
+        print(f"Manifest Root:    {license_data.file_manifest.root_hash}")
+        print()
+    elif license_data.file_hashes:
         print("🔒 FILE INTEGRITY")
         print("-" * 70)
         print(f"Protected Files:  {len(license_data.file_hashes)} files")